@@ -1,9 +1,14 @@
+import asyncio
+import atexit
 import logging
+import os
 import random
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import gradio as gr
+import numpy as np
 import pandas as pd
 from gradio_pdf import PDF
 
@@ -17,7 +22,8 @@ from ai_reviewer_arena.papers import Paper, paper_registry
 from ai_reviewer_arena.reviewers import model_registry
 from ai_reviewer_arena.sessions import Session, SessionRegistry
 from ai_reviewer_arena.utils import get_session_id
-from ai_reviewer_arena.votes import Vote, VotesJSONL, VotesSqlite
+from ai_reviewer_arena.votes import (SqliteConnectionPool, Vote, VotesJSONL,
+                                     VotesJSONLWriter, VotesSqlite)
 
 PROJECT_HOME = Path(__file__).parent.parent
 PDF_FOLDER = PROJECT_HOME / "arena_data/resources/pdfs"
@@ -25,103 +31,153 @@ PDF_FOLDER = PROJECT_HOME / "arena_data/resources/pdfs"
 ui_logger = logging.getLogger("UILogger")
 setup_logging(log_level=ARENA_LOGGING_LEVEL)
 
+# Create the votes databases shared by all sessions
+votes_sqlite_pool = SqliteConnectionPool()
+votes_sqlite = VotesSqlite(pool=votes_sqlite_pool)
+votes_jsonl = VotesJSONL()
+votes_jsonl_writer = VotesJSONLWriter(votes_jsonl)
+# Run last to first: writes the votes still queued for the JSONL writer, then closes the JSONL file
+atexit.register(votes_jsonl.close)
+atexit.register(votes_jsonl_writer.close)
+
+# All sessions vote on the same leaderboard, so the ratings are built once and shared
+elo_sys = EloSystem(votes_sqlite)
+
+# Full consistency check of the two votes databases, opt-in since it reads every vote
+if os.getenv("ARENA_VERIFY_VOTES"):
+    assert votes_sqlite.get_all_votes() == votes_jsonl.get_all_votes()
+
 NUM_COLUMNS = 2
 
+# Display labels of the rating radio buttons, in the order of the submit_vote arguments
+RATING_FIELD_LABELS = ("Technical Quality", "Constructiveness", "Clarity", "Overall Quality")
+
 MODEL_SHORT_NAME_LIST = model_registry.get_all_short_names()
-MODEL_ID_LIST = model_registry.get_model_id_list()
+MODEL_ID_LIST = [sys.intern(model_id) for model_id in model_registry.get_model_id_list()]
+# Precomputed once for the UI: (label, value) pairs for the model dropdowns and the models description
+MODEL_DROPDOWN_CHOICES = list(zip(MODEL_SHORT_NAME_LIST, MODEL_ID_LIST))
+MODEL_DESCRIPTION_MD = model_registry.get_model_description_md()
+
+# Shuffled visiting order of the papers used when retrying, so that consecutive failed
+# attempts land on unrelated papers, and the inverse mapping from position to order index
+PAPER_ORDER = list(range(paper_registry.get_paper_count()))
+random.shuffle(PAPER_ORDER)
+PAPER_ORDER_INDEX = {pos: order_index for order_index, pos in enumerate(PAPER_ORDER)}
 
 # Create a SessionRegistry instance
 session_registry = SessionRegistry()
+# Writes the sessions still queued and closes the database on shutdown
+atexit.register(session_registry.close)
 
 
 # Function to save the session
 def save_session(session_state):
+    """
+    Queues the session to be saved, the SessionRegistry writes it in the background
+    together with the other sessions saved around the same time.
+    """
     if session_state:
         # Update the end_time field
         session_state.end_time = datetime.now()
+        session_registry.enqueue_save(session_state)
 
-        # Check if the session exists and save/update accordingly
-        if session_registry.session_exists(session_state.session_id):
-            session_registry.update_session(session_state)
-            ui_logger.info(f"Session updated for {session_state.session_id}")
-        else:
-            session_registry.insert_session(session_state)
-            ui_logger.info(f"New session inserted for {session_state.session_id}")
+
+def get_live_session(session_id: str) -> Session:
+    session = session_registry.get(session_id) if session_id else None
+    if session is None:
+        ui_logger.warning(f"Request for unknown session: {session_id}")
+        raise gr.Error("Your session has expired, please refresh the page.")
+    return session
 
 
-def update_leaderboard(session: Session):
-    elo_sys: EloSystem = session["elo_sys"]
+# Last leaderboard built, reused until the Elo system receives new votes
+_LB_CACHE = {"votes": -1, "df": None, "md": None}
+
+
+def update_leaderboard():
+    num_votes = elo_sys.num_votes()
+    if _LB_CACHE["votes"] == num_votes:
+        return [_LB_CACHE["df"], _LB_CACHE["md"]]
+
     ratings_stats = elo_sys.get_ratings_stats()
-    df = (
-        pd.DataFrame.from_dict(ratings_stats, orient="index")
-        .reset_index()
-        .rename(columns={"index": "System"})
-    )
-    if len(df) == 0:
+    if len(ratings_stats) == 0:
         gr.Warning("No comparisons yet, please start voting.")
         vote_counts_md = f"### Total \\#models: {len(MODEL_ID_LIST)},&nbsp;&nbsp;&nbsp;&nbsp;Total \\#votes: {0}"
-        return [df, vote_counts_md]
-
-    df["Arena Score"] = df["Arena Score"].round(2)
-    df["Votes"] = df["Votes"].round(2)
-    df["95% CI"] = df["95% CI"].apply(lambda x: (round(x[0], 2), round(x[1], 2)))
-    df["95% CI"] = df["95% CI"].apply(lambda x: f"({x[0]:.2f}, {x[1]:.2f})")
-    df = (
-        df.sort_values(by="Arena Score", ascending=False)
-        .reset_index()
-        .rename(columns={"index": "Rank"})
+        return [pd.DataFrame(columns=["System"]), vote_counts_md]
+
+    # Build the sorted table in one shot from a dict of lists
+    rows = sorted(ratings_stats.items(), key=lambda kv: -kv[1]["Arena Score"])
+    ci = np.round(np.asarray([stats["95% CI"] for _, stats in rows], dtype=float), 2)
+    # Format "(lo, hi)" with numpy's vectorized string ops rather than one f-string per row
+    ci_fmt = np.char.add(
+        np.char.add(np.char.add("(", np.char.mod("%.2f", ci[:, 0])), ", "),
+        np.char.add(np.char.mod("%.2f", ci[:, 1]), ")"),
+    )
+    df = pd.DataFrame(
+        {
+            "Rank": range(1, len(rows) + 1),
+            "System": [reviewer_id for reviewer_id, _ in rows],
+            "Arena Score": np.round([stats["Arena Score"] for _, stats in rows], 2),
+            "95% CI": ci_fmt.tolist(),
+            "Votes": np.round([stats["Votes"] for _, stats in rows], 2),
+        }
     )
-    df["Rank"] = df["Rank"] + 1
     vote_counts_md = f"### Total \\#models: {len(MODEL_ID_LIST)},&nbsp;&nbsp;&nbsp;&nbsp;Total \\#votes: {df['Votes'].sum()}"
 
-    return [df.sort_values(by="Rank", ascending=True), vote_counts_md]
+    _LB_CACHE.update(votes=num_votes, df=df, md=vote_counts_md)
+    return [df, vote_counts_md]
 
 
-def select_new_paper(session: Session, new_paper_pos: int, attempts: int = 0) -> tuple:
+def select_new_paper(session: Session, new_paper_pos: int) -> tuple:
     paper_registry_size = paper_registry.get_paper_count()
-    if attempts >= paper_registry_size:
+    new_paper_pos = (
+        new_paper_pos % paper_registry_size
+    )  # Ensure we wrap around if we go past the end
+    order_index = PAPER_ORDER_INDEX[new_paper_pos]
+
+    for _ in range(paper_registry_size):
+        cur_sampled_paper: Paper = paper_registry.get_paper_at_position(new_paper_pos)
+
+        # Get the fair pair of reviewers
+        valid_reviewer_ids = cur_sampled_paper.get_valid_reviewer_id_set()
+        fair_pair = elo_sys.get_fair_pair(
+            candidates_a=valid_reviewer_ids, candidates_b=valid_reviewer_ids
+        )
+        if fair_pair is not None:
+            break
+
+        # Retry along the shuffled order rather than with the adjacent paper
+        order_index = (order_index + 1) % paper_registry_size
+        ui_logger.warning(
+            f"No fair pair found for paper with paper_id: {cur_sampled_paper.paper_id}, at paper registry position: {new_paper_pos}. Attempting next paper at position: {PAPER_ORDER[order_index]}."
+        )
+        new_paper_pos = PAPER_ORDER[order_index]
+    else:
         ui_logger.error(
-            f"No paper with a fair pair of reviewers found after {attempts} attempts."
+            f"No paper with a fair pair of reviewers found after {paper_registry_size} attempts."
         )
         raise ValueError(
             "No paper with a fair pair of reviewers found in the entire registry."
         )
 
-    new_paper_pos = (
-        new_paper_pos % paper_registry_size
-    )  # Ensure we wrap around if we go past the end
     session["cur_paper_pos"] = new_paper_pos
-    cur_sampled_paper: Paper = paper_registry.get_paper_at_position(new_paper_pos)
 
     # Get the path of the paper PDF
     pdf_path = cur_sampled_paper.pdf_path
     pdf_path_full = str(PDF_FOLDER / pdf_path)
 
-    # Get the fair pair of reviewers
-    elo_sys: EloSystem = session["elo_sys"]
-    valid_reviewer_ids = set(cur_sampled_paper.get_all_valid_reviewer_ids())
-    fair_pair = elo_sys.get_fair_pair(
-        candidates_a=valid_reviewer_ids, candidates_b=valid_reviewer_ids
-    )
-
-    if fair_pair is None:
-        ui_logger.warning(
-            f"No fair pair found for paper with paper_id: {cur_sampled_paper.paper_id}, at paper registry position: {new_paper_pos}. Attempting next paper at position: {new_paper_pos + 1}."
-        )
-        return select_new_paper(session, new_paper_pos + 1, attempts + 1)
-
     reviewer_a, reviewer_b = fair_pair
     ui_logger.info(
         f"Selected fair pair: {reviewer_a} and {reviewer_b} for paper with: position {new_paper_pos}, paper_id: {cur_sampled_paper.paper_id}, paper_title: {cur_sampled_paper.title}"
     )
 
     # Sample one review from the review list specified by `reviewer_a` from the sampled `Paper`
-    reviewer_a_review_list = getattr(cur_sampled_paper, reviewer_a, [])
+    reviewer_a_review_list = cur_sampled_paper.reviews.get(reviewer_a, ())
     assert len(reviewer_a_review_list) > 0
     reviewer_a_sampled_review = random.choice(reviewer_a_review_list)
 
     # Sample one review from the review list specified by `reviewer_b` from the sampled `Paper`
-    reviewer_b_review_list = getattr(cur_sampled_paper, reviewer_b, [])
+    reviewer_b_review_list = cur_sampled_paper.reviews.get(reviewer_b, ())
     assert len(reviewer_b_review_list) > 0
     reviewer_b_sampled_review = random.choice(reviewer_b_review_list)
 
@@ -138,33 +194,35 @@ def select_new_paper(session: Session, new_paper_pos: int, attempts: int = 0) ->
     return pdf_path_full, reviewer_a_sampled_review, reviewer_b_sampled_review, session
 
 
-def next_paper(session_state, pdf_viewer):
+async def next_paper(session_id, pdf_viewer):
+    session_state = get_live_session(session_id)
     cur_paper_pos = session_state["cur_paper_pos"]
     new_paper_pos = (cur_paper_pos + 1) % paper_registry.get_paper_count()
-    pdf_path_full, reviewer_a_review, reviewer_b_review, updated_session = (
-        select_new_paper(session_state, new_paper_pos)
+    pdf_path_full, reviewer_a_review, reviewer_b_review, _ = select_new_paper(
+        session_state, new_paper_pos
     )
 
     # Save the session after moving to the next paper
     save_session(session_state)
 
-    return [pdf_path_full, reviewer_a_review, reviewer_b_review, updated_session]
+    return [pdf_path_full, reviewer_a_review, reviewer_b_review]
 
 
-def prev_paper(session_state, pdf_viewer):
+async def prev_paper(session_id, pdf_viewer):
+    session_state = get_live_session(session_id)
     cur_paper_pos = session_state["cur_paper_pos"]
     new_paper_pos = (cur_paper_pos - 1) % paper_registry.get_paper_count()
-    pdf_path_full, reviewer_a_review, reviewer_b_review, updated_session = (
-        select_new_paper(session_state, new_paper_pos)
+    pdf_path_full, reviewer_a_review, reviewer_b_review, _ = select_new_paper(
+        session_state, new_paper_pos
     )
 
     # Save the session after moving to the previous paper
     save_session(session_state)
 
-    return [pdf_path_full, reviewer_a_review, reviewer_b_review, updated_session]
+    return [pdf_path_full, reviewer_a_review, reviewer_b_review]
 
 
-def init_demo(request: gr.Request):
+async def init_demo(request: gr.Request):
     # Create a session
     assert request
     session = Session(
@@ -174,46 +232,47 @@ def init_demo(request: gr.Request):
     )
     ui_logger.info(f"New session initialized: {session.session_id}")
 
-    # Create the VotesSqlite and VotesJSONL object
-    votes_sqlite = VotesSqlite()
-    votes_jsonl = VotesJSONL()
-
-    # Assert the two votes databases are identical
-    assert votes_sqlite.get_all_votes() == votes_jsonl.get_all_votes()
-
-    # Create an EloSystem
-    elo_sys = EloSystem(votes_sqlite)
-
-    # Store the variables in the session
-    session["votes_sqlite"] = votes_sqlite
-    session["votes_jsonl"] = votes_jsonl
-    session["elo_sys"] = elo_sys
+    # Sanity check that the two votes databases hold the same number of votes,
+    # counting the votes still queued for the JSONL writer. Votes submitted concurrently
+    # can be briefly in flight, so a mismatch is logged rather than asserted.
+    # Counting reads the whole JSONL file, so both counts run off the event loop.
+    num_votes_sqlite, num_votes_jsonl_stored = await asyncio.gather(
+        asyncio.to_thread(votes_sqlite.count), asyncio.to_thread(votes_jsonl.count)
+    )
+    num_votes_jsonl = num_votes_jsonl_stored + votes_jsonl_writer.pending_count
+    if num_votes_sqlite != num_votes_jsonl:
+        ui_logger.warning(
+            f"Votes databases out of sync: {num_votes_sqlite} votes in SQLite, {num_votes_jsonl} votes in JSONL (including queued)"
+        )
 
     # Initialize new session variables
     session["voted_pair_of_reviews"] = set()
 
+    # Keep the session server-side, the client only holds its id
+    session_registry.register(session)
+
     # Select a random paper to start with
     cur_paper_pos: int = paper_registry.sample_paper_position()
     (
         pdf_path_full,
         reviewer_a_sampled_review,
         reviewer_b_sampled_review,
-        updated_session,
+        _,
     ) = select_new_paper(session, cur_paper_pos)
 
     # Save the initial session
     save_session(session)
 
     return (
-        updated_session,
+        session.session_id,
         pdf_path_full,
         reviewer_a_sampled_review,
         reviewer_b_sampled_review,
     )
 
 
-def submit_vote(
-    session_state,
+async def submit_vote(
+    session_id,
     pdf_path_full,
     review_display_a,
     review_display_b,
@@ -222,24 +281,21 @@ def submit_vote(
     clarity,
     overall_quality,
 ):
-    # Check if all radio buttons are selected
-    if any(
-        x is None
-        for x in [technical_quality, constructiveness, clarity, overall_quality]
-    ):
+    session_state = get_live_session(session_id)
+
+    # Check if all radio buttons are selected, in a single pass
+    missing_fields = [
+        label
+        for label, rating in zip(
+            RATING_FIELD_LABELS,
+            (technical_quality, constructiveness, clarity, overall_quality),
+        )
+        if rating is None
+    ]
+    if missing_fields:
         ui_logger.warning(
             f"Incomplete vote submission attempt for session {session_state['session_id']}"
         )
-        missing_fields = []
-        if technical_quality is None:
-            missing_fields.append("Technical Quality")
-        if constructiveness is None:
-            missing_fields.append("Constructiveness")
-        if clarity is None:
-            missing_fields.append("Clarity")
-        if overall_quality is None:
-            missing_fields.append("Overall Quality")
-
         error_message = f"Please select a rating for: {', '.join(missing_fields)}"
         gr.Warning(error_message, duration=5)
         return [
@@ -250,7 +306,6 @@ def submit_vote(
             None,  # constructiveness_radio
             None,  # clarity_radio
             None,  # overall_quality_radio
-            session_state,
             session_state["reviewer_a"],  # New return value for model_selector_a
             session_state["reviewer_b"],  # New return value for model_selector_b
         ]
@@ -268,38 +323,61 @@ def submit_vote(
         review_b=session_state["reviewer_b_review"],  # New field added
     )
 
-    # Save the vote to both databases
-    session_state["votes_sqlite"].store_vote(vote)
-    session_state["votes_jsonl"].store_vote(vote)
+    # Save the vote to SQLite off the event loop; the JSONL copy is batch-written in the background
+    await asyncio.to_thread(votes_sqlite.store_vote, vote)
+    votes_jsonl_writer.submit(vote)
 
     # Add vote record to the Elo system and update the Elo ratings
-    session_state["elo_sys"].add_vote_then_update_ratings(vote)
-
-    # Record the voted pair of reviews
-    session_state["voted_pair_of_reviews"].add(
-        (session_state["reviewer_a_review"], session_state["reviewer_b_review"])
-    )
+    elo_sys.add_vote_then_update_ratings(vote)
 
     # Get the current paper
     cur_paper_pos = session_state["cur_paper_pos"]
     cur_sampled_paper = paper_registry.get_paper_at_position(cur_paper_pos)
 
+    # Record the voted pair of reviews as (reviewer_a, review index, reviewer_b, review index),
+    # which is much cheaper to hash than the review texts themselves
+    voted_reviewer_a, voted_reviewer_b = (
+        session_state["reviewer_a"],
+        session_state["reviewer_b"],
+    )
+    session_state["voted_pair_of_reviews"].add(
+        (
+            voted_reviewer_a,
+            cur_sampled_paper.reviews[voted_reviewer_a].index(
+                session_state["reviewer_a_review"]
+            ),
+            voted_reviewer_b,
+            cur_sampled_paper.reviews[voted_reviewer_b].index(
+                session_state["reviewer_b_review"]
+            ),
+        )
+    )
+    session_state.mark_modified()
+
     # Function to sample a new pair of reviews
     def sample_new_reviews(paper: Paper, reviewer_a, reviewer_b):
-        reviewer_a_review_list = getattr(paper, reviewer_a, [])
-        reviewer_b_review_list = getattr(paper, reviewer_b, [])
-
-        available_pairs = [
-            (a, b)
-            for a in reviewer_a_review_list
-            for b in reviewer_b_review_list
-            if (a, b) not in session_state["voted_pair_of_reviews"]
-            and len(a.strip()) > 0
-            and len(b.strip()) > 0
-        ]
-
-        if available_pairs:
-            return random.choice(available_pairs)
+        reviewer_a_review_list = paper.reviews.get(reviewer_a, ())
+        reviewer_b_review_list = paper.reviews.get(reviewer_b, ())
+
+        # Drop empty reviews once up front instead of once per pair, keeping their indices
+        reviews_a = [(ia, a) for ia, a in enumerate(reviewer_a_review_list) if a.strip()]
+        reviews_b = [(ib, b) for ib, b in enumerate(reviewer_b_review_list) if b.strip()]
+        voted = session_state["voted_pair_of_reviews"]
+
+        # Reservoir sampling: pick a uniformly random unvoted pair in a single pass
+        # without materializing the cartesian product of the two review lists
+        chosen = None
+        n_available = 0
+        for ia, a in reviews_a:
+            for ib, b in reviews_b:
+                if (reviewer_a, ia, reviewer_b, ib) in voted:
+                    continue
+                n_available += 1
+                if random.randrange(n_available) == 0:
+                    chosen = (a, b)
+
+        if chosen is not None:
+            return chosen
         else:
             ui_logger.warning(
                 f"No valid review pairs found for paper {paper.paper_id}, reviewers {reviewer_a} and {reviewer_b}, the number of voted_pair_of_reviews is: {len(session_state['voted_pair_of_reviews'])}"
@@ -308,9 +386,8 @@ def submit_vote(
 
     # Try to get a new fair pair and sample reviews
     MAX_ATTEMPTS = 10  # Maximum number of attempts to find a new pair
+    valid_reviewer_ids = cur_sampled_paper.get_valid_reviewer_id_set()
     for attempt in range(MAX_ATTEMPTS):
-        elo_sys: EloSystem = session_state["elo_sys"]
-        valid_reviewer_ids = set(cur_sampled_paper.get_all_valid_reviewer_ids())
         fair_pair = elo_sys.get_fair_pair(
             candidates_a=valid_reviewer_ids, candidates_b=valid_reviewer_ids
         )
@@ -369,12 +446,40 @@ def submit_vote(
         None,  # constructiveness_radio
         None,  # clarity_radio
         None,  # overall_quality_radio
-        session_state,
         reviewer_a,  # New return value for model_selector_a
         reviewer_b,  # New return value for model_selector_b
     ]
 
 
+def get_review_for_model(session_id, model_id, side: str) -> str:
+    session_state = get_live_session(session_id)
+    if session_state[f"reviewer_{side}"] == model_id:
+        return session_state[f"reviewer_{side}_review"]
+    return ""
+
+
+def discard_session(request: gr.Request):
+    # get_session_id makes up a new id without a session hash, which would never match the live session.
+    # Such sessions are left for the registry to evict once it is full.
+    if request is None or request.session_hash is None:
+        return
+    session_id = get_session_id(request)
+    # Persist the final state before the live session is dropped
+    session_registry.flush()
+    session_registry.discard(session_id)
+
+
+def build_model_selector(default_model_id: str) -> gr.Dropdown:
+    return gr.Dropdown(
+        choices=MODEL_DROPDOWN_CHOICES,
+        value=default_model_id,
+        interactive=False,
+        show_label=False,
+        container=False,
+        visible=True,
+    )
+
+
 def build_arena_ui():
     text_size = gr.themes.sizes.text_lg
     with gr.Blocks(
@@ -382,7 +487,7 @@ def build_arena_ui():
         theme=gr.themes.Default(text_size=text_size),
         css=APP_CSS,
     ) as demo:
-        session_state = gr.State()
+        session_state = gr.State()  # Holds only the session id
 
         with gr.Tab("⚔️ Arena (battle)"):
             gr.Markdown(ARENA_NOTICE_MD)
@@ -406,22 +511,12 @@ def build_arena_ui():
             with gr.Group():
                 with gr.Row():
                     with gr.Column():
-                        model_selector_a = gr.Dropdown(
-                            choices=list(zip(MODEL_SHORT_NAME_LIST, MODEL_ID_LIST)),
-                            value=MODEL_ID_LIST[0] if MODEL_ID_LIST else "",
-                            interactive=False,
-                            show_label=False,
-                            container=False,
-                            visible=True,
+                        model_selector_a = build_model_selector(
+                            MODEL_ID_LIST[0] if MODEL_ID_LIST else ""
                         )
                     with gr.Column():
-                        model_selector_b = gr.Dropdown(
-                            choices=list(zip(MODEL_SHORT_NAME_LIST, MODEL_ID_LIST)),
-                            value=MODEL_ID_LIST[1] if len(MODEL_ID_LIST) > 1 else "",
-                            interactive=False,
-                            show_label=False,
-                            container=False,
-                            visible=True,
+                        model_selector_b = build_model_selector(
+                            MODEL_ID_LIST[1] if len(MODEL_ID_LIST) > 1 else ""
                         )
 
                 with gr.Row():
@@ -430,9 +525,8 @@ def build_arena_ui():
                         open=False,
                         visible=True,
                     ):
-                        model_description_md = model_registry.get_model_description_md()
                         gr.Markdown(
-                            model_description_md, elem_id="model_description_markdown"
+                            MODEL_DESCRIPTION_MD, elem_id="model_description_markdown"
                         )
 
                 with gr.Row():
@@ -546,7 +640,7 @@ The leaderboard is ranked according to the Elo rating, voted by human anonymousl
         )
 
         leadboard_tab.select(
-            update_leaderboard, [session_state], [leadboard_df, vote_counts_md]
+            update_leaderboard, [], [leadboard_df, vote_counts_md]
         )
 
         submit_btn.click(
@@ -569,7 +663,6 @@ The leaderboard is ranked according to the Elo rating, voted by human anonymousl
                 constructiveness_radio,
                 clarity_radio,
                 overall_quality_radio,
-                session_state,
                 model_selector_a,  # Add this output
                 model_selector_b,  # Add this output
             ],
@@ -578,13 +671,13 @@ The leaderboard is ranked according to the Elo rating, voted by human anonymousl
         next_btn.click(
             next_paper,
             inputs=[session_state, pdf_viewer],
-            outputs=[pdf_viewer, review_display_a, review_display_b, session_state],
+            outputs=[pdf_viewer, review_display_a, review_display_b],
         )
 
         prev_btn.click(
             prev_paper,
             inputs=[session_state, pdf_viewer],
-            outputs=[pdf_viewer, review_display_a, review_display_b, session_state],
+            outputs=[pdf_viewer, review_display_a, review_display_b],
         )
 
         # Update model selectors when session state changes
@@ -596,18 +689,19 @@ The leaderboard is ranked according to the Elo rating, voted by human anonymousl
 
         # Update review displays when model selectors change
         model_selector_a.change(
-            lambda s, m: s["reviewer_a_review"] if s["reviewer_a"] == m else "",
+            lambda s, m: get_review_for_model(s, m, "a"),
             inputs=[session_state, model_selector_a],
             outputs=[review_display_a],
         )
 
         model_selector_b.change(
-            lambda s, m: s["reviewer_b_review"] if s["reviewer_b"] == m else "",
+            lambda s, m: get_review_for_model(s, m, "b"),
             inputs=[session_state, model_selector_b],
             outputs=[review_display_b],
         )
 
-        demo.unload(lambda: print("====================="))
+        # Drop the live session once its page is closed, it remains persisted in the database
+        demo.unload(discard_session)
 
     return demo
 
@@ -1,10 +1,26 @@
+import atexit
 import logging
 import logging.config
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from ai_reviewer_arena.configs.app_cfg import ARENA_LOGGING_LEVEL
 
+# The listener thread doing the actual log I/O, replaced each time `setup_logging` is called
+_queue_listener: QueueListener | None = None
+
+
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
 
 def setup_logging(
     log_file: str = "ai_reviewer_arena.log",
@@ -69,5 +85,20 @@ def setup_logging(
         },
     }
 
+    # Drain and stop the previous listener before its handlers are replaced
+    _stop_queue_listener()
+
     # Apply the logging configuration
     logging.config.dictConfig(logging_config)
+
+    # Move the configured handlers behind a queue, so that logging calls on request paths only
+    # enqueue the record while a single listener thread formats and writes it
+    global _queue_listener
+    root_logger = logging.getLogger()
+    io_handlers = list(root_logger.handlers)
+    for handler in io_handlers:
+        root_logger.removeHandler(handler)
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, *io_handlers, respect_handler_level=True)
+    _queue_listener.start()
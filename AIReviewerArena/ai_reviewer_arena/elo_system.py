@@ -1,21 +1,63 @@
 import logging
 import math
 import random
+import threading
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from typing import Annotated, ClassVar, Dict, List, Tuple
+from types import MappingProxyType
+from typing import Annotated, ClassVar, Dict, List, Mapping, Tuple
 
-from pydantic import BaseModel, Field, model_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from ai_reviewer_arena.configs.app_cfg import ARENA_RATING_CHOICES
-from ai_reviewer_arena.configs.logging_cfg import setup_logging
 from ai_reviewer_arena.votes import Vote, VotesInterface
 
-# Setup logging
-setup_logging()
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the replay then runs as plain Python
+    njit = None
+
 logger = logging.getLogger("EloSystem")
 
+# Score of reviewer A for each entry of ARENA_RATING_CHOICES, "Both are bad" counting as a tie
+CHOICE_TO_SCORE = np.array([1.0, 0.0, 0.5, 0.5])
+CHOICE_INDEX: Dict[str, int] = {
+    choice: i for i, choice in enumerate(ARENA_RATING_CHOICES[: len(CHOICE_TO_SCORE)])
+}
+UNKNOWN_CHOICE_INDEX = 3  # Any other rating is treated as "Both are bad"
+
+# Columns of the encoded vote table: reviewer indices, then the choice index of each dimension
+VOTE_TABLE_COLUMNS = ("a_idx", "b_idx", "tq", "con", "cla", "oq")
+
+# 10 ** (x / 400) == exp(x * ln(10) / 400), and exp is cheaper than a generic pow
+_LN10_OVER_400 = math.log(10) / 400.0
+
+
+def _elo_replay(a_idx, b_idx, scores, ratings, vote_counts, k_factor):
+    """
+    Replays the votes in order, updating `ratings` and `vote_counts` in place.
+    Written as an explicit scalar loop so that numba can compile it when available.
+    """
+    for i in range(len(scores)):
+        ai = a_idx[i]
+        bi = b_idx[i]
+        score = scores[i]
+        expected_a = 1.0 / (1.0 + math.exp((ratings[bi] - ratings[ai]) * _LN10_OVER_400))
+        ratings[ai] += k_factor * (score - expected_a)
+        ratings[bi] += k_factor * ((1.0 - score) - (1.0 - expected_a))
+        vote_counts[ai] += score
+        vote_counts[bi] += 1.0 - score
+
+
+if njit is not None:
+    _elo_replay = njit(cache=True)(_elo_replay)
+
 
 class ReviewEvalWeights(BaseModel):
+    # EloSystem copies the weights out once at creation, so they must not change afterwards
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     technical_quality: Annotated[float, Field(gt=0, lt=1)] = 0.2
     constructiveness: Annotated[float, Field(gt=0, lt=1)] = 0.2
     clarity: Annotated[float, Field(gt=0, lt=1)] = 0.2
@@ -29,8 +71,8 @@ class ReviewEvalWeights(BaseModel):
 
     @model_validator(mode="after")
     def check_weights_sum_to_one(self):
-        total = sum(getattr(self, field) for field in self.FIELDS)
-        if abs(total - 1) > 1e-6:  # Allow for small floating-point errors
+        total = self.technical_quality + self.constructiveness + self.clarity + self.overall_quality
+        if not -1e-6 <= total - 1 <= 1e-6:  # Allow for small floating-point errors
             raise ValueError(f"The sum of all weights must be 1, but it is {total}")
         return self
 
@@ -60,9 +102,31 @@ class EloSystem:
         self.k_factor = k_factor
         self.initial_rating = initial_rating
         self.weights = weights or ReviewEvalWeights()
+        # Invariants of the per-vote update, hoisted out of `update_ratings`
+        self._weights_vec: Tuple[float, ...] = tuple(
+            getattr(self.weights, field) for field in ReviewEvalWeights.FIELDS
+        )
+        self._total_weight: float = sum(self._weights_vec)
+        self._choice_to_score: Dict[str, float] = {
+            choice: float(CHOICE_TO_SCORE[i]) for choice, i in CHOICE_INDEX.items()
+        }
         self._ratings: Dict[str, float] = defaultdict(self._default_rating)
         self.votes: List[Vote] = []
         self.vote_counts: Dict[str, float] = defaultdict(float)
+        # Ratings in ascending order, rebuilt lazily when `_ratings_version` changes or
+        # `_ratings` is replaced, see `_get_sorted_ratings`
+        self._ratings_version = 0
+        self._sorted_ratings: List[float] = []
+        self._sorted_reviewers: List[str] = []
+        self._sorted_ratings_owner: Dict[str, float] | None = None
+        self._sorted_ratings_version = -1
+        # Votes encoded as parallel int32 arrays, see `_encode_votes`
+        self._reviewer_idx: Dict[str, int] = {}
+        self._vote_table: Dict[str, np.ndarray] = {}
+        self._num_encoded = 0
+        self._encoded_votes: List[Vote] | None = None
+        # Guards the ratings, the system may be shared by concurrent sessions
+        self._lock = threading.Lock()
         self.initialize_ratings()
         logger.info(
             "EloSystem initialized with k_factor=%s, initial_rating=%s",
@@ -78,15 +142,105 @@ class EloSystem:
         self.compute_ratings()
         logger.info("Ratings initialized from stored votes")
 
+    def _encode_votes(self) -> int:
+        """
+        Bring the vote table up to date with `self.votes`, encoding only the votes appended since
+        the last call. The table is rebuilt from scratch if `self.votes` was replaced or shrank.
+
+        :return: The number of encoded votes
+        """
+        if self.votes is not self._encoded_votes or self._num_encoded > len(self.votes):
+            self._reviewer_idx = {}
+            self._vote_table = {
+                column: np.empty(0, dtype=np.int32) for column in VOTE_TABLE_COLUMNS
+            }
+            self._num_encoded = 0
+            self._encoded_votes = self.votes
+
+        num_votes = len(self.votes)
+        capacity = len(self._vote_table["a_idx"])
+        if num_votes > capacity:
+            # Grow geometrically so that appending votes one at a time stays amortized O(1)
+            new_capacity = max(num_votes, 2 * capacity)
+            for column, values in self._vote_table.items():
+                grown = np.empty(new_capacity, dtype=np.int32)
+                grown[:capacity] = values
+                self._vote_table[column] = grown
+
+        reviewer_idx = self._reviewer_idx
+        a_idx, b_idx = self._vote_table["a_idx"], self._vote_table["b_idx"]
+        tq, con = self._vote_table["tq"], self._vote_table["con"]
+        cla, oq = self._vote_table["cla"], self._vote_table["oq"]
+        for i in range(self._num_encoded, num_votes):
+            vote = self.votes[i]
+            a_idx[i] = reviewer_idx.setdefault(vote.reviewer_a, len(reviewer_idx))
+            b_idx[i] = reviewer_idx.setdefault(vote.reviewer_b, len(reviewer_idx))
+            tq[i] = CHOICE_INDEX.get(vote.technical_quality, UNKNOWN_CHOICE_INDEX)
+            con[i] = CHOICE_INDEX.get(vote.constructiveness, UNKNOWN_CHOICE_INDEX)
+            cla[i] = CHOICE_INDEX.get(vote.clarity, UNKNOWN_CHOICE_INDEX)
+            oq[i] = CHOICE_INDEX.get(vote.overall_quality, UNKNOWN_CHOICE_INDEX)
+        self._num_encoded = num_votes
+        return num_votes
+
     def compute_ratings(self):
         """
         Compute the Elo ratings for all reviewers based on the stored comparisons.
+
+        The votes are kept encoded in a table of parallel arrays (reviewer indices and rating choice
+        indices), so that the sequential replay only does scalar arithmetic instead of reading
+        pydantic attributes.
         """
-        self._ratings = defaultdict(self._default_rating)
-        for vote in self.votes:
-            self.update_ratings(vote)
+        num_votes = self._encode_votes()
+        table = {column: values[:num_votes] for column, values in self._vote_table.items()}
+        num_reviewers = len(self._reviewer_idx)
+
+        # Weighted, normalized score of reviewer A for every vote
+        total_score = np.zeros(num_votes, dtype=np.float64)
+        for column, weight in zip(("tq", "con", "cla", "oq"), self._weights_vec):
+            total_score = total_score + weight * np.take(CHOICE_TO_SCORE, table[column])
+        scores = total_score / self._total_weight
+
+        # Elo is sequential, each vote depends on the ratings left by the previous ones
+        if njit is not None:
+            ratings_arr = np.full(num_reviewers, self.initial_rating, dtype=np.float64)
+            vote_counts_arr = np.zeros(num_reviewers, dtype=np.float64)
+            _elo_replay(
+                table["a_idx"],
+                table["b_idx"],
+                scores,
+                ratings_arr,
+                vote_counts_arr,
+                float(self.k_factor),
+            )
+            ratings = ratings_arr.tolist()
+            vote_counts = vote_counts_arr.tolist()
+        else:
+            # Plain Python lists index much faster than numpy arrays outside of compiled code
+            ratings = [float(self.initial_rating)] * num_reviewers
+            vote_counts = [0.0] * num_reviewers
+            _elo_replay(
+                table["a_idx"].tolist(),
+                table["b_idx"].tolist(),
+                scores.tolist(),
+                ratings,
+                vote_counts,
+                self.k_factor,
+            )
+
+        self._ratings = defaultdict(self._default_rating, zip(self._reviewer_idx, ratings))
+        self.vote_counts = defaultdict(float, zip(self._reviewer_idx, vote_counts))
         logger.info("Ratings computed for all reviewers")
 
+    def __getstate__(self):
+        # Locks can't be copied or pickled, a copy gets a fresh lock in __setstate__
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
     def _default_rating(self):
         return self.initial_rating
 
@@ -98,7 +252,7 @@ class EloSystem:
         :param rating_b: The rating of the second reviewer
         :return: The expected score for the first reviewer
         """
-        return 1 / (1 + math.pow(10, (rating_b - rating_a) / 400))
+        return 1.0 / (1.0 + math.exp((rating_b - rating_a) * _LN10_OVER_400))
 
     def update_ratings(self, vote: Vote):
         """
@@ -106,29 +260,16 @@ class EloSystem:
 
         :param vote: The Vote object containing comparison results
         """
-        comparisons = {
-            "technical_quality": vote.technical_quality,
-            "constructiveness": vote.constructiveness,
-            "clarity": vote.clarity,
-            "overall_quality": vote.overall_quality,
-        }
-
-        total_score = 0
-        for dimension, result in comparisons.items():
-            if result == ARENA_RATING_CHOICES[0]:  # "👈  A is better"
-                score = 1.0
-            elif result == ARENA_RATING_CHOICES[1]:  # "👉  B is better"
-                score = 0.0
-            elif result == ARENA_RATING_CHOICES[2]:  # "🤝  Tie"
-                score = 0.5
-            else:  # "👎  Both are bad"
-                # " Both are bad, it's essentially a Tie"
-                score = 0.5
-
-            total_score += getattr(self.weights, dimension) * score
-
-        total_weight = sum(self.weights.model_dump().values())
-        normalized_score = total_score / total_weight
+        # "👈  A is better" scores 1, "👉  B is better" 0, "🤝  Tie" and "👎  Both are bad" 0.5
+        choice_to_score = self._choice_to_score
+        w_tq, w_con, w_cla, w_oq = self._weights_vec
+        total_score = (
+            w_tq * choice_to_score.get(vote.technical_quality, 0.5)
+            + w_con * choice_to_score.get(vote.constructiveness, 0.5)
+            + w_cla * choice_to_score.get(vote.clarity, 0.5)
+            + w_oq * choice_to_score.get(vote.overall_quality, 0.5)
+        )
+        normalized_score = total_score / self._total_weight
 
         rating_a = self._ratings[vote.reviewer_a]
         rating_b = self._ratings[vote.reviewer_b]
@@ -142,18 +283,20 @@ class EloSystem:
         self._ratings[vote.reviewer_b] += self.k_factor * (
             (1 - normalized_score) - expected_b
         )
+        self._ratings_version += 1
 
         # Update vote counts
         self.vote_counts[vote.reviewer_a] += normalized_score
         self.vote_counts[vote.reviewer_b] += 1 - normalized_score
 
-        logger.debug(
-            "Updated ratings: %s (new rating: %s), %s (new rating: %s)",
-            vote.reviewer_a,
-            self._ratings[vote.reviewer_a],
-            vote.reviewer_b,
-            self._ratings[vote.reviewer_b],
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Updated ratings: %s (new rating: %s), %s (new rating: %s)",
+                vote.reviewer_a,
+                self._ratings[vote.reviewer_a],
+                vote.reviewer_b,
+                self._ratings[vote.reviewer_b],
+            )
 
     def add_vote(self, vote: Vote):
         """
@@ -162,7 +305,7 @@ class EloSystem:
         :param vote: The Vote object containing comparison results
         """
         self.votes.append(vote)
-        logger.info("Added vote: %s vs %s", vote.reviewer_a, vote.reviewer_b)
+        logger.debug("Added vote: %s vs %s", vote.reviewer_a, vote.reviewer_b)
 
     def add_vote_then_update_ratings(self, vote: Vote):
         """
@@ -170,12 +313,39 @@ class EloSystem:
 
         :param vote: The Vote object containing comparison results
         """
-        self.add_vote(vote)
-        self.update_ratings(vote)
-        logger.info(
+        with self._lock:
+            self.add_vote(vote)
+            self.update_ratings(vote)
+        logger.debug(
             "Added vote and update ratings: %s vs %s", vote.reviewer_a, vote.reviewer_b
         )
 
+    def num_votes(self) -> int:
+        """
+        Get the number of votes the ratings are computed from.
+
+        :return: The number of votes
+        """
+        return len(self.votes)
+
+    def _get_sorted_ratings(self) -> Tuple[List[float], List[str]]:
+        """
+        Get the ratings in ascending order along with the matching reviewer IDs.
+        The order is cached and only rebuilt after the ratings change.
+
+        :return: A tuple of (sorted ratings, reviewer IDs in the same order)
+        """
+        if (
+            self._sorted_ratings_owner is not self._ratings
+            or self._sorted_ratings_version != self._ratings_version
+        ):
+            ordered = sorted(self._ratings.items(), key=lambda item: item[1])
+            self._sorted_ratings = [rating for _, rating in ordered]
+            self._sorted_reviewers = [reviewer for reviewer, _ in ordered]
+            self._sorted_ratings_owner = self._ratings
+            self._sorted_ratings_version = self._ratings_version
+        return self._sorted_ratings, self._sorted_reviewers
+
     def get_fair_pair(
         self,
         fair_match_diff_step: float = 10.0,
@@ -183,62 +353,97 @@ class EloSystem:
         candidates_a: set[str] | None = None,
         candidates_b: set[str] | None = None,
     ) -> tuple[str, str] | None:
-        all_reviewers = set(self._ratings.keys())
-
-        # Use all_reviewers only if candidates are None, not if they're empty sets
-        candidates_a = candidates_a if candidates_a is not None else all_reviewers
-        candidates_b = candidates_b if candidates_b is not None else all_reviewers
+        # Use all rated reviewers only if candidates are None, not if they're empty sets
+        if candidates_a is None:
+            candidates_a = set(self._ratings)
+        if candidates_b is None:
+            candidates_b = set(self._ratings)
 
         if len(candidates_a) < 1 or len(candidates_b) < 1:
             return None
 
-        # If all_reviewers is empty, randomly sample a pair from candidates_a and candidates_b
-        if not all_reviewers:
-            reviewer_a = random.choice(list(candidates_a))
+        candidates_a_list = list(candidates_a)
+
+        # If no reviewer is rated yet, randomly sample a pair from candidates_a and candidates_b
+        if not self._ratings:
+            reviewer_a = random.choice(candidates_a_list)
             reviewer_b = random.choice(list(candidates_b - {reviewer_a}))
-            logger.info("Selected fair pair: %s vs %s", reviewer_a, reviewer_b)
+            logger.debug("Selected fair pair: %s vs %s", reviewer_a, reviewer_b)
             return reviewer_a, reviewer_b
 
-        max_rating = max(self._ratings.values())
-        min_rating = min(self._ratings.values())
+        # Reviewers without votes yet start at the initial rating
+        missing_reviewers = (candidates_a | candidates_b) - self._ratings.keys()
+        if missing_reviewers:
+            with self._lock:
+                for reviewer in missing_reviewers:
+                    self._ratings[reviewer] = self._default_rating()
+                self._ratings_version += 1
+        sorted_ratings, sorted_reviewers = self._get_sorted_ratings()
+
+        # Excluded opponents of each reviewer, in both directions, so that each candidate
+        # needs a single set lookup instead of two tuple lookups
+        excluded_for: Dict[str, set[str]] = defaultdict(set)
+        for x, y in exclude_pairs:
+            excluded_for[x].add(y)
+            excluded_for[y].add(x)
+        candidates_b = frozenset(candidates_b)
 
         max_attempts = 100  # Prevent infinite loop
         for _ in range(max_attempts):
-            reviewer_a = random.choice(list(candidates_a))
+            reviewer_a = random.choice(candidates_a_list)
             base_rating = self._ratings[reviewer_a]
-
-            max_possible_diff = max(max_rating - base_rating, base_rating - min_rating)
-            max_possible_diff = (
-                math.ceil(max_possible_diff / fair_match_diff_step)
-                * fair_match_diff_step
+            excluded_for_a = excluded_for.get(reviewer_a, ())
+
+            def is_eligible(r: str) -> bool:
+                return r != reviewer_a and r in candidates_b and r not in excluded_for_a
+
+            # Walk outwards from the base rating to the closest eligible reviewer on each side
+            pos = bisect_left(sorted_ratings, base_rating)
+            nearest_diff = None
+            for i in range(pos - 1, -1, -1):
+                if is_eligible(sorted_reviewers[i]):
+                    nearest_diff = base_rating - sorted_ratings[i]
+                    break
+            for i in range(pos, len(sorted_ratings)):
+                diff = sorted_ratings[i] - base_rating
+                if nearest_diff is not None and diff >= nearest_diff:
+                    break
+                if is_eligible(sorted_reviewers[i]):
+                    nearest_diff = diff
+                    break
+            if nearest_diff is None:
+                continue
+
+            # The smallest multiple of the step, starting from 0, that reaches an eligible reviewer
+            current_diff = max(
+                math.ceil(nearest_diff / fair_match_diff_step) * fair_match_diff_step,
+                nearest_diff,
             )
+            lo = bisect_left(sorted_ratings, base_rating - current_diff)
+            hi = bisect_right(sorted_ratings, base_rating + current_diff)
+            eligible_reviewers = [r for r in sorted_reviewers[lo:hi] if is_eligible(r)]
 
-            # Starting from 0, in case all the scores are the same
-            current_diff = 0.0
-
-            while current_diff <= max_possible_diff:
-                eligible_reviewers = [
-                    r
-                    for r in candidates_b
-                    if r != reviewer_a
-                    and abs(self._ratings[r] - base_rating) <= current_diff
-                    and (reviewer_a, r) not in exclude_pairs
-                    and (r, reviewer_a) not in exclude_pairs
-                ]
-
-                if eligible_reviewers:
-                    reviewer_b = random.choice(eligible_reviewers)
-                    logger.info("Selected fair pair: %s vs %s", reviewer_a, reviewer_b)
-                    return reviewer_a, reviewer_b
-
-                current_diff += fair_match_diff_step
+            if eligible_reviewers:
+                reviewer_b = random.choice(eligible_reviewers)
+                logger.debug("Selected fair pair: %s vs %s", reviewer_a, reviewer_b)
+                return reviewer_a, reviewer_b
 
         logger.warning("No valid pair found after maximum attempts")
         return None  # No valid pair found after maximum attempts
 
-    def get_ratings(self) -> Dict[str, float]:
+    def get_ratings(self) -> Mapping[str, float]:
+        """
+        Get a read-only snapshot of the current ratings for all reviewers.
+        Missing reviewers raise KeyError rather than getting the default rating, and later updates are not reflected.
+
+        :return: A mapping of reviewer IDs to their corresponding ratings
+        """
+        with self._lock:
+            return MappingProxyType(dict(self._ratings))
+
+    def get_ratings_copy(self) -> Dict[str, float]:
         """
-        Get the current ratings for all reviewers.
+        Get a copy of the current ratings for all reviewers.
 
         :return: A dictionary of reviewer IDs and their corresponding ratings
         """
@@ -250,20 +455,38 @@ class EloSystem:
 
         :return: A dictionary of reviewer IDs and their corresponding stats
         """
-        stats: Dict[str, Dict[str, float | Tuple[float, float]]] = {}
-
-        for reviewer_id, rating in self._ratings.items():
-            vote_count = self.vote_counts[reviewer_id]
-            ci: Tuple[float, float] = self._calculate_confidence_interval(
-                rating, vote_count
+        with self._lock:
+            reviewer_ids = list(self._ratings)
+            ratings = np.fromiter(self._ratings.values(), dtype=float, count=len(reviewer_ids))
+            vote_counts = np.fromiter(
+                (self.vote_counts.get(reviewer_id, 0.0) for reviewer_id in reviewer_ids),
+                dtype=float,
+                count=len(reviewer_ids),
             )
-            stats[reviewer_id] = {
+
+        # Same bounds as _calculate_confidence_interval, computed for all reviewers at once
+        std_devs = np.divide(
+            self.k_factor,
+            np.sqrt(vote_counts),
+            out=np.zeros_like(vote_counts),
+            where=vote_counts != 0,
+        )
+        margins = 1.96 * std_devs
+
+        return {
+            reviewer_id: {
                 "Arena Score": rating,
-                "95% CI": ci,
+                "95% CI": (lower_bound, upper_bound),
                 "Votes": vote_count,
             }
-
-        return stats
+            for reviewer_id, rating, lower_bound, upper_bound, vote_count in zip(
+                reviewer_ids,
+                ratings.tolist(),
+                (ratings - margins).tolist(),
+                (ratings + margins).tolist(),
+                vote_counts.tolist(),
+            )
+        }
 
     def _calculate_confidence_interval(
         self, rating: float, vote_count: float
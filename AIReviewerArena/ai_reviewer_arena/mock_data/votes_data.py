@@ -1,45 +1,66 @@
-import random
 import string
-from collections import defaultdict
+
+import numpy as np
 
 from ai_reviewer_arena.configs.app_cfg import ARENA_RATING_CHOICES
+from ai_reviewer_arena.configs.logging_cfg import setup_logging
 from ai_reviewer_arena.papers import Paper
 from ai_reviewer_arena.utils import generate_short_uuid
 from ai_reviewer_arena.votes import Vote, VotesJSONL, VotesSqlite
 
 
+CHOICE_IDX = {choice: i for i, choice in enumerate(ARENA_RATING_CHOICES)}
+
+RANDOM_TEXT_CHARSET = np.frombuffer(
+    (string.ascii_letters + string.digits + string.punctuation + " ").encode("ascii"), dtype=np.uint8
+)
+
+
+def generate_random_texts(rng, num_texts, length=100):
+    # Draw every character in one call, then slice the ASCII buffer into strings
+    buffer = rng.choice(RANDOM_TEXT_CHARSET, size=(num_texts, length)).tobytes().decode("ascii")
+    return [buffer[i : i + length] for i in range(0, num_texts * length, length)]
+
+
 def generate_random_text(length=100):
-    letters = string.ascii_letters + string.digits + string.punctuation + " "
-    return "".join(random.choice(letters) for _ in range(length))
+    return generate_random_texts(np.random.default_rng(), 1, length)[0]
 
 
 def generate_mock_votes(num_votes=100):
     reviewers = Paper.REVIEWER_FIELDS
+    rng = np.random.default_rng()
 
-    # Probability weights for A and B
+    # Probability weights for each rating choice
     weights = [0.25, 0.25, 0.25, 0.25]
 
-    votes = []
-    for _ in range(num_votes):
-        reviewer_a, reviewer_b = random.sample(reviewers, 2)
-        vote = Vote(
+    # Each row is an independent permutation of the reviewers; its first two entries are a distinct pair
+    reviewer_order = rng.permuted(np.broadcast_to(np.arange(len(reviewers)), (num_votes, len(reviewers))), axis=1)
+    pair_idx = reviewer_order[:, :2].tolist()
+    # One column per rating dimension
+    choice_idx = rng.choice(len(ARENA_RATING_CHOICES), size=(num_votes, 4), p=weights).tolist()
+    review_texts = generate_random_texts(rng, num_votes * 2, 100)
+
+    # All fields come from the generator above, so pydantic validation is skipped
+    return [
+        Vote.model_construct(
             session_id=generate_short_uuid(),
             paper_id=generate_short_uuid(),  # New field added
-            reviewer_a=reviewer_a,
-            reviewer_b=reviewer_b,
-            technical_quality=random.choices(ARENA_RATING_CHOICES, weights=weights)[0],
-            constructiveness=random.choices(ARENA_RATING_CHOICES, weights=weights)[0],
-            clarity=random.choices(ARENA_RATING_CHOICES, weights=weights)[0],
-            overall_quality=random.choices(ARENA_RATING_CHOICES, weights=weights)[0],
-            review_a=generate_random_text(100),  # Random text for review_a
-            review_b=generate_random_text(100),  # Random text for review_b
+            reviewer_a=reviewers[a_idx],
+            reviewer_b=reviewers[b_idx],
+            technical_quality=ARENA_RATING_CHOICES[tq_idx],
+            constructiveness=ARENA_RATING_CHOICES[con_idx],
+            clarity=ARENA_RATING_CHOICES[cla_idx],
+            overall_quality=ARENA_RATING_CHOICES[oq_idx],
+            review_a=review_texts[2 * i],  # Random text for review_a
+            review_b=review_texts[2 * i + 1],  # Random text for review_b
         )
-        votes.append(vote)
-
-    return votes
+        for i, ((a_idx, b_idx), (tq_idx, con_idx, cla_idx, oq_idx)) in enumerate(zip(pair_idx, choice_idx))
+    ]
 
 
 def main():
+    setup_logging()
+
     votes_storage_jsonl = VotesJSONL("mock_arena_votes.jsonl")
     votes_storage_db = VotesSqlite("mock_arena_votes.db")
 
@@ -62,24 +83,15 @@ def main():
         print()
 
     # Calculate and print the distribution of choices
-    choice_counts = {
-        "technical_quality": defaultdict(lambda: 0),
-        "constructiveness": defaultdict(lambda: 0),
-        "clarity": defaultdict(lambda: 0),
-        "overall_quality": defaultdict(lambda: 0),
-    }
-
-    for vote in stored_votes:
-        choice_counts["technical_quality"][vote.technical_quality] += 1
-        choice_counts["constructiveness"][vote.constructiveness] += 1
-        choice_counts["clarity"][vote.clarity] += 1
-        choice_counts["overall_quality"][vote.overall_quality] += 1
-
     print("Distribution of choices:")
-    for category, counts in choice_counts.items():
-        total = sum(counts.values())
+    for category in ("technical_quality", "constructiveness", "clarity", "overall_quality"):
+        choice_idx = np.fromiter(
+            (CHOICE_IDX[getattr(vote, category)] for vote in stored_votes), dtype=np.int8, count=len(stored_votes)
+        )
+        counts = np.bincount(choice_idx, minlength=len(ARENA_RATING_CHOICES))
+        total = counts.sum()
         print(f"{category}:")
-        for choice, count in counts.items():
+        for choice, count in zip(ARENA_RATING_CHOICES, counts.tolist()):
             percentage = (count / total) * 100
             print(f"  {choice}: {count} ({percentage:.2f}%)")
 
@@ -1,15 +1,11 @@
-import json
+import functools
 import logging
 import random
 from pathlib import Path
-from typing import ClassVar, List
+from typing import Any, ClassVar, Dict, List, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
-from ai_reviewer_arena.configs.logging_cfg import setup_logging
-
-# Setup logging
-setup_logging()
 logger = logging.getLogger("PaperRegistry")
 
 PROJECT_HOME = Path(__file__).parent.parent
@@ -17,6 +13,9 @@ DEFAULT_PAPER_PATH = PROJECT_HOME / "arena_data/resources/papers/paper_reviews.j
 
 
 class Paper(BaseModel):
+    # Papers are never modified once loaded
+    model_config = ConfigDict(frozen=True)
+
     paper_id: str
     title: str
     pdf_path: str
@@ -33,27 +32,49 @@ class Paper(BaseModel):
         "multi_agent_without_knowledge",
     ]
 
+    # Reviews keyed by reviewer ID and the valid reviewer IDs, built once when the Paper is created
+    _reviews: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    _valid_ids: Tuple[str, ...] = PrivateAttr(default=())
+    _valid_reviewer_ids: frozenset[str] = PrivateAttr(default=frozenset())
+
+    def model_post_init(self, __context: Any) -> None:
+        self._reviews = {field: getattr(self, field) for field in self.REVIEWER_FIELDS}
+        # A reviewer ID is valid if its field is a list with at least one non-empty string
+        self._valid_ids = tuple(
+            field
+            for field, value in self._reviews.items()
+            if isinstance(value, list) and any(len(str(item).strip()) > 0 for item in value)
+        )
+        self._valid_reviewer_ids = frozenset(self._valid_ids)
+
+    @property
+    def reviews(self) -> Dict[str, List[str]]:
+        """
+        Returns the reviews of the Paper keyed by reviewer ID.
+        """
+        return self._reviews
+
     def get_all_valid_reviewer_ids(self) -> List[str]:
         """
         Returns a list of all valid reviewer IDs.
         A reviewer ID is considered valid if its corresponding field is a non-empty list
         and contains at least one non-empty string.
         Uses the REVIEWER_FIELDS class attribute to determine reviewer fields.
+        The IDs are computed once when the Paper is created.
         """
-        valid_reviewer_ids = []
+        valid_reviewer_ids = list(self._valid_ids)
 
-        for field in self.REVIEWER_FIELDS:
-            value = getattr(self, field)
-            if isinstance(value, list) and len(value) > 0:
-                # Check if there's at least one non-empty string in the list
-                if any(len(str(item).strip()) > 0 for item in value):
-                    valid_reviewer_ids.append(field)
-
-        logger.debug(
-            f"Valid reviewer IDs for paper {self.paper_id}: {valid_reviewer_ids}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Valid reviewer IDs for paper {self.paper_id}: {valid_reviewer_ids}")
         return valid_reviewer_ids
 
+    def get_valid_reviewer_id_set(self) -> frozenset[str]:
+        """
+        Returns the valid reviewer IDs as a frozenset.
+        The reviews of a Paper do not change once loaded, so the set is precomputed at creation.
+        """
+        return self._valid_reviewer_ids
+
 
 class PaperRegistry:
     def __init__(self):
@@ -72,12 +93,9 @@ class PaperRegistry:
         - An instance of PaperRegistry containing the list of Paper objects.
         """
         registry = cls()
+        # Validate the records line by line as they are read, so the raw file is never held in memory
         with open(file_path, "r") as file:
-            for line in file:
-                paper_data = json.loads(line.strip())
-                paper = Paper(**paper_data)
-                registry._paper_list.append(paper)
-                logger.debug(f"Added paper {paper.paper_id} to registry")
+            registry._paper_list = [Paper.model_validate_json(line) for line in file if line.strip()]
         logger.info(f"Loaded {len(registry._paper_list)} papers from {file_path}")
         return registry
 
@@ -99,7 +117,8 @@ class PaperRegistry:
         - An integer representing the number of papers.
         """
         count = len(self._paper_list)
-        logger.debug(f"Paper count: {count}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Paper count: {count}")
         return count
 
     def sample_paper_position(self) -> int:
@@ -130,7 +149,8 @@ class PaperRegistry:
             logger.error("Paper list is empty.")
             raise ValueError("Paper list is empty.")
         next_pos = (cur_pos + 1) if cur_pos + 1 < len(self._paper_list) else 0
-        logger.debug(f"Next position from {cur_pos}: {next_pos}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Next position from {cur_pos}: {next_pos}")
         return next_pos
 
     def get_previous_position(self, cur_pos: int) -> int:
@@ -147,7 +167,8 @@ class PaperRegistry:
             logger.error("Paper list is empty.")
             raise ValueError("Paper list is empty.")
         prev_pos = (cur_pos - 1) if cur_pos > 0 else len(self._paper_list) - 1
-        logger.debug(f"Previous position from {cur_pos}: {prev_pos}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Previous position from {cur_pos}: {prev_pos}")
         return prev_pos
 
     def get_paper_at_position(self, pos: int) -> Paper:
@@ -166,9 +187,31 @@ class PaperRegistry:
         if pos < 0 or pos >= len(self._paper_list):
             logger.error(f"Position {pos} out of bounds.")
             raise IndexError("Position out of bounds.")
-        logger.debug(f"Returning paper at position {pos}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Returning paper at position {pos}")
         return self._paper_list[pos]
 
 
-paper_registry = PaperRegistry.from_jsonl(str(DEFAULT_PAPER_PATH))
-logger.info(f"Paper registry loaded from default path: {str(DEFAULT_PAPER_PATH)}")
+@functools.lru_cache(maxsize=1)
+def get_paper_registry() -> PaperRegistry:
+    """
+    Loads the PaperRegistry from the default path on first use and returns the cached instance afterwards.
+
+    Returns:
+    - The shared PaperRegistry instance.
+    """
+    registry = PaperRegistry.from_jsonl(str(DEFAULT_PAPER_PATH))
+    logger.info(f"Paper registry loaded from default path: {str(DEFAULT_PAPER_PATH)}")
+    return registry
+
+
+class _LazyPaperRegistry:
+    """
+    Stand-in for the module-level paper_registry that forwards attribute access to get_paper_registry().
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_paper_registry(), name)
+
+
+paper_registry = _LazyPaperRegistry()
@@ -1,17 +1,16 @@
 import logging
+import sys
 from collections import OrderedDict
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from ai_reviewer_arena.configs.logging_cfg import setup_logging
-
-# Setup logging
-setup_logging()
 logger = logging.getLogger("ModelRegistry")
 
 
 class ReviewerInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     short_name: str
     long_name: str
@@ -22,11 +21,17 @@ class ReviewerInfo(BaseModel):
 class ReviewerRegistry:
     def __init__(self):
         self.model_info: Dict[str, ReviewerInfo] = OrderedDict()
+        # Markdown description of the registered models, rebuilt after a new registration
+        self._md_cache: str | None = None
+        # Registered model ids in registration order, rebuilt after a new registration
+        self._id_cache: Tuple[str, ...] | None = None
         logger.info("Initialized ModelRegistry")
 
     def register_model_info(
         self, id: str, short_name: str, long_name: str, link: str, description: str
     ):
+        # Reviewer ids are used as set members and dict keys on every vote, so intern them
+        id = sys.intern(id)
         info = ReviewerInfo(
             id=id,
             short_name=short_name,
@@ -35,11 +40,14 @@ class ReviewerRegistry:
             description=description,
         )
         self.model_info[id] = info
+        self._md_cache = None
+        self._id_cache = None
         logger.info(f"Registered model info: {info}")
 
     def get_model_info(self, id: str) -> ReviewerInfo:
         if id in self.model_info:
-            logger.info(f"Retrieved model info for id: {id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Retrieved model info for id: {id}")
             return self.model_info[id]
         else:
             logger.error(f"Model {id} does not exist")
@@ -47,11 +55,15 @@ class ReviewerRegistry:
                 f"The model {id} does not exist. Please use `register_model_info` to register the model."
             )
 
-    def get_model_id_list(self) -> List[str]:
+    def get_model_id_list(self) -> Tuple[str, ...]:
+        if self._id_cache is None:
+            self._id_cache = tuple(self.model_info)
         logger.info("Retrieved list of all registered model ids")
-        return list(self.model_info.keys())
+        return self._id_cache
 
     def get_model_description_md(self) -> str:
+        if self._md_cache is not None:
+            return self._md_cache
         logger.info("Generating markdown description for all models")
         model_description_md = """
 | | | |
@@ -60,7 +72,7 @@ class ReviewerRegistry:
         ct = 0
         visited = set()
         for id in self.model_info:
-            info = self.get_model_info(id)
+            info = self.model_info[id]
             if info.short_name in visited:
                 continue
             visited.add(info.short_name)
@@ -72,6 +84,7 @@ class ReviewerRegistry:
             if ct % 3 == 2:
                 model_description_md += "\n"
             ct += 1
+        self._md_cache = model_description_md
         return model_description_md
 
     def get_all_short_names(self) -> List[str]:
@@ -82,7 +95,8 @@ class ReviewerRegistry:
     def get_short_name(self, id: str) -> str:
         """Returns the short name for a specified model id."""
         info = self.get_model_info(id)
-        logger.info(f"Retrieved short name for model id: {id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Retrieved short name for model id: {id}")
         return info.short_name
 
     def get_all_long_names(self) -> List[str]:
@@ -93,7 +107,8 @@ class ReviewerRegistry:
     def get_long_name(self, id: str) -> str:
         """Returns the long name for a specified model id."""
         info = self.get_model_info(id)
-        logger.info(f"Retrieved long name for model id: {id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Retrieved long name for model id: {id}")
         return info.long_name
 
 
@@ -1,43 +1,305 @@
 import json
 import logging
 import pickle
+import queue
 import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable
+from collections.abc import ItemsView as ABCItemsView
+from collections.abc import KeysView as ABCKeysView
 from collections.abc import ValuesView as ABCValuesView
+from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
-from typing import (Any, Dict, ItemsView, KeysView, Optional, Set, TypeVar,
-                    Union, ValuesView)
+from typing import (Any, Callable, Dict, ItemsView, KeysView, Optional, Set,
+                    Tuple, TypeVar, Union, ValuesView)
 
-from ai_reviewer_arena.configs.logging_cfg import setup_logging
+try:
+    import orjson
+except ImportError:  # orjson is optional, sessions are then serialized with the json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, large session data is then compressed with zlib
+    zstandard = None
 
-# Setup logging
-setup_logging()
 logger = logging.getLogger("SessionRegistry")
 
 PROJECT_HOME = Path(__file__).parent.parent
 SESSION_DB_FOLDER = PROJECT_HOME / "arena_data/app_databases"
 DEFAULT_DB_NAME = "sessions.db"
 
+# Timestamps are stored as unix microseconds
+SESSIONS_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        start_time INTEGER,
+        end_time INTEGER,
+        ip_address TEXT,
+        user_agent TEXT,
+        data BLOB
+    )
+"""
+SESSIONS_INDEX_DDL = "CREATE INDEX IF NOT EXISTS idx_sessions_end_time ON sessions(end_time)"
+
+# Run once when the registry opens its connection. With WAL, synchronous=NORMAL only syncs at checkpoints
+SESSIONS_SCHEMA_SCRIPT = f"""
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=10737418240;
+    PRAGMA cache_size=-65536;
+    PRAGMA busy_timeout=3000;
+    {SESSIONS_TABLE_DDL};
+    {SESSIONS_INDEX_DDL};
+"""
+
+INSERT_SESSION_SQL = """
+    INSERT INTO sessions
+    (session_id, start_time, end_time, ip_address, user_agent, data)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+UPDATE_SESSION_SQL = """
+    UPDATE sessions
+    SET start_time = ?, end_time = ?, ip_address = ?, user_agent = ?, data = ?
+    WHERE session_id = ?
+"""
+UPSERT_SESSION_SQL = (
+    INSERT_SESSION_SQL
+    + """
+    ON CONFLICT(session_id) DO UPDATE SET
+        start_time = excluded.start_time,
+        end_time = excluded.end_time,
+        ip_address = excluded.ip_address,
+        user_agent = excluded.user_agent,
+        data = excluded.data
+"""
+)
+
+# Keys of the fixed Session attributes in iteration order, mapped to the slots holding them
+_SPECIAL_KEY_ORDER = ("session_id", "start_time", "end_time", "ip_address", "user_agent")
+_KEY_TO_ATTR = {key: f"_{key}" for key in _SPECIAL_KEY_ORDER}
+_SPECIAL_KEYS = frozenset(_SPECIAL_KEY_ORDER)
+# Reads all fixed attribute values of a Session as a tuple, in _SPECIAL_KEY_ORDER
+_get_special_values = attrgetter(*_KEY_TO_ATTR.values())
+_IMMUTABLE_KEYS = frozenset({"session_id", "start_time"})
+
+SESSION_COLUMNS = ("session_id", "start_time", "end_time", "ip_address", "user_agent", "data")
+# Every column but the data BLOB. session_id is the PRIMARY KEY, so lookups by it use SQLite's implicit index
+SESSION_META_COLUMNS = ", ".join(SESSION_COLUMNS[:-1])
+
+# Read queries are built once, so every call passes the same text and hits sqlite3's prepared statement cache
+SESSION_EXISTS_SQL = "SELECT 1 FROM sessions WHERE session_id = ?"
+SELECT_SESSION_SQL = f"SELECT {SESSION_META_COLUMNS}, data FROM sessions WHERE session_id = ?"
+SELECT_SESSION_META_SQL = f"SELECT {SESSION_META_COLUMNS} FROM sessions WHERE session_id = ?"
+SELECT_SESSION_DATA_SQL = "SELECT data FROM sessions WHERE session_id = ?"
+
 T = TypeVar("T")
 
 
+def _default_serializer(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    return str(obj)
+
+
+def _to_unix_micros(dt: datetime) -> int:
+    # Whole seconds and microseconds are combined as integers, so the round trip is exact
+    return int(dt.replace(microsecond=0).timestamp()) * 1_000_000 + dt.microsecond
+
+
+def _from_unix_micros(value: int | str) -> datetime:
+    if isinstance(value, str):  # Timestamp written before the INTEGER columns
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value // 1_000_000).replace(microsecond=value % 1_000_000)
+
+
+if orjson is not None:
+
+    def _dumps_json_bytes(obj: Any) -> bytes:
+        # orjson writes datetimes natively in the same isoformat layout, other types go through the fallback
+        return orjson.dumps(obj, default=_default_serializer, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads_json = orjson.loads
+
+else:
+
+    def _dumps_json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default_serializer).encode()
+
+    _loads_json = json.loads
+
+# Keys tagging the session data values that have no JSON type of their own
+_SET_TAG = "__set__"
+_FROZENSET_TAG = "__frozenset__"
+_TUPLE_TAG = "__tuple__"
+_DATETIME_TAG = "__datetime__"
+
+# First byte of the data BLOBs written with pickle (protocol 2 and above)
+_PICKLE_PREFIX = b"\x80"
+
+# Serialized session data longer than this is compressed before it is stored
+COMPRESS_THRESHOLD = 4096
+# Compressed BLOBs are told apart by their header, which JSON and pickle data never start with
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZLIB_PREFIX = b"\x78"
+
+
+def _encode_data_value(value: Any) -> Any:
+    """
+    Converts session data into plain JSON values, tagging sets, tuples and datetimes so they can be restored.
+    Raises TypeError for values that have no lossless JSON form.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("Session data dict keys must be strings")
+        return {key: _encode_data_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_encode_data_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode_data_value(item) for item in value]}
+    if isinstance(value, set):
+        return {_SET_TAG: [_encode_data_value(item) for item in value]}
+    if isinstance(value, frozenset):
+        return {_FROZENSET_TAG: [_encode_data_value(item) for item in value]}
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    raise TypeError(f"Cannot store {type(value).__name__} in session data as JSON")
+
+
+def _decode_data_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode_data_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        tag, tagged_value = next(iter(value.items()))
+        if tag == _TUPLE_TAG:
+            return tuple(_decode_data_value(item) for item in tagged_value)
+        if tag == _SET_TAG:
+            return {_decode_data_value(item) for item in tagged_value}
+        if tag == _FROZENSET_TAG:
+            return frozenset(_decode_data_value(item) for item in tagged_value)
+        if tag == _DATETIME_TAG:
+            return datetime.fromisoformat(tagged_value)
+    return {key: _decode_data_value(item) for key, item in value.items()}
+
+
+def _compress(payload: bytes) -> bytes:
+    if zstandard is not None:
+        # Compressor objects are not safe to share between threads, and are cheap to create
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return zlib.compress(payload)
+
+
+def _decompress(blob: bytes) -> bytes:
+    if blob[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Session data is compressed with zstd, install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if blob[:1] == _ZLIB_PREFIX:
+        return zlib.decompress(blob)
+    return blob
+
+
+def _serialize_data(data: Dict[str, Any]) -> bytes:
+    """
+    Serializes session data to JSON bytes. Payloads above COMPRESS_THRESHOLD are compressed.
+    Raises TypeError for values JSON cannot represent; pickle is only read, for rows written by earlier versions.
+    """
+    payload = _dumps_json_bytes(_encode_data_value(data))
+    if len(payload) > COMPRESS_THRESHOLD:
+        return _compress(payload)
+    return payload
+
+
+def _is_pickled(blob: bytes) -> bool:
+    return blob[:1] == _PICKLE_PREFIX
+
+
+def _deserialize_data(blob: bytes) -> Dict[str, Any]:
+    blob = _decompress(blob)
+    if _is_pickled(blob):  # Written before session data was stored as JSON
+        return pickle.loads(blob)
+    return _decode_data_value(_loads_json(blob))
+
+
 class SessionValuesView(ABCValuesView):
+    __slots__ = ("_session",)
+
     def __init__(self, session):
         self._session = session
 
     def __iter__(self):
-        yield self._session._session_id
-        yield self._session._start_time
-        yield self._session._end_time
-        yield self._session._ip_address
-        yield self._session._user_agent
+        yield from _get_special_values(self._session)
         yield from self._session._data.values()
 
     def __len__(self):
-        return 5 + len(self._session._data)  # 5 special attributes + custom data
+        return len(_SPECIAL_KEY_ORDER) + len(self._session._data)
+
+
+class SessionKeysView(ABCKeysView):
+    __slots__ = ("_session",)
+
+    def __init__(self, session):
+        self._session = session
+
+    def __contains__(self, key):
+        return isinstance(key, str) and (key in _SPECIAL_KEYS or key in self._session._data)
+
+    def __iter__(self):
+        return iter(self._session)
+
+    def __len__(self):
+        return len(_SPECIAL_KEY_ORDER) + len(self._session._data)
+
+
+class SessionItemsView(ABCItemsView):
+    __slots__ = ("_session",)
+
+    def __init__(self, session):
+        self._session = session
+
+    def __contains__(self, item):
+        key, value = item
+        try:
+            stored_value = self._session[key]
+        except KeyError:
+            return False
+        return stored_value is value or stored_value == value
+
+    def __iter__(self):
+        yield from zip(_SPECIAL_KEY_ORDER, _get_special_values(self._session))
+        yield from self._session._data.items()
+
+    def __len__(self):
+        return len(_SPECIAL_KEY_ORDER) + len(self._session._data)
 
 
 class Session:
+    # Sessions are created per user, so they skip the per-instance __dict__
+    __slots__ = (
+        "_session_id",
+        "_start_time",
+        "_end_time",
+        "_ip_address",
+        "_user_agent",
+        "_data",
+        "_data_loader",
+        "_rev",
+        "_json_cache",
+    )
+
     def __init__(
         self,
         session_id: str,
@@ -54,7 +316,20 @@ class Session:
         self._ip_address: Optional[str] = ip_address
         self._user_agent: Optional[str] = user_agent
         self._data: Dict[str, Any] = {}
-        logger.info(f"Created new Session with id: {session_id}")
+        # Loads the custom data of a session restored without it, see SessionRegistry.load_session_meta
+        self._data_loader: Optional[Callable[[], Dict[str, Any]]] = None
+        # Bumped on every change, so to_json_bytes can reuse its last output while it matches
+        self._rev: int = 0
+        self._json_cache: Optional[Tuple[int, bytes]] = None
+        logger.info("Created new Session with id: %s", session_id)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when a slot is unset, which is how a session restored without its data marks it
+        if name == "_data" and self._data_loader is not None:
+            data_loader, self._data_loader = self._data_loader, None
+            self._data = data_loader()
+            return self._data
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
 
     @property
     def session_id(self) -> str:
@@ -71,6 +346,7 @@ class Session:
     @end_time.setter
     def end_time(self, value: Optional[datetime]) -> None:
         self._end_time = value
+        self._rev += 1
 
     @property
     def ip_address(self) -> Optional[str]:
@@ -79,6 +355,7 @@ class Session:
     @ip_address.setter
     def ip_address(self, value: Optional[str]) -> None:
         self._ip_address = value
+        self._rev += 1
 
     @property
     def user_agent(self) -> Optional[str]:
@@ -87,50 +364,50 @@ class Session:
     @user_agent.setter
     def user_agent(self, value: Optional[str]) -> None:
         self._user_agent = value
+        self._rev += 1
+
+    def mark_modified(self) -> None:
+        """
+        Records a change made to a stored value in place, such as adding to a set kept in the session.
+        Changes made through the session itself are tracked automatically.
+        """
+        self._rev += 1
 
     def __getitem__(self, key: str) -> Any:
-        if key == "session_id":
-            return self._session_id
-        elif key == "start_time":
-            return self._start_time
-        elif key in ["end_time", "ip_address", "user_agent"]:
-            return getattr(self, key)
-        if key not in self._data:
-            raise KeyError(key)
+        attr = _KEY_TO_ATTR.get(key)
+        if attr is not None:
+            return getattr(self, attr)
         return self._data[key]
 
     def __setitem__(self, key: str, value: Any) -> None:
-        if key in ["session_id", "start_time"]:
-            logger.warning(f"Attempted to set immutable attribute: {key}")
+        if key in _IMMUTABLE_KEYS:
+            logger.warning("Attempted to set immutable attribute: %s", key)
             raise AttributeError(f"'{key}' is immutable")
-        elif key in ["end_time", "ip_address", "user_agent"]:
-            setattr(self, key, value)
-            logger.debug(f"Set {key} to {value} for session {self._session_id}")
+        elif key in _SPECIAL_KEYS:
+            setattr(self, _KEY_TO_ATTR[key], value)
+            self._rev += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Set %s to %s for session %s", key, value, self._session_id)
         else:
             if value is None:
-                logger.warning(f"Attempted to set None value for key: {key}")
+                logger.warning("Attempted to set None value for key: %s", key)
                 raise ValueError("Cannot set None value in Session object")
             self._data[key] = value
-            logger.debug(
-                f"Set custom data {key}={value} for session {self._session_id}"
-            )
+            self._rev += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Set custom data %s=%s for session %s", key, value, self._session_id)
 
     def __delitem__(self, key: str) -> None:
-        if key in ["session_id", "start_time", "end_time", "ip_address", "user_agent"]:
+        if key in _SPECIAL_KEYS:
             raise AttributeError(f"Cannot delete '{key}' from Session object")
         del self._data[key]
+        self._rev += 1
 
     def __contains__(self, item: object) -> bool:
-        if isinstance(item, str):
-            return (
-                item
-                in ["session_id", "start_time", "end_time", "ip_address", "user_agent"]
-                or item in self._data
-            )
-        return False
+        return isinstance(item, str) and (item in _SPECIAL_KEYS or item in self._data)
 
     def __iter__(self):
-        yield from ["session_id", "start_time", "end_time", "ip_address", "user_agent"]
+        yield from _SPECIAL_KEY_ORDER
         yield from self._data
 
     def get(self, key: str, default: T | None = None) -> Union[Any, T]:
@@ -140,45 +417,28 @@ class Session:
             return default
 
     def pop(self, key: str, default: T | None = None) -> Union[Any, T]:
-        if key in ["session_id", "start_time", "end_time", "ip_address", "user_agent"]:
+        if key in _SPECIAL_KEYS:
             raise AttributeError(f"Cannot pop '{key}' from Session object")
+        self._rev += 1
         return self._data.pop(key, default)
 
     def clear(self) -> None:
         self._data.clear()
+        self._rev += 1
 
     def update(self, data: Dict[str, Any]) -> None:
         for key, value in data.items():
-            if key not in ["session_id", "start_time"]:
+            if key not in _IMMUTABLE_KEYS:
                 self[key] = value
 
     def keys(self) -> KeysView[str]:
-        combined_keys = {
-            **self._data,
-            "session_id": None,
-            "start_time": None,
-            "end_time": None,
-            "ip_address": None,
-            "user_agent": None,
-        }
-        return KeysView(combined_keys)
+        return SessionKeysView(self)
 
     def values(self) -> ValuesView[Any]:
         return SessionValuesView(self)
 
     def items(self) -> ItemsView[str, Any]:
-        return ItemsView(
-            dict(
-                list(self._data.items())
-                + [
-                    ("session_id", self._session_id),
-                    ("start_time", self._start_time),
-                    ("end_time", self._end_time),
-                    ("ip_address", self._ip_address),
-                    ("user_agent", self._user_agent),
-                ]
-            )
-        )
+        return SessionItemsView(self)
 
     def __repr__(self) -> str:
         return f"Session(session_id={self._session_id}, start_time={self._start_time}, end_time={self._end_time}, ip_address={self._ip_address}, user_agent={self._user_agent}, data={self._data})"
@@ -187,176 +447,360 @@ class Session:
         return self.to_json()
 
     def to_json(self, exclude_keys: Optional[Set[str]] = None) -> str:
-        def default_serializer(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            if hasattr(obj, "__dict__"):
-                return obj.__dict__
-            return str(obj)
-
-        output_dict = {
-            "session_id": self._session_id,
-            "start_time": self._start_time,
-            "end_time": self._end_time,
-            "ip_address": self._ip_address,
-            "user_agent": self._user_agent,
-            **self._data,
-        }
+        return self.to_json_bytes(exclude_keys).decode()
+
+    def to_json_bytes(self, exclude_keys: Optional[Set[str]] = None) -> bytes:
+        """
+        Serializes the session to UTF-8 encoded JSON, for writing to files or sockets without a decode step.
+        The full serialization is reused until the session changes, see mark_modified for in-place changes.
+        """
+        if not exclude_keys and self._json_cache is not None and self._json_cache[0] == self._rev:
+            return self._json_cache[1]
 
         if exclude_keys:
-            for key in exclude_keys:
-                output_dict.pop(key, None)
+            # Excluded keys are filtered while the dict is built, rather than popped afterwards
+            output_dict = {
+                key: value for key, value in SessionItemsView(self) if key not in exclude_keys
+            }
+        else:
+            output_dict = dict(zip(_SPECIAL_KEY_ORDER, _get_special_values(self)))
+            output_dict.update(self._data)
 
-        logger.debug(f"Serialized session {self._session_id} to JSON")
-        return json.dumps(output_dict, default=default_serializer)
+        logger.debug("Serialized session %s to JSON", self._session_id)
+        json_bytes = _dumps_json_bytes(output_dict)
+        if not exclude_keys:
+            self._json_cache = (self._rev, json_bytes)
+        return json_bytes
 
     @classmethod
-    def from_json(cls, json_str: str) -> "Session":
-        session_dict = json.loads(json_str)
-        session = cls(
-            session_id=session_dict["session_id"],
-            ip_address=session_dict.get("ip_address"),
-            user_agent=session_dict.get("user_agent"),
-        )
-        if "start_time" in session_dict:
-            session._start_time = datetime.fromisoformat(session_dict["start_time"])
-        if "end_time" in session_dict and session_dict["end_time"]:
-            session.end_time = datetime.fromisoformat(session_dict["end_time"])
-
-        for key, value in session_dict.items():
-            if key not in [
-                "session_id",
-                "start_time",
-                "end_time",
-                "ip_address",
-                "user_agent",
-            ]:
-                session._data[key] = value
-
-        logger.info(f"Created Session from JSON with id: {session.session_id}")
+    def from_json(cls, json_str: str | bytes) -> "Session":
+        session_dict = _loads_json(json_str)
+        # Take the fixed attributes out, what remains is the custom data
+        session_id = session_dict.pop("session_id")
+        start_time = session_dict.pop("start_time", None)
+        end_time = session_dict.pop("end_time", None)
+        ip_address = session_dict.pop("ip_address", None)
+        user_agent = session_dict.pop("user_agent", None)
+
+        session = cls(session_id=session_id, ip_address=ip_address, user_agent=user_agent)
+        if start_time:
+            session._start_time = datetime.fromisoformat(start_time)
+        if end_time:
+            session._end_time = datetime.fromisoformat(end_time)
+        session._data = session_dict
+
+        logger.info("Created Session from JSON with id: %s", session.session_id)
         return session
 
+    def _as_row(self) -> tuple:
+        """
+        Returns the session as a row of the sessions table, in column order.
+        """
+        return (
+            self._session_id,
+            _to_unix_micros(self._start_time),
+            _to_unix_micros(self._end_time) if self._end_time else None,
+            self._ip_address,
+            self._user_agent,
+            _serialize_data(self._data),  # This is already bytes, compatible with BLOB
+        )
+
     def to_sqlite(self):
-        logger.debug(f"Converted session {self._session_id} to SQLite format")
-        return {
-            "session_id": self._session_id,
-            "start_time": self._start_time.isoformat(),
-            "end_time": self._end_time.isoformat() if self._end_time else None,
-            "ip_address": self._ip_address,
-            "user_agent": self._user_agent,
-            "data": pickle.dumps(
-                self._data
-            ),  # This is already bytes, compatible with BLOB
-        }
+        logger.debug("Converted session %s to SQLite format", self._session_id)
+        return dict(zip(SESSION_COLUMNS, self._as_row()))
 
     @classmethod
     def from_sqlite(cls, data):
         session = cls(data["session_id"], data["ip_address"], data["user_agent"])
-        session._start_time = datetime.fromisoformat(data["start_time"])
+        session._start_time = _from_unix_micros(data["start_time"])
         if data["end_time"]:
-            session._end_time = datetime.fromisoformat(data["end_time"])
-        session._data = pickle.loads(data["data"])  # Unpickle the BLOB data
-        logger.info(f"Created Session from SQLite data with id: {session._session_id}")
+            session._end_time = _from_unix_micros(data["end_time"])
+        session._data = _deserialize_data(data["data"])
+        logger.info("Created Session from SQLite data with id: %s", session._session_id)
         return session
 
 
 class SessionRegistry:
-    def __init__(self, db_path: str | None = None):
+    def __init__(
+        self,
+        db_path: str | None = None,
+        save_interval: float = 0.05,
+        max_save_batch_size: int = 100,
+        uri: bool = False,
+        max_live_sessions: int = 10000,
+    ):
         if not db_path:
             db_path = str((SESSION_DB_FOLDER / DEFAULT_DB_NAME).resolve())
         self.db_path = db_path
-        self._create_table()
-        logger.info(f"Initialized SessionRegistry with database: {db_path}")
-
-    def _create_table(self):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS sessions (
-                    session_id TEXT PRIMARY KEY,
-                    start_time TEXT,
-                    end_time TEXT,
-                    ip_address TEXT,
-                    user_agent TEXT,
-                    data BLOB
-                )
-            """
+        # Live sessions kept server-side, so clients only need to hold their session id.
+        # Least recently used first; past max_live_sessions the oldest is saved and dropped, get() restores it
+        self.max_live_sessions = max_live_sessions
+        self._live_sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._live_sessions_lock = threading.Lock()
+        # One long-lived autocommit connection, shared by all threads under the lock
+        # With uri=True, db_path may be an SQLite URI such as "file:name?mode=memory&cache=shared"
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, uri=uri)
+        self._lock = threading.Lock()
+        self._conn.executescript(SESSIONS_SCHEMA_SCRIPT)
+        self._migrate_timestamps()
+        # Rows queued by enqueue_save, written in batches by a background thread started on first use
+        self.save_interval = save_interval
+        self.max_save_batch_size = max_save_batch_size
+        self._save_queue: queue.Queue[tuple] = queue.Queue()
+        self._writer_thread: threading.Thread | None = None
+        # Only guards starting the writer, so queueing a save never waits on the connection lock
+        self._writer_start_lock = threading.Lock()
+        logger.info("Initialized SessionRegistry with database: %s", db_path)
+
+    def register(self, session: Session):
+        self._add_live_session(session)
+        logger.debug("Registered live session %s", session.session_id)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """
+        Returns the live session with the given id, restoring it from the database if it is not in memory.
+        """
+        with self._live_sessions_lock:
+            session = self._live_sessions.get(session_id)
+            if session is not None:
+                self._live_sessions.move_to_end(session_id)
+        if session is None:
+            session = self.load_session(session_id)
+            if session is not None:
+                self._add_live_session(session)
+        return session
+
+    def discard(self, session_id: str):
+        with self._live_sessions_lock:
+            session = self._live_sessions.pop(session_id, None)
+        if session is not None:
+            logger.debug("Discarded live session %s", session_id)
+
+    def _add_live_session(self, session: Session):
+        evicted = []
+        with self._live_sessions_lock:
+            self._live_sessions[session.session_id] = session
+            self._live_sessions.move_to_end(session.session_id)
+            while len(self._live_sessions) > self.max_live_sessions:
+                evicted.append(self._live_sessions.popitem(last=False)[1])
+        # Saved so get() can restore them, e.g. sessions whose tab was closed without a discard
+        for evicted_session in evicted:
+            self.enqueue_save(evicted_session)
+            logger.debug("Evicted idle live session %s", evicted_session.session_id)
+
+    def _migrate_timestamps(self):
+        """
+        Converts a sessions table with TEXT isoformat timestamps to INTEGER unix microseconds.
+        """
+        cursor = self._conn.cursor()
+        cursor.execute("PRAGMA table_info(sessions)")
+        column_types = {row[1]: row[2].upper() for row in cursor.fetchall()}
+        if column_types.get("start_time") != "TEXT":
+            return
+
+        cursor.execute("SELECT * FROM sessions")
+        rows = [
+            (
+                session_id,
+                _to_unix_micros(datetime.fromisoformat(start_time)) if start_time else None,
+                _to_unix_micros(datetime.fromisoformat(end_time)) if end_time else None,
+                ip_address,
+                user_agent,
+                data,
             )
-            conn.commit()
-        logger.debug("Created sessions table if not exists")
+            for session_id, start_time, end_time, ip_address, user_agent, data in cursor.fetchall()
+        ]
+        # Rebuild the table in one transaction, so a failed migration leaves the old table in place
+        with self._write_transaction() as cursor:
+            cursor.execute("DROP INDEX IF EXISTS idx_sessions_end_time")
+            cursor.execute("ALTER TABLE sessions RENAME TO sessions_legacy")
+            cursor.execute(SESSIONS_TABLE_DDL)
+            cursor.execute(SESSIONS_INDEX_DDL)
+            cursor.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)", rows)
+            cursor.execute("DROP TABLE sessions_legacy")
+        logger.info("Migrated %s sessions to integer timestamps", len(rows))
+
+    @contextmanager
+    def _write_transaction(self):
+        """
+        Runs the enclosed writes in one BEGIN IMMEDIATE transaction, committed with a single sync.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
 
     def insert_session(self, session: Session):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            session_data = session.to_sqlite()
-            cursor.execute(
-                """
-                INSERT INTO sessions
-                (session_id, start_time, end_time, ip_address, user_agent, data)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    session_data["session_id"],
-                    session_data["start_time"],
-                    session_data["end_time"],
-                    session_data["ip_address"],
-                    session_data["user_agent"],
-                    session_data["data"],  # This is already bytes, compatible with BLOB
-                ),
-            )
-            conn.commit()
-        logger.info(f"Inserted session {session.session_id} into database")
+        self.insert_sessions([session])
+        logger.info("Inserted session %s into database", session.session_id)
+
+    def insert_sessions(self, sessions: Iterable[Session]):
+        """
+        Inserts all sessions in a single transaction.
+        """
+        rows = [session._as_row() for session in sessions]
+        with self._write_transaction() as cursor:
+            cursor.executemany(INSERT_SESSION_SQL, rows)
+        logger.debug("Inserted %s sessions into database", len(rows))
 
     def update_session(self, session: Session):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            session_data = session.to_sqlite()
-            cursor.execute(
-                """
-                UPDATE sessions
-                SET start_time = ?, end_time = ?, ip_address = ?, user_agent = ?, data = ?
-                WHERE session_id = ?
-            """,
-                (
-                    session_data["start_time"],
-                    session_data["end_time"],
-                    session_data["ip_address"],
-                    session_data["user_agent"],
-                    session_data["data"],  # This is already bytes, compatible with BLOB
-                    session_data["session_id"],
-                ),
-            )
-            conn.commit()
-        logger.info(f"Updated session {session.session_id} in database")
+        self.update_sessions([session])
+        logger.info("Updated session %s in database", session.session_id)
+
+    def update_sessions(self, sessions: Iterable[Session]):
+        """
+        Updates all sessions in a single transaction. Sessions that are not stored yet are skipped.
+        """
+        # The session id goes last, for the WHERE clause
+        rows = [row[1:] + row[:1] for row in map(Session._as_row, sessions)]
+        with self._write_transaction() as cursor:
+            cursor.executemany(UPDATE_SESSION_SQL, rows)
+        logger.debug("Updated %s sessions in database", len(rows))
+
+    def save(self, session: Session):
+        """
+        Stores the session with a single UPSERT statement, inserting it or replacing the stored copy.
+        """
+        row = session._as_row()
+        with self._lock:
+            self._conn.execute(UPSERT_SESSION_SQL, row)
+        logger.info("Saved session %s into database", session.session_id)
+
+    def upsert_session(self, session: Session):
+        """
+        Inserts the session, or updates it if a session with the same id is already stored.
+        """
+        self.save(session)
+
+    def upsert_sessions(self, sessions: Iterable[Session]):
+        """
+        Inserts or updates all sessions in a single transaction.
+        """
+        rows = [session._as_row() for session in sessions]
+        with self._write_transaction() as cursor:
+            cursor.executemany(UPSERT_SESSION_SQL, rows)
+        logger.debug("Upserted %s sessions into database", len(rows))
+
+    def enqueue_save(self, session: Session):
+        """
+        Queues the session to be saved by the background writer, without waiting for the commit.
+        The session is serialized right away, so later changes are not written with this save.
+        """
+        row = session._as_row()
+        with self._writer_start_lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._run_writer, name="SessionRegistryWriter", daemon=True
+                )
+                self._writer_thread.start()
+        self._save_queue.put(row)
+
+    def flush(self):
+        """
+        Waits until every queued save has been written.
+        """
+        self._save_queue.join()
+
+    def _run_writer(self):
+        while True:
+            batch = [self._save_queue.get()]
+            # Gather what else arrives within the save interval, up to a full batch
+            deadline = time.monotonic() + self.save_interval
+            while len(batch) < self.max_save_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._save_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            # Only the latest queued state of each session needs to be written
+            rows = list({row[0]: row for row in batch}.values())
+            try:
+                with self._write_transaction() as cursor:
+                    cursor.executemany(UPSERT_SESSION_SQL, rows)
+                logger.debug("Saved %s queued sessions into database", len(rows))
+            except Exception:
+                logger.exception("Failed to save %s queued sessions", len(rows))
+            finally:
+                for _ in batch:
+                    self._save_queue.task_done()
 
     def session_exists(self, session_id: str) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,))
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(SESSION_EXISTS_SQL, (session_id,))
             exists = cursor.fetchone() is not None
         logger.debug(
-            f"Checked existence of session {session_id}: {'exists' if exists else 'does not exist'}"
+            "Checked existence of session %s: %s",
+            session_id,
+            "exists" if exists else "does not exist",
         )
         return exists
 
     # If you need a method to load a session, you can add it like this:
     def load_session(self, session_id: str) -> Optional[Session]:
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,))
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(SELECT_SESSION_SQL, (session_id,))
             row = cursor.fetchone()
-            if row:
-                logger.info(f"Loaded session {session_id} from database")
-                return Session.from_sqlite(
-                    {
-                        "session_id": row[0],
-                        "start_time": row[1],
-                        "end_time": row[2],
-                        "ip_address": row[3],
-                        "user_agent": row[4],
-                        "data": row[5],  # This is BLOB data, which is bytes
-                    }
-                )
-        logger.warning(f"Attempted to load non-existent session: {session_id}")
+        if row:
+            logger.info("Loaded session %s from database", session_id)
+            session = Session.from_sqlite(
+                {
+                    "session_id": row[0],
+                    "start_time": row[1],
+                    "end_time": row[2],
+                    "ip_address": row[3],
+                    "user_agent": row[4],
+                    "data": row[5],  # This is BLOB data, which is bytes
+                }
+            )
+            # Rewrite sessions pickled by earlier versions in the JSON format
+            if _is_pickled(row[5]):
+                try:
+                    self.save(session)
+                except TypeError as e:
+                    logger.warning("Keeping pickled session %s, its data cannot be stored as JSON: %s", session_id, e)
+            return session
+        logger.warning("Attempted to load non-existent session: %s", session_id)
         return None
+
+    def load_session_meta(self, session_id: str) -> Optional[Session]:
+        """
+        Loads a session without reading its data BLOB. The custom data is read and decoded on first access.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(SELECT_SESSION_META_SQL, (session_id,))
+            row = cursor.fetchone()
+        if row is None:
+            logger.warning("Attempted to load non-existent session: %s", session_id)
+            return None
+
+        session = Session(row[0], row[3], row[4])
+        session._start_time = _from_unix_micros(row[1])
+        if row[2]:
+            session._end_time = _from_unix_micros(row[2])
+        del session._data
+        session._data_loader = partial(self._load_session_data, session_id)
+        logger.info("Loaded session metadata %s from database", session_id)
+        return session
+
+    def _load_session_data(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(SELECT_SESSION_DATA_SQL, (session_id,))
+            row = cursor.fetchone()
+        return _deserialize_data(row[0]) if row else {}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+        logger.info("Closed SessionRegistry database: %s", self.db_path)
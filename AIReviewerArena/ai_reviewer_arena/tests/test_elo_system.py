@@ -1,31 +1,92 @@
-import os
+import copy
 import unittest
 from datetime import datetime
+from types import MappingProxyType
 from typing import Tuple
 
 from ai_reviewer_arena.elo_system import EloSystem, ReviewEvalWeights
-from ai_reviewer_arena.votes import Vote, VotesSqlite
+from ai_reviewer_arena.votes import SqliteConnectionPool, Vote, VotesSqlite
+
+A_BETTER = "👈  A is better"
+B_BETTER = "👉  B is better"
+TIE = "🤝  Tie"
+BOTH_BAD = "👎  Both are bad"
+
+_FIXED_TS = datetime(2024, 1, 1)
+
+
+def _vote(choice: str = A_BETTER, **overrides) -> Vote:
+    """
+    Builds a vote of reviewer A against reviewer B with the same choice in every category.
+    Any field can be overridden by keyword.
+    """
+    fields = dict(
+        session_id="test",
+        paper_id="paper1",
+        reviewer_a="A",
+        reviewer_b="B",
+        technical_quality=choice,
+        constructiveness=choice,
+        clarity=choice,
+        overall_quality=choice,
+        review_a="Review A content",
+        review_b="Review B content",
+        vote_time=_FIXED_TS,
+    )
+    fields.update(overrides)
+    return Vote(**fields)
 
 
 class TestEloSystem(unittest.TestCase):
-    def setUp(self):
-        # self.test_file = "test_votes.jsonl"
-        # self.votes_db = VotesJSONL(self.test_file)
+    # Ratings shared by the get_fair_pair tests, copied into each EloSystem before use
+    _STD_RATINGS = MappingProxyType(
+        {"A": 1600.5, "B": 1550.25, "C": 1500.0, "D": 1450.75, "E": 1400.5}
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        # One in-memory votes database is shared by the whole suite and emptied before each test.
+        # A single pooled connection keeps the database alive between calls.
+        cls.pool = SqliteConnectionPool(":memory:", max_size=1)
+        cls.votes_db = VotesSqlite(pool=cls.pool)
+        # Tests start from a copy of an EloSystem built once over the empty database
+        cls._template = EloSystem(cls.votes_db)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
 
-        self.test_file = "test_votes.db"
-        self.votes_db = VotesSqlite(self.test_file)
+    def setUp(self):
+        with self.votes_db.get_db_connection() as conn:
+            conn.execute("DELETE FROM comparisons")
+            conn.commit()
 
-        self.elo_system = EloSystem(self.votes_db)
+        # The memo keeps the copy pointed at the shared votes database instead of copying it
+        self.elo_system = copy.deepcopy(
+            self._template, {id(self.votes_db): self.votes_db}
+        )
 
-    def tearDown(self):
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+    def _assert_float_ratings(self, ratings=None):
+        if ratings is None:
+            ratings = self.elo_system._ratings
+        self.assertTrue(all(isinstance(rating, float) for rating in ratings.values()))
 
     def test_initialization(self):
         self.assertEqual(self.elo_system.k_factor, 32)
         self.assertEqual(self.elo_system.initial_rating, 1500)
         self.assertIsInstance(self.elo_system.weights, ReviewEvalWeights)
 
+    def test_deepcopy(self):
+        self.elo_system.update_ratings(_vote())
+        elo_copy = copy.deepcopy(self.elo_system, {id(self.votes_db): self.votes_db})
+        self.assertEqual(elo_copy.get_ratings(), self.elo_system.get_ratings())
+        self.assertIsNot(elo_copy._lock, self.elo_system._lock)
+
+        # The copy is independent of the original, including its default ratings
+        elo_copy.update_ratings(_vote(reviewer_a="C"))
+        self.assertNotIn("C", self.elo_system._ratings)
+        self.assertIs(elo_copy._ratings.default_factory.__self__, elo_copy)  # type: ignore
+
     def test_expected_score(self):
         self.assertAlmostEqual(self.elo_system.expected_score(1500, 1500), 0.5)
         self.assertAlmostEqual(
@@ -35,151 +96,66 @@ class TestEloSystem(unittest.TestCase):
             self.elo_system.expected_score(1400.5, 1600.5), 0.24, places=2
         )
 
-    def test_update_ratings_win(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",  # New required field
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👈  A is better",
-            constructiveness="👈  A is better",
-            clarity="👈  A is better",
-            overall_quality="👈  A is better",
-            review_a="Review A content",  # New required field
-            review_b="Review B content",  # New required field
-            vote_time=datetime.now(),
-        )
-        # New assertions for the added fields
-        self.assertEqual(vote.paper_id, "paper1")
-        self.assertEqual(vote.review_a, "Review A content")
-        self.assertEqual(vote.review_b, "Review B content")
-        self.elo_system.update_ratings(vote)
-        self.assertGreater(self.elo_system._ratings["A"], 1500)
-        self.assertLess(self.elo_system._ratings["B"], 1500)
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
-
-    def test_update_ratings_loss(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👉  B is better",
-            constructiveness="👉  B is better",
-            clarity="👉  B is better",
-            overall_quality="👉  B is better",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
-        # New assertions for the added fields
-        self.assertEqual(vote.paper_id, "paper1")
-        self.assertEqual(vote.review_a, "Review A content")
-        self.assertEqual(vote.review_b, "Review B content")
-
-        self.elo_system.update_ratings(vote)
-        self.assertLess(self.elo_system._ratings["A"], 1500)
-        self.assertGreater(self.elo_system._ratings["B"], 1500)
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
-
-    def test_update_ratings_tie(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="🤝  Tie",
-            constructiveness="🤝  Tie",
-            clarity="🤝  Tie",
-            overall_quality="🤝  Tie",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
-        self.elo_system.update_ratings(vote)
-        self.assertAlmostEqual(self.elo_system._ratings["A"], 1500, places=2)
-        self.assertAlmostEqual(self.elo_system._ratings["B"], 1500, places=2)
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
-
-    def test_update_ratings_both_bad(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👎  Both are bad",
-            constructiveness="👎  Both are bad",
-            clarity="👎  Both are bad",
-            overall_quality="👎  Both are bad",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
-        self.elo_system.update_ratings(vote)
-        self.assertAlmostEqual(self.elo_system._ratings["A"], 1500, places=2)
-        self.assertAlmostEqual(self.elo_system._ratings["B"], 1500, places=2)
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
-
-    def test_update_ratings_mixed(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👈  A is better",
-            constructiveness="👉  B is better",
-            clarity="🤝  Tie",
-            overall_quality="👎  Both are bad",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
-        initial_rating_a = self.elo_system._ratings["A"]
-        initial_rating_b = self.elo_system._ratings["B"]
-        self.elo_system.update_ratings(vote)
-        self.assertEqual(self.elo_system._ratings["A"], initial_rating_a)
-        self.assertEqual(self.elo_system._ratings["B"], initial_rating_b)
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
+    def test_update_ratings(self):
+        # (name, vote, starting ratings, predicate on the updated ratings)
+        cases = [
+            ("win", _vote(), {}, lambda r: r["A"] > 1500 and r["B"] < 1500),
+            ("loss", _vote(B_BETTER), {}, lambda r: r["A"] < 1500 and r["B"] > 1500),
+            (
+                "tie",
+                _vote(TIE),
+                {},
+                lambda r: round(r["A"] - 1500, 2) == 0 and round(r["B"] - 1500, 2) == 0,
+            ),
+            (
+                "both_bad",
+                _vote(BOTH_BAD),
+                {},
+                lambda r: round(r["A"] - 1500, 2) == 0 and round(r["B"] - 1500, 2) == 0,
+            ),
+            (
+                "mixed",
+                _vote(
+                    technical_quality=A_BETTER,
+                    constructiveness=B_BETTER,
+                    clarity=TIE,
+                    overall_quality=BOTH_BAD,
+                ),
+                {},
+                lambda r: r["A"] == 1500 and r["B"] == 1500,
+            ),
+            (
+                "extreme_case",
+                _vote(),
+                {"A": 100, "B": 3000},
+                lambda r: 100 < r["A"] < r["B"] < 3000,
+            ),
+        ]
+        for name, vote, start_ratings, predicate in cases:
+            with self.subTest(name=name):
+                elo_system = EloSystem(self.votes_db)
+                elo_system._ratings.update(start_ratings)
+                elo_system.update_ratings(vote)
+                self.assertTrue(predicate(elo_system._ratings))
+                self._assert_float_ratings(elo_system._ratings)
 
     def test_add_vote_then_update_ratings(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👈  A is better",
-            constructiveness="👈  A is better",
-            clarity="👈  A is better",
-            overall_quality="👈  A is better",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
+        vote = _vote()
         # New assertions for the added fields
         self.assertEqual(vote.paper_id, "paper1")
         self.assertEqual(vote.review_a, "Review A content")
         self.assertEqual(vote.review_b, "Review B content")
 
+        self.assertEqual(self.elo_system.num_votes(), 0)
         self.elo_system.add_vote_then_update_ratings(vote)
         self.assertEqual(len(self.elo_system.votes), 1)
+        self.assertEqual(self.elo_system.num_votes(), 1)
         self.assertGreater(self.elo_system._ratings["A"], 1500)
         self.assertLess(self.elo_system._ratings["B"], 1500)
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
+        self._assert_float_ratings()
 
     def test_get_fair_pair_default_diff(self):
-        self.elo_system._ratings = {
-            "A": 1600.5,
-            "B": 1550.25,
-            "C": 1500.0,
-            "D": 1450.75,
-            "E": 1400.5,
-        }
+        self.elo_system._ratings = dict(self._STD_RATINGS)
         pair = self.elo_system.get_fair_pair()
         self.assertIsNotNone(pair)
         self.assertIsInstance(pair, tuple)
@@ -190,13 +166,7 @@ class TestEloSystem(unittest.TestCase):
         self.assertLessEqual(abs(self.elo_system._ratings[pair[0]] - self.elo_system._ratings[pair[1]]), 200.0)  # type: ignore
 
     def test_get_fair_pair_custom_diff(self):
-        self.elo_system._ratings = {
-            "A": 1600.5,
-            "B": 1550.25,
-            "C": 1500.0,
-            "D": 1450.75,
-            "E": 1400.5,
-        }
+        self.elo_system._ratings = dict(self._STD_RATINGS)
         pair = self.elo_system.get_fair_pair(fair_match_diff_step=100.0)
         self.assertIsNotNone(pair)
         self.assertIsInstance(pair, tuple)
@@ -207,13 +177,7 @@ class TestEloSystem(unittest.TestCase):
         self.assertLessEqual(abs(self.elo_system._ratings[pair[0]] - self.elo_system._ratings[pair[1]]), 200.0)  # type: ignore
 
     def test_get_fair_pair_exclude_pairs(self):
-        self.elo_system._ratings = {
-            "A": 1600.5,
-            "B": 1550.25,
-            "C": 1500.0,
-            "D": 1450.75,
-            "E": 1400.5,
-        }
+        self.elo_system._ratings = dict(self._STD_RATINGS)
         exclude_pairs = {("A", "B"), ("B", "C"), ("C", "D")}
         pair = self.elo_system.get_fair_pair(exclude_pairs=exclude_pairs)
         self.assertIsNotNone(pair)
@@ -226,13 +190,7 @@ class TestEloSystem(unittest.TestCase):
         self.assertNotIn((pair[1], pair[0]), exclude_pairs)  # type: ignore
 
     def test_get_fair_pair_candidates(self):
-        self.elo_system._ratings = {
-            "A": 1600.5,
-            "B": 1550.25,
-            "C": 1500.0,
-            "D": 1450.75,
-            "E": 1400.5,
-        }
+        self.elo_system._ratings = dict(self._STD_RATINGS)
         candidates_a = {"A", "B", "C"}
         candidates_b = {"C", "D", "E"}
         pair = self.elo_system.get_fair_pair(
@@ -297,37 +255,76 @@ class TestEloSystem(unittest.TestCase):
 
     def test_get_fair_pair_no_candidates(self):
         self.elo_system._ratings = {"A": 1500, "B": 1600, "C": 1400}
-        # Test when candidates_a is empty
-        pair = self.elo_system.get_fair_pair(
-            candidates_a=set(), candidates_b={"B", "C"}
-        )
-        self.assertIsNone(pair)
 
-        # Test when candidates_b is empty
-        pair = self.elo_system.get_fair_pair(candidates_a={"A"}, candidates_b=set())
-        self.assertIsNone(pair)
+        with self.subTest(case="empty_a"):
+            pair = self.elo_system.get_fair_pair(
+                candidates_a=set(), candidates_b={"B", "C"}
+            )
+            self.assertIsNone(pair)
+
+        with self.subTest(case="empty_b"):
+            pair = self.elo_system.get_fair_pair(candidates_a={"A"}, candidates_b=set())
+            self.assertIsNone(pair)
+
+        with self.subTest(case="both_provided"):
+            pair = self.elo_system.get_fair_pair(
+                candidates_a={"A"}, candidates_b={"B", "C"}
+            )
+            if pair is not None:
+                self.assertEqual(pair[0], "A")
+                self.assertIn(pair[1], ["B", "C"])
+            else:
+                # If no pair is returned, it might be because the rating difference is too large
+                self.assertTrue(
+                    abs(self.elo_system._ratings["A"] - self.elo_system._ratings["B"]) > 200
+                    and abs(self.elo_system._ratings["A"] - self.elo_system._ratings["C"])
+                    > 200
+                )
+
+        # Without candidate sets all reviewers are used
+        with self.subTest(case="not_provided"):
+            pair = self.elo_system.get_fair_pair()
+            self.assertIsNotNone(pair)
+            self.assertIn(pair[0], ["A", "B", "C"])  # type: ignore
+            self.assertIn(pair[1], ["A", "B", "C"])  # type: ignore
+            self.assertNotEqual(pair[0], pair[1])  # type: ignore
+
+    def test_get_fair_pair_picks_closest_step(self):
+        self.elo_system._ratings = {
+            "A": 1500.0,
+            "B": 1537.0,
+            "C": 1462.0,
+            "D": 1571.0,
+            "E": 1450.0,
+        }
+        # The closest eligible reviewers are 37 and 38 away, both within the 40 step
+        for _ in range(20):
+            pair = self.elo_system.get_fair_pair(
+                fair_match_diff_step=10.0, candidates_a={"A"}
+            )
+            self.assertIn(pair, [("A", "B"), ("A", "C")])
 
-        # Test when both candidate sets are provided
+        # Excluding B moves the closest eligible reviewer to C
         pair = self.elo_system.get_fair_pair(
-            candidates_a={"A"}, candidates_b={"B", "C"}
+            fair_match_diff_step=10.0, exclude_pairs={("B", "A")}, candidates_a={"A"}
         )
-        if pair is not None:
-            self.assertEqual(pair[0], "A")
-            self.assertIn(pair[1], ["B", "C"])
-        else:
-            # If no pair is returned, it might be because the rating difference is too large
-            self.assertTrue(
-                abs(self.elo_system._ratings["A"] - self.elo_system._ratings["B"]) > 200
-                and abs(self.elo_system._ratings["A"] - self.elo_system._ratings["C"])
-                > 200
-            )
+        self.assertEqual(pair, ("A", "C"))
 
-        # Test when candidates_a and candidates_b are not provided (should use all reviewers)
-        pair = self.elo_system.get_fair_pair()
-        self.assertIsNotNone(pair)
-        self.assertIn(pair[0], ["A", "B", "C"])  # type: ignore
-        self.assertIn(pair[1], ["A", "B", "C"])  # type: ignore
-        self.assertNotEqual(pair[0], pair[1])  # type: ignore
+    def test_get_fair_pair_after_new_votes(self):
+        # A wins against C, leaving the unrated B at 1500 the closest to A
+        for _ in range(3):
+            self.elo_system.add_vote_then_update_ratings(_vote(reviewer_a="A", reviewer_b="C"))
+        self.assertEqual(
+            self.elo_system.get_fair_pair(candidates_a={"A"}, candidates_b={"B", "C"}),
+            ("A", "B"),
+        )
+        # C wins against B, moving C closer to A than B. The cached rating order follows the updates
+        for _ in range(4):
+            self.elo_system.add_vote_then_update_ratings(_vote(reviewer_a="C", reviewer_b="B"))
+        self.assertEqual(
+            self.elo_system.get_fair_pair(candidates_a={"A"}, candidates_b={"B", "C"}),
+            ("A", "C"),
+        )
 
     # Add a new test to check if the method respects the fair_match_diff parameter
     def test_get_fair_pair_respects_fair_match_diff(self):
@@ -346,35 +343,31 @@ class TestEloSystem(unittest.TestCase):
         self.elo_system._ratings = {"A": 1600.5, "B": 1550.25, "C": 1500.0}
         ratings = self.elo_system.get_ratings()
         self.assertEqual(ratings, {"A": 1600.5, "B": 1550.25, "C": 1500.0})
-        for rating in ratings.values():
-            self.assertIsInstance(rating, float)
+        self._assert_float_ratings(ratings)
+        with self.assertRaises(TypeError):
+            ratings["A"] = 0.0
+
+        ratings_copy = self.elo_system.get_ratings_copy()
+        ratings_copy["A"] = 0.0
+        self.assertEqual(self.elo_system.get_ratings()["A"], 1600.5)
+
+    def test_get_ratings_does_not_add_missing_reviewers(self):
+        self.elo_system.update_ratings(_vote())
+        ratings = self.elo_system.get_ratings()
+        with self.assertRaises(KeyError):
+            ratings["X"]
+        self.assertNotIn("X", self.elo_system.get_ratings_copy())
 
     def test_initialize_ratings(self):
-        vote1 = Vote(
-            session_id="test1",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👈  A is better",
-            constructiveness="👈  A is better",
-            clarity="👈  A is better",
-            overall_quality="👈  A is better",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
-        vote2 = Vote(
+        vote1 = _vote(session_id="test1")
+        vote2 = _vote(
+            B_BETTER,
             session_id="test2",
             paper_id="paper2",
             reviewer_a="B",
             reviewer_b="C",
-            technical_quality="👉  B is better",
-            constructiveness="👉  B is better",
-            clarity="👉  B is better",
-            overall_quality="👉  B is better",
             review_a="Review B content",
             review_b="Review C content",
-            vote_time=datetime.now(),
         )
         # New assertions for the added fields
         self.assertEqual(vote1.paper_id, "paper1")
@@ -397,9 +390,7 @@ class TestEloSystem(unittest.TestCase):
             sum(self.elo_system.get_ratings().values()),
             self.elo_system.initial_rating * 3,
         )
-
-        for rating in self.elo_system._ratings.values():
-            self.assertIsInstance(rating, float)
+        self._assert_float_ratings()
 
     def test_custom_weights(self):
         custom_weights = ReviewEvalWeights(
@@ -409,18 +400,12 @@ class TestEloSystem(unittest.TestCase):
             overall_quality=0.1,
         )
         elo_system = EloSystem(self.votes_db, weights=custom_weights)
-        vote = Vote(
-            session_id="test",
+        vote = _vote(
+            B_BETTER,
+            technical_quality=A_BETTER,
             paper_id="paper3",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👈  A is better",
-            constructiveness="👉  B is better",
-            clarity="👉  B is better",
-            overall_quality="👉  B is better",
             review_a="Review A content for paper 3",
             review_b="Review B content for paper 3",
-            vote_time=datetime.now(),
         )
         # New assertions for the added fields
         self.assertEqual(vote.paper_id, "paper3")
@@ -432,31 +417,17 @@ class TestEloSystem(unittest.TestCase):
         elo_system.update_ratings(vote)
         self.assertNotEqual(elo_system._ratings["A"], initial_rating_a)
         self.assertNotEqual(elo_system._ratings["B"], initial_rating_b)
-        self.assertIsInstance(elo_system._ratings["A"], float)
-        self.assertIsInstance(elo_system._ratings["B"], float)
+        self._assert_float_ratings(elo_system._ratings)
 
     def test_edge_case_very_high_rating_difference(self):
         self.elo_system._ratings["A"] = 2400.75
         self.elo_system._ratings["B"] = 1600.25
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👉  B is better",
-            constructiveness="👉  B is better",
-            clarity="👉  B is better",
-            overall_quality="👉  B is better",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
+        vote = _vote(B_BETTER)
         self.elo_system.update_ratings(vote)
         self.assertLess(self.elo_system._ratings["A"], 2400.75)
         self.assertGreater(self.elo_system._ratings["B"], 1600.25)
         self.assertGreater(self.elo_system._ratings["A"], self.elo_system._ratings["B"])
-        self.assertIsInstance(self.elo_system._ratings["A"], float)
-        self.assertIsInstance(self.elo_system._ratings["B"], float)
+        self._assert_float_ratings()
 
     def test_invalid_weights(self):
         with self.assertRaises(ValueError):
@@ -467,67 +438,14 @@ class TestEloSystem(unittest.TestCase):
                 overall_quality=0.3,
             )
 
-    def test_update_ratings_extreme_case(self):
-        self.elo_system._ratings["A"] = 100
-        self.elo_system._ratings["B"] = 3000
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
-            reviewer_a="A",
-            reviewer_b="B",
-            technical_quality="👈  A is better",
-            constructiveness="👈  A is better",
-            clarity="👈  A is better",
-            overall_quality="👈  A is better",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
-        )
-        self.elo_system.update_ratings(vote)
-        self.assertGreater(self.elo_system._ratings["A"], 100)
-        self.assertLess(self.elo_system._ratings["B"], 3000)
-        self.assertLess(self.elo_system._ratings["A"], self.elo_system._ratings["B"])
-
     def test_compute_ratings_multiple_votes(self):
         votes = [
-            Vote(
-                session_id="1",
-                paper_id="paper1",
-                reviewer_a="A",
-                reviewer_b="B",
-                technical_quality="👈  A is better",
-                constructiveness="👈  A is better",
-                clarity="👈  A is better",
-                overall_quality="👈  A is better",
-                review_a="Review A content",
-                review_b="Review B content",
-                vote_time=datetime.now(),
+            _vote(session_id="1"),
+            _vote(
+                B_BETTER, session_id="2", paper_id="paper2", reviewer_a="B", reviewer_b="C"
             ),
-            Vote(
-                session_id="2",
-                paper_id="paper2",
-                reviewer_a="B",
-                reviewer_b="C",
-                technical_quality="👉  B is better",
-                constructiveness="👉  B is better",
-                clarity="👉  B is better",
-                overall_quality="👉  B is better",
-                review_a="Review A content",
-                review_b="Review B content",
-                vote_time=datetime.now(),
-            ),
-            Vote(
-                session_id="3",
-                paper_id="paper3",
-                reviewer_a="C",
-                reviewer_b="A",
-                technical_quality="🤝  Tie",
-                constructiveness="🤝  Tie",
-                clarity="🤝  Tie",
-                overall_quality="🤝  Tie",
-                review_a="Review A content",
-                review_b="Review B content",
-                vote_time=datetime.now(),
+            _vote(
+                TIE, session_id="3", paper_id="paper3", reviewer_a="C", reviewer_b="A"
             ),
         ]
         self.elo_system.votes = votes
@@ -544,6 +462,54 @@ class TestEloSystem(unittest.TestCase):
             self.elo_system._ratings["C"], self.elo_system.initial_rating
         )
 
+    def test_compute_ratings_matches_sequential_updates(self):
+        choices = [A_BETTER, B_BETTER, TIE, BOTH_BAD]
+        reviewers = ["A", "B", "C", "D"]
+        votes = [
+            _vote(
+                session_id=str(i),
+                paper_id=f"paper{i}",
+                reviewer_a=reviewers[i % 4],
+                reviewer_b=reviewers[(i * 3 + 1) % 4],
+                technical_quality=choices[i % 4],
+                constructiveness=choices[(i + 1) % 4],
+                clarity=choices[(i * 2) % 4],
+                overall_quality=choices[(i * 5 + 3) % 4],
+            )
+            for i in range(50)
+        ]
+
+        # Replay the votes one at a time with update_ratings
+        sequential = EloSystem(self.votes_db)
+        for vote in votes:
+            sequential.update_ratings(vote)
+
+        self.elo_system.votes = votes
+        self.elo_system.compute_ratings()
+
+        self.assertEqual(
+            set(self.elo_system.get_ratings()), set(sequential.get_ratings())
+        )
+        for reviewer, rating in sequential.get_ratings().items():
+            self.assertAlmostEqual(self.elo_system._ratings[reviewer], rating)
+            self.assertAlmostEqual(
+                self.elo_system.vote_counts[reviewer], sequential.vote_counts[reviewer]
+            )
+
+        # Recomputing from the same votes gives the same result
+        ratings = self.elo_system.get_ratings_copy()
+        self.elo_system.compute_ratings()
+        self.assertEqual(self.elo_system.get_ratings(), ratings)
+
+        # Votes added after a computation are encoded incrementally
+        incremental = EloSystem(self.votes_db)
+        for i, vote in enumerate(votes):
+            incremental.add_vote(vote)
+            if i % 7 == 0:
+                incremental.compute_ratings()
+        incremental.compute_ratings()
+        self.assertEqual(incremental.get_ratings(), ratings)
+
     def test_get_ratings_stats_with_reviewers(self):
         # Simulate some ratings and votes
         self.elo_system._ratings = {"reviewer1": 1550.0, "reviewer2": 1450.0}
@@ -559,13 +525,18 @@ class TestEloSystem(unittest.TestCase):
             self.assertIn("95% CI", stats[reviewer])
             self.assertIn("Votes", stats[reviewer])
 
-            self.assertIsInstance(stats[reviewer]["Arena Score"], float)
             ci: Tuple[float, float] = stats[reviewer]["95% CI"]  # type: ignore
             self.assertIsInstance(ci, tuple)
-            self.assertIsInstance(ci[0], float)
-            self.assertIsInstance(ci[1], float)
             self.assertEqual(len(ci), 2)
-            self.assertIsInstance(stats[reviewer]["Votes"], float)
+            values = (stats[reviewer]["Arena Score"], *ci, stats[reviewer]["Votes"])
+            self.assertTrue(all(isinstance(value, float) for value in values))
+
+            # The batched bounds match the per-reviewer computation
+            expected_ci = self.elo_system._calculate_confidence_interval(
+                self.elo_system._ratings[reviewer], self.elo_system.vote_counts[reviewer]
+            )
+            self.assertAlmostEqual(ci[0], expected_ci[0])
+            self.assertAlmostEqual(ci[1], expected_ci[1])
 
     def test_calculate_confidence_interval(self):
         # Test with no votes
@@ -578,18 +549,11 @@ class TestEloSystem(unittest.TestCase):
         self.assertGreater(ci[1], 1500)
 
     def test_update_ratings_updates_vote_counts(self):
-        vote = Vote(
-            session_id="test",
-            paper_id="paper1",
+        vote = _vote(
             reviewer_a="reviewer1",
             reviewer_b="reviewer2",
-            technical_quality="👈  A is better",
-            constructiveness="👉  B is better",
-            clarity="🤝  Tie",
-            overall_quality="👈  A is better",
-            review_a="Review A content",
-            review_b="Review B content",
-            vote_time=datetime.now(),
+            constructiveness=B_BETTER,
+            clarity=TIE,
         )
 
         self.elo_system.update_ratings(vote)
@@ -1,17 +1,26 @@
+import io
 import json
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import Mock, patch
 
-from ai_reviewer_arena.papers import PaperRegistry
+from pydantic import ValidationError
+
+from ai_reviewer_arena.papers import Paper, PaperRegistry, get_paper_registry, paper_registry
 
 # Assuming the above code has been imported with:
 # from your_module import Paper, PaperRegistry
 
 
+def _fake_open(data: str) -> Mock:
+    # A stand-in for open() that returns the data as a StringIO, much cheaper to iterate than mock_open
+    return Mock(side_effect=lambda *args, **kwargs: io.StringIO(data))
+
+
 class TestPaperRegistry(unittest.TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Sample data to be used in the tests
-        self.sample_papers = [
+        cls.sample_papers = [
             {
                 "paper_id": "1",
                 "title": "Advances in Neural Network Architectures: A Comparative Study",
@@ -73,68 +82,65 @@ class TestPaperRegistry(unittest.TestCase):
                 ],
             },
         ]
-        self.jsonl_data = "\n".join([json.dumps(p) for p in self.sample_papers])
+        cls.jsonl_data = "\n".join([json.dumps(p) for p in cls.sample_papers])
+        # The tests only read the registry, so it is parsed once for the whole class
+        with patch("builtins.open", new=_fake_open(cls.jsonl_data)):
+            cls._registry = PaperRegistry.from_jsonl("fake_path.jsonl")
 
     def test_from_jsonl_empty(self):
-        # Use mock_open directly inside the test
-        with patch("builtins.open", mock_open(read_data="")):
+        # Patch open directly inside the test
+        with patch("builtins.open", new=_fake_open("")):
             registry = PaperRegistry.from_jsonl("fake_path.jsonl")
             self.assertEqual(len(registry.get_paper_list()), 0)
             self.assertEqual(registry.get_paper_count(), 0)
 
     def test_get_paper_list_empty(self):
-        with patch("builtins.open", mock_open(read_data="")):
+        with patch("builtins.open", new=_fake_open("")):
             registry = PaperRegistry.from_jsonl("fake_path.jsonl")
             self.assertEqual(registry.get_paper_list(), [])
 
     def test_from_jsonl(self):
-        with patch("builtins.open", mock_open(read_data=self.jsonl_data)):
-            registry = PaperRegistry.from_jsonl("fake_path.jsonl")
-            self.assertEqual(len(registry.get_paper_list()), 3)
-            self.assertEqual(registry.get_paper_count(), 3)
+        registry = self._registry
+        self.assertEqual(len(registry.get_paper_list()), 3)
+        self.assertEqual(registry.get_paper_count(), 3)
 
     def test_get_next_position(self):
-        with patch("builtins.open", mock_open(read_data=self.jsonl_data)):
-            registry = PaperRegistry.from_jsonl("fake_path.jsonl")
-            self.assertEqual(registry.get_next_position(0), 1)
-            self.assertEqual(registry.get_next_position(1), 2)
-            self.assertEqual(registry.get_next_position(2), 0)  # Loop back to start
+        registry = self._registry
+        self.assertEqual(registry.get_next_position(0), 1)
+        self.assertEqual(registry.get_next_position(1), 2)
+        self.assertEqual(registry.get_next_position(2), 0)  # Loop back to start
 
     def test_get_previous_position(self):
-        with patch("builtins.open", mock_open(read_data=self.jsonl_data)):
-            registry = PaperRegistry.from_jsonl("fake_path.jsonl")
-            self.assertEqual(registry.get_previous_position(0), 2)  # Loop back to end
-            self.assertEqual(registry.get_previous_position(1), 0)
-            self.assertEqual(registry.get_previous_position(2), 1)
+        registry = self._registry
+        self.assertEqual(registry.get_previous_position(0), 2)  # Loop back to end
+        self.assertEqual(registry.get_previous_position(1), 0)
+        self.assertEqual(registry.get_previous_position(2), 1)
 
     def test_get_paper_at_position(self):
-        with patch("builtins.open", mock_open(read_data=self.jsonl_data)):
-            registry = PaperRegistry.from_jsonl("fake_path.jsonl")
-            self.assertEqual(
-                registry.get_paper_at_position(0).title,
-                "Advances in Neural Network Architectures: A Comparative Study",
-            )
-            self.assertEqual(
-                registry.get_paper_at_position(1).title,
-                "Optimization Techniques for Large-Scale Machine Learning",
-            )
-            self.assertEqual(
-                registry.get_paper_at_position(2).title,
-                "The Role of Quantum Computing in Cryptography",
-            )
-            with self.assertRaises(IndexError):
-                registry.get_paper_at_position(3)
+        registry = self._registry
+        self.assertEqual(
+            registry.get_paper_at_position(0).title,
+            "Advances in Neural Network Architectures: A Comparative Study",
+        )
+        self.assertEqual(
+            registry.get_paper_at_position(1).title,
+            "Optimization Techniques for Large-Scale Machine Learning",
+        )
+        self.assertEqual(
+            registry.get_paper_at_position(2).title,
+            "The Role of Quantum Computing in Cryptography",
+        )
+        with self.assertRaises(IndexError):
+            registry.get_paper_at_position(3)
 
     def test_sample_paper_position(self):
-        with patch("builtins.open", mock_open(read_data=self.jsonl_data)):
-            registry = PaperRegistry.from_jsonl("fake_path.jsonl")
-            sample_position = registry.sample_paper_position()
-            self.assertIn(sample_position, [0, 1, 2])
+        registry = self._registry
+        sample_position = registry.sample_paper_position()
+        self.assertIn(sample_position, [0, 1, 2])
 
     def test_get_paper_count(self):
-        with patch("builtins.open", mock_open(read_data=self.jsonl_data)):
-            registry = PaperRegistry.from_jsonl("fake_path.jsonl")
-            self.assertEqual(registry.get_paper_count(), 3)
+        registry = self._registry
+        self.assertEqual(registry.get_paper_count(), 3)
 
     def test_empty_paper_list(self):
         registry = PaperRegistry()
@@ -147,6 +153,36 @@ class TestPaperRegistry(unittest.TestCase):
         with self.assertRaises(ValueError):
             registry.sample_paper_position()
 
+    def test_paper_is_frozen(self):
+        paper = Paper(**self.sample_papers[0])
+        with self.assertRaises(ValidationError):
+            paper.title = "Another title"
+
+    def test_get_all_valid_reviewer_ids(self):
+        paper_data = dict(self.sample_papers[0], barebones=[], liang_etal=["  ", ""])
+        paper = Paper(**paper_data)
+        self.assertEqual(
+            paper.get_all_valid_reviewer_ids(),
+            ["human_reviewer", "multi_agent_without_knowledge"],
+        )
+        self.assertEqual(
+            paper.get_valid_reviewer_id_set(),
+            frozenset(["human_reviewer", "multi_agent_without_knowledge"]),
+        )
+        # Callers get their own list
+        paper.get_all_valid_reviewer_ids().append("barebones")
+        self.assertNotIn("barebones", paper.get_all_valid_reviewer_ids())
+
+    def test_lazy_paper_registry(self):
+        get_paper_registry.cache_clear()
+        try:
+            with patch("builtins.open", new=_fake_open(self.jsonl_data)) as mocked_open:
+                self.assertEqual(paper_registry.get_paper_count(), 3)
+                self.assertIs(get_paper_registry(), get_paper_registry())
+                mocked_open.assert_called_once()
+        finally:
+            get_paper_registry.cache_clear()
+
 
 if __name__ == "__main__":
     unittest.main()
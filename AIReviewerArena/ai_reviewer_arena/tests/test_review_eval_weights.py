@@ -7,14 +7,26 @@ from ai_reviewer_arena.elo_system import \
 
 
 class TestReviewEvalWeights(unittest.TestCase):
-    def test_valid_weights(self):
-        # Test case with valid weights that sum to 1
-        weights = ReviewEvalWeights(
+    @classmethod
+    def setUpClass(cls):
+        # The weights are frozen, so tests can share these instances. Building them here rather than
+        # at import time keeps a construction failure from breaking collection of the whole module.
+        cls.valid_weights = ReviewEvalWeights(
             technical_quality=0.2,
             constructiveness=0.2,
             clarity=0.3,
             overall_quality=0.3,
         )
+        cls.near_one_weights = ReviewEvalWeights(
+            technical_quality=0.333333,
+            constructiveness=0.333333,
+            clarity=0.333334,
+            overall_quality=0.0000001,
+        )
+
+    def test_valid_weights(self):
+        # Test case with valid weights that sum to 1
+        weights = self.valid_weights
         self.assertAlmostEqual(
             sum(
                 [
@@ -51,14 +63,17 @@ class TestReviewEvalWeights(unittest.TestCase):
             )
         self.assertIn("Input should be greater than 0", str(context.exception))
 
+    def test_weights_are_frozen(self):
+        with self.assertRaises(ValidationError):
+            self.valid_weights.clarity = 0.4
+
+    def test_unknown_weight_rejected(self):
+        with self.assertRaises(ValidationError):
+            ReviewEvalWeights(novelty=0.1)  # type: ignore
+
     def test_float_precision(self):
         # Test case to ensure floating-point precision handling
-        weights = ReviewEvalWeights(
-            technical_quality=0.333333,
-            constructiveness=0.333333,
-            clarity=0.333334,
-            overall_quality=0.0000001,
-        )
+        weights = self.near_one_weights
         self.assertAlmostEqual(
             sum(
                 [
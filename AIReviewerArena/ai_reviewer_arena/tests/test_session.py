@@ -124,6 +124,15 @@ class TestSession(unittest.TestCase):
         self.assertIn("session_id", items)
         self.assertEqual(items["session_id"], self.session.session_id)
 
+    def test_views_include_custom_data(self):
+        self.session["custom_key"] = "custom_value"
+        self.assertEqual(len(self.session.keys()), 6)
+        self.assertEqual(len(self.session.items()), 6)
+        self.assertIn("custom_key", self.session.keys())
+        self.assertIn(("custom_key", "custom_value"), self.session.items())
+        self.assertNotIn(("custom_key", "other_value"), self.session.items())
+        self.assertEqual(list(self.session.keys()), [key for key, _ in self.session.items()])
+
     def test_repr_method(self):
         repr_str = repr(self.session)
         self.assertIn("test_session_id", repr_str)
@@ -143,6 +152,32 @@ class TestSession(unittest.TestCase):
         self.assertEqual(json_dict["session_id"], "test_session_id")
         self.assertEqual(json_dict["custom_key"], "custom_value")
 
+    def test_to_json_bytes_method(self):
+        self.session["custom_key"] = "custom_value"
+        json_bytes = self.session.to_json_bytes(exclude_keys={"ip_address"})
+        self.assertIsInstance(json_bytes, bytes)
+        self.assertEqual(json_bytes.decode(), self.session.to_json(exclude_keys={"ip_address"}))
+        json_dict = json.loads(json_bytes)
+        self.assertEqual(json_dict["custom_key"], "custom_value")
+        self.assertNotIn("ip_address", json_dict)
+
+    def test_to_json_bytes_cached_until_modified(self):
+        self.session["items"] = ["a"]
+        json_bytes = self.session.to_json_bytes()
+        self.assertIs(self.session.to_json_bytes(), json_bytes)
+
+        self.session["custom_key"] = "custom_value"
+        self.assertEqual(json.loads(self.session.to_json_bytes())["custom_key"], "custom_value")
+        self.session.end_time = datetime.now()
+        self.assertIsNotNone(json.loads(self.session.to_json_bytes())["end_time"])
+        del self.session["custom_key"]
+        self.assertNotIn("custom_key", json.loads(self.session.to_json_bytes()))
+
+        # Changes made to a stored value in place are picked up once marked
+        self.session["items"].append("b")
+        self.session.mark_modified()
+        self.assertEqual(json.loads(self.session.to_json_bytes())["items"], ["a", "b"])
+
     def test_to_json_with_exclusions(self):
         self.session["custom_key"] = "custom_value"
         json_str = self.session.to_json(exclude_keys={"ip_address", "custom_key"})
@@ -1,4 +1,4 @@
-import os
+import pickle
 import sqlite3
 import unittest
 from datetime import datetime
@@ -8,21 +8,29 @@ from ai_reviewer_arena.sessions import Session, SessionRegistry
 
 class TestSessionRegistry(unittest.TestCase):
     def setUp(self):
-        self.db_path = "test_sessions.db"
-        self.registry = SessionRegistry(self.db_path)
+        # A named in-memory database, shared with the connections the tests open to inspect it.
+        # It is freed once the last connection closes, so there is nothing to remove afterwards.
+        self.db_path = f"file:{self.id()}?mode=memory&cache=shared"
+        self.registry = SessionRegistry(self.db_path, uri=True)
 
     def tearDown(self):
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
+        self.registry.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, uri=True)
 
     def test_create_table(self):
         # Check if the table was created
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT name FROM sqlite_master WHERE type='table' AND name='sessions'"
             )
             self.assertIsNotNone(cursor.fetchone())
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_sessions_end_time'"
+            )
+            self.assertIsNotNone(cursor.fetchone())
 
     def test_insert_session(self):
         session = Session("test_id", "127.0.0.1", "test_agent")
@@ -75,11 +83,169 @@ class TestSessionRegistry(unittest.TestCase):
     def test_load_non_existent_session(self):
         self.assertIsNone(self.registry.load_session("non_existent_id"))
 
+    def test_upsert_session(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session["key1"] = "value1"
+        self.registry.upsert_session(session)
+        self.assertTrue(self.registry.session_exists("test_id"))
+
+        # A second upsert updates the stored session in place
+        session["key1"] = "value2"
+        session.end_time = datetime.now()
+        self.registry.upsert_session(session)
+
+        loaded_session = self.registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(loaded_session["key1"], "value2")
+            self.assertIsNotNone(loaded_session.end_time)
+        with self._connect() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_save(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        self.registry.save(session)
+        session["key1"] = "value1"
+        self.registry.save(session)
+
+        loaded_session = self.registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(loaded_session["key1"], "value1")
+        with self._connect() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_load_session_meta(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session["key1"] = "value1"
+        session.end_time = datetime.now()
+        self.registry.insert_session(session)
+        self.assertIsNone(self.registry.load_session_meta("missing"))
+
+        meta_session = self.registry.load_session_meta("test_id")
+        self.assertIsNotNone(meta_session, "Session should exist")
+        if meta_session:
+            self.assertEqual(meta_session.ip_address, "127.0.0.1")
+            self.assertEqual(meta_session.start_time, session.start_time)
+            self.assertEqual(meta_session.end_time, session.end_time)
+            # The data is loaded on first access, so saving the session keeps it
+            meta_session["key2"] = "value2"
+            self.assertEqual(meta_session["key1"], "value1")
+            self.registry.save(meta_session)
+
+        loaded_session = self.registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(loaded_session["key1"], "value1")
+            self.assertEqual(loaded_session["key2"], "value2")
+
+    def test_enqueue_save(self):
+        sessions = [Session(f"id{i}", "127.0.0.1", "agent") for i in range(3)]
+        for session in sessions:
+            session["key1"] = "value1"
+            self.registry.enqueue_save(session)
+        # The latest queued state of a session is the one written
+        sessions[0]["key1"] = "value2"
+        self.registry.enqueue_save(sessions[0])
+        # Changes made after a save is queued are not part of it
+        sessions[1]["key1"] = "unsaved"
+        self.registry.flush()
+
+        expected = {"id0": "value2", "id1": "value1", "id2": "value1"}
+        for session_id, value in expected.items():
+            loaded_session = self.registry.load_session(session_id)
+            self.assertIsNotNone(loaded_session, "Session should exist")
+            if loaded_session:
+                self.assertEqual(loaded_session["key1"], value)
+
+    def test_enqueue_save_does_not_wait_for_connection_lock(self):
+        session = Session("id0", "127.0.0.1", "agent")
+        session["key1"] = "value1"
+        # Holding the connection lock stands in for a commit in progress
+        with self.registry._lock:
+            self.registry.enqueue_save(session)
+        self.registry.flush()
+        self.assertEqual(self.registry.load_session("id0")["key1"], "value1")
+
+    def test_batch_insert_update_upsert(self):
+        sessions = [Session(f"id{i}", "127.0.0.1", "agent") for i in range(3)]
+        self.registry.insert_sessions(sessions)
+        for session in sessions:
+            self.assertTrue(self.registry.session_exists(session.session_id))
+
+        for session in sessions:
+            session["key1"] = session.session_id
+        # Sessions that are not stored yet are skipped by update_sessions
+        self.registry.update_sessions(sessions + [Session("missing", "127.0.0.1", "agent")])
+        self.assertFalse(self.registry.session_exists("missing"))
+
+        new_session = Session("id3", "127.0.0.1", "agent")
+        new_session["key1"] = "id3"
+        sessions[0]["key1"] = "upserted"
+        self.registry.upsert_sessions([sessions[0], new_session])
+
+        expected = {"id0": "upserted", "id1": "id1", "id2": "id2", "id3": "id3"}
+        for session_id, value in expected.items():
+            loaded_session = self.registry.load_session(session_id)
+            self.assertIsNotNone(loaded_session, "Session should exist")
+            if loaded_session:
+                self.assertEqual(loaded_session["key1"], value)
+
+    def test_batch_insert_is_atomic(self):
+        self.registry.insert_session(Session("id1", "127.0.0.1", "agent"))
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.registry.insert_sessions(
+                [Session("id0", "127.0.0.1", "agent"), Session("id1", "127.0.0.1", "agent")]
+            )
+        self.assertFalse(self.registry.session_exists("id0"))
+
+    def test_register_and_get_live_session(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        self.registry.register(session)
+
+        # The live object is returned, without going through the database
+        self.assertIs(self.registry.get("test_id"), session)
+        self.assertFalse(self.registry.session_exists("test_id"))
+
+        self.registry.discard("test_id")
+        self.assertIsNone(self.registry.get("test_id"))
+
+    def test_live_sessions_are_capped(self):
+        self.registry.max_live_sessions = 2
+        sessions = [Session(f"id{i}", "127.0.0.1", "agent") for i in range(3)]
+        sessions[0]["key1"] = "value1"
+        self.registry.register(sessions[0])
+        self.registry.register(sessions[1])
+        # Using id0 makes id1 the least recently used session
+        self.registry.get("id0")
+        self.registry.register(sessions[2])
+        self.registry.flush()
+
+        self.assertEqual(list(self.registry._live_sessions), ["id0", "id2"])
+        # The evicted session was saved, so it can be restored
+        restored_session = self.registry.get("id1")
+        self.assertIsNotNone(restored_session)
+        self.assertIsNot(restored_session, sessions[1])
+        self.assertEqual(list(self.registry._live_sessions), ["id2", "id1"])
+
+    def test_get_restores_persisted_session(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session["key1"] = "value1"
+        self.registry.insert_session(session)
+
+        restored_session = self.registry.get("test_id")
+        self.assertIsNotNone(restored_session)
+        if restored_session:
+            self.assertEqual(restored_session["key1"], "value1")
+            # Later lookups return the same live object
+            self.assertIs(self.registry.get("test_id"), restored_session)
+
     def test_multiple_sessions(self):
         session1 = Session("id1", "127.0.0.1", "agent1")
         session2 = Session("id2", "127.0.0.2", "agent2")
-        self.registry.insert_session(session1)
-        self.registry.insert_session(session2)
+        self.registry.insert_sessions([session1, session2])
 
         self.assertTrue(self.registry.session_exists("id1"))
         self.assertTrue(self.registry.session_exists("id2"))
@@ -115,6 +281,58 @@ class TestSessionRegistry(unittest.TestCase):
         else:
             self.fail("Session was not loaded successfully")
 
+    def test_session_data_stored_as_json(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session["voted_pair_of_reviews"] = {("a", 0, "b", 1), ("b", 1, "c", 0)}
+        session["pair"] = ("a", "b")
+        self.registry.insert_session(session)
+
+        with self._connect() as conn:
+            data = conn.execute("SELECT data FROM sessions").fetchone()[0]
+        self.assertTrue(data.startswith(b"{"))
+
+        loaded_session = self.registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(
+                loaded_session["voted_pair_of_reviews"],
+                {("a", 0, "b", 1), ("b", 1, "c", 0)},
+            )
+            self.assertEqual(loaded_session["pair"], ("a", "b"))
+
+    def test_load_legacy_pickled_session(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session_data = session.to_sqlite()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    "test_id",
+                    session_data["start_time"],
+                    None,
+                    "127.0.0.1",
+                    "test_agent",
+                    pickle.dumps({"key1": "value1", "set": {1, 2}}),
+                ),
+            )
+
+        loaded_session = self.registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(loaded_session["key1"], "value1")
+            self.assertEqual(loaded_session["set"], {1, 2})
+
+        # The row is rewritten as JSON once loaded
+        with self._connect() as conn:
+            data = conn.execute("SELECT data FROM sessions").fetchone()[0]
+        self.assertTrue(data.startswith(b"{"))
+
+    def test_insert_session_rejects_non_json_data(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session["object"] = object()
+        with self.assertRaises(TypeError):
+            self.registry.insert_session(session)
+
     def test_session_with_datetime(self):
         session = Session("test_id", "127.0.0.1", "test_agent")
         now = datetime.now()
@@ -128,6 +346,87 @@ class TestSessionRegistry(unittest.TestCase):
         else:
             self.fail("Session was not loaded successfully")
 
+    def test_timestamps_round_trip(self):
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session.end_time = datetime.now()
+        self.registry.insert_session(session)
+
+        with self._connect() as conn:
+            start_time, end_time = conn.execute(
+                "SELECT start_time, end_time FROM sessions"
+            ).fetchone()
+        self.assertIsInstance(start_time, int)
+        self.assertIsInstance(end_time, int)
+
+        loaded_session = self.registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(loaded_session.start_time, session.start_time)
+            self.assertEqual(loaded_session.end_time, session.end_time)
+
+    def test_migrate_text_timestamps(self):
+        self.registry.close()
+        session = Session("test_id", "127.0.0.1", "test_agent")
+        session["key1"] = "value1"
+        session_data = session.to_sqlite()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE sessions (session_id TEXT PRIMARY KEY, start_time TEXT, "
+                "end_time TEXT, ip_address TEXT, user_agent TEXT, data BLOB)"
+            )
+            conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    "test_id",
+                    session.start_time.isoformat(),
+                    None,
+                    "127.0.0.1",
+                    "test_agent",
+                    session_data["data"],
+                ),
+            )
+
+        self.registry = registry = SessionRegistry(self.db_path, uri=True)
+        with self._connect() as conn:
+            column_types = {
+                row[1]: row[2] for row in conn.execute("PRAGMA table_info(sessions)")
+            }
+        self.assertEqual(column_types["start_time"], "INTEGER")
+
+        loaded_session = registry.load_session("test_id")
+        self.assertIsNotNone(loaded_session, "Session should exist")
+        if loaded_session:
+            self.assertEqual(loaded_session.start_time, session.start_time)
+            self.assertIsNone(loaded_session.end_time)
+            self.assertEqual(loaded_session["key1"], "value1")
+
+    def test_failed_migration_keeps_old_table(self):
+        self.registry.close()
+        start_time = datetime.now().isoformat()
+        with self._connect() as conn:
+            # Without a primary key, duplicate ids make the rebuilt table reject the copy
+            conn.execute(
+                "CREATE TABLE sessions (session_id TEXT, start_time TEXT, "
+                "end_time TEXT, ip_address TEXT, user_agent TEXT, data BLOB)"
+            )
+            conn.executemany(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                [("test_id", start_time, None, "127.0.0.1", "test_agent", b"{}")] * 2,
+            )
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            SessionRegistry(self.db_path, uri=True)
+
+        with self._connect() as conn:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            column_types = {
+                row[1]: row[2] for row in conn.execute("PRAGMA table_info(sessions)")
+            }
+            num_rows = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        self.assertNotIn("sessions_legacy", tables)
+        self.assertEqual(column_types["start_time"], "TEXT")
+        self.assertEqual(num_rows, 2)
+
     def test_large_data(self):
         session = Session("test_id", "127.0.0.1", "test_agent")
         large_data = "x" * 1000000  # 1MB of data
@@ -141,6 +440,11 @@ class TestSessionRegistry(unittest.TestCase):
         else:
             self.fail("Session was not loaded successfully")
 
+        # Data above the threshold is stored compressed
+        with self._connect() as conn:
+            data = conn.execute("SELECT data FROM sessions").fetchone()[0]
+        self.assertLess(len(data), len(large_data) // 100)
+
 
 if __name__ == "__main__":
     unittest.main()
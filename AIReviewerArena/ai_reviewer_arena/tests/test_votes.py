@@ -1,42 +1,62 @@
+import asyncio
 import os
+import tempfile
+import threading
 import unittest
+from unittest import mock
 
-from ai_reviewer_arena.votes import Vote, VotesJSONL, VotesSqlite
+from ai_reviewer_arena.votes import (SqliteConnectionPool, Vote, VotesInterface,
+                                     VotesJSONL, VotesJSONLWriter, VotesSqlite)
 
 
-class TestVotesSqlite(unittest.TestCase):
-    def setUp(self):
-        self.test_db_name = "test_votes_sqlite.db"
-        self.votes_storage = VotesSqlite(self.test_db_name)
+def _temp_path(test: unittest.TestCase, file_name: str) -> str:
+    """
+    Returns a path in a temporary directory private to the test, removed with its contents after the test.
+    """
+    temp_dir = tempfile.TemporaryDirectory()
+    test.addCleanup(temp_dir.cleanup)
+    return os.path.join(temp_dir.name, file_name)
 
-    def tearDown(self):
-        if os.path.exists(self.test_db_name):
-            os.remove(self.test_db_name)
 
-    def test_init_storage(self):
-        # Check if the table is created
-        with self.votes_storage.get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='comparisons'"
-            )
-            result = cursor.fetchone()
-        self.assertIsNotNone(result)
-        self.assertEqual(result[0], "comparisons")
+# Votes are frozen, so the same instances are shared by all tests
+CANONICAL_VOTE = Vote(
+    session_id="session123",
+    paper_id="paper123",
+    reviewer_a="reviewer1",
+    reviewer_b="reviewer2",
+    technical_quality="A",
+    constructiveness="B",
+    clarity="A",
+    overall_quality="B",
+    review_a="This is review A",
+    review_b="This is review B",
+)
+BULK_VOTES = tuple(
+    Vote(
+        session_id=f"session{i}",
+        paper_id=f"paper{i}",
+        reviewer_a=f"reviewer{i}a",
+        reviewer_b=f"reviewer{i}b",
+        technical_quality="A",
+        constructiveness="B",
+        clarity="A",
+        overall_quality="B",
+        review_a=f"This is review {i}A",
+        review_b=f"This is review {i}B",
+    )
+    for i in range(5)
+)
+
+
+class _VotesStorageTests:
+    """
+    Tests shared by every VotesInterface backend, subclasses create `self.votes_storage` in setUp.
+    """
+
+    votes_storage: VotesInterface
 
     def test_store_and_retrieve_comparison(self):
-        test_vote = Vote(
-            session_id="session123",
-            paper_id="paper123",
-            reviewer_a="reviewer1",
-            reviewer_b="reviewer2",
-            technical_quality="A",
-            constructiveness="B",
-            clarity="A",
-            overall_quality="B",
-            review_a="This is review A",
-            review_b="This is review B",
-        )
+        test_vote = CANONICAL_VOTE
         self.votes_storage.store_vote(test_vote)
 
         # Retrieve and verify the stored data
@@ -47,21 +67,7 @@ class TestVotesSqlite(unittest.TestCase):
 
     def test_get_all_votes(self):
         # Store multiple comparisons
-        test_votes = [
-            Vote(
-                session_id=f"session{i}",
-                paper_id=f"paper{i}",
-                reviewer_a=f"reviewer{i}a",
-                reviewer_b=f"reviewer{i}b",
-                technical_quality="A",
-                constructiveness="B",
-                clarity="A",
-                overall_quality="B",
-                review_a=f"This is review {i}A",
-                review_b=f"This is review {i}B",
-            )
-            for i in range(3)
-        ]
+        test_votes = list(BULK_VOTES[:3])
         for vote in test_votes:
             self.votes_storage.store_vote(vote)
 
@@ -71,66 +77,190 @@ class TestVotesSqlite(unittest.TestCase):
         for stored_vote, test_vote in zip(comparisons, test_votes):
             self.assertEqual(stored_vote, test_vote)
 
+    def test_store_votes(self):
+        test_votes = list(BULK_VOTES[:3])
+        self.votes_storage.store_votes(test_votes)
+        self.assertEqual(self.votes_storage.get_all_votes(), test_votes)
+
+    def test_count(self):
+        self.assertEqual(self.votes_storage.count(), 0)
+        for vote in BULK_VOTES[:3]:
+            self.votes_storage.store_vote(vote)
+        self.assertEqual(self.votes_storage.count(), 3)
 
-class TestVotesJSONL(unittest.TestCase):
+
+class TestVotesSqlite(_VotesStorageTests, unittest.TestCase):
     def setUp(self):
-        self.test_file_name = "test_votes_jsonl.jsonl"
-        self.votes_storage = VotesJSONL(self.test_file_name)
+        self.test_db_name = _temp_path(self, "test_votes_sqlite.db")
+        self.votes_storage = VotesSqlite(self.test_db_name)
+        self.addCleanup(self.votes_storage.close)
+
+    def test_init_storage(self):
+        # Check if the table is created
+        with self.votes_storage.get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='comparisons'"
+            )
+            result = cursor.fetchone()
+        self.assertIsNotNone(result)
+        self.assertEqual(result[0], "comparisons")
+
+    def test_init_storage_creates_indexes(self):
+        with self.votes_storage.get_db_connection() as conn:
+            indexes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='comparisons'"
+                )
+            }
+        self.assertTrue({"idx_comparisons_session_id", "idx_comparisons_paper_id"} <= indexes)
+
+    def test_connection_reused(self):
+        with self.votes_storage.get_db_connection() as conn1:
+            journal_mode = conn1.execute("PRAGMA journal_mode").fetchone()[0]
+        with self.votes_storage.get_db_connection() as conn2:
+            pass
+        self.assertIs(conn1, conn2)
+        self.assertEqual(journal_mode, "wal")
+
+
+class TestVotesSqlitePool(unittest.TestCase):
+    def setUp(self):
+        self.test_db_name = _temp_path(self, "test_votes_sqlite_pool.db")
+        self.pool = SqliteConnectionPool(self.test_db_name, max_size=2)
+        self.votes_storage = VotesSqlite(pool=self.pool)
 
     def tearDown(self):
-        if os.path.exists(self.test_file_name):
-            os.remove(self.test_file_name)
+        self.pool.close()
+
+    def test_wal_journal_mode(self):
+        with self.pool.connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+
+    def test_connection_reused(self):
+        with self.pool.connection() as conn1:
+            pass
+        with self.pool.connection() as conn2:
+            pass
+        self.assertIs(conn1, conn2)
+
+    def test_store_and_retrieve_comparison(self):
+        test_vote = CANONICAL_VOTE
+        self.votes_storage.store_vote(test_vote)
+
+        # A second storage sharing the pool sees the same data
+        comparisons = VotesSqlite(pool=self.pool).get_all_votes()
+        self.assertEqual(comparisons, [test_vote])
+
+
+class TestVotesJSONL(_VotesStorageTests, unittest.TestCase):
+    def setUp(self):
+        self.test_file_name = _temp_path(self, "test_votes_jsonl.jsonl")
+        self.votes_storage = VotesJSONL(self.test_file_name)
+        self.addCleanup(self.votes_storage.close)
 
     def test_init_storage(self):
         # Check if the file is created
         self.assertTrue(os.path.exists(self.test_file_name))
 
-    def test_store_and_retrieve_comparison(self):
-        test_vote = Vote(
-            session_id="session123",
-            paper_id="paper123",
-            reviewer_a="reviewer1",
-            reviewer_b="reviewer2",
-            technical_quality="A",
-            constructiveness="B",
-            clarity="A",
-            overall_quality="B",
-            review_a="This is review A",
-            review_b="This is review B",
-        )
-        self.votes_storage.store_vote(test_vote)
+    def test_store_vote_buffered_until_flush(self):
+        self.votes_storage.store_vote(CANONICAL_VOTE)
+        self.assertEqual(os.path.getsize(self.test_file_name), 0)
+        self.votes_storage.flush()
+        self.assertGreater(os.path.getsize(self.test_file_name), 0)
 
-        # Retrieve and verify the stored data
-        comparisons = self.votes_storage.get_all_votes()
-        self.assertEqual(len(comparisons), 1)
-        stored_vote = comparisons[0]
-        self.assertEqual(stored_vote, test_vote)
 
-    def test_get_all_votes(self):
-        # Store multiple comparisons
-        test_votes = [
-            Vote(
-                session_id=f"session{i}",
-                paper_id=f"paper{i}",
-                reviewer_a=f"reviewer{i}a",
-                reviewer_b=f"reviewer{i}b",
-                technical_quality="A",
-                constructiveness="B",
-                clarity="A",
-                overall_quality="B",
-                review_a=f"This is review {i}A",
-                review_b=f"This is review {i}B",
-            )
-            for i in range(3)
-        ]
-        for vote in test_votes:
-            self.votes_storage.store_vote(vote)
+class TestVotesJSONLWriter(unittest.TestCase):
+    def setUp(self):
+        self.test_file_name = _temp_path(self, "test_votes_jsonl_writer.jsonl")
+        self.votes_storage = VotesJSONL(self.test_file_name)
+        self.writer = VotesJSONLWriter(self.votes_storage, max_batch_size=2)
 
-        # Retrieve and verify all stored data
-        comparisons = self.votes_storage.get_all_votes()
-        self.assertEqual(len(comparisons), 3)
-        for stored_vote, test_vote in zip(comparisons, test_votes):
-            self.assertEqual(stored_vote, test_vote)
+    def test_submit_and_flush(self):
+        test_votes = list(BULK_VOTES[:5])
+
+        async def submit_all():
+            for vote in test_votes:
+                self.writer.submit(vote)
+            self.assertEqual(self.writer.pending_count, 5)
+            await self.writer.flush()
+
+        asyncio.run(submit_all())
+        self.assertEqual(self.writer.pending_count, 0)
+        self.assertEqual(self.votes_storage.get_all_votes(), test_votes)
+
+    def test_failed_batch_is_retried(self):
+        test_votes = list(BULK_VOTES[:2])
+        writer = VotesJSONLWriter(self.votes_storage, retry_delay=0)
+        store_votes = self.votes_storage.store_votes
+        calls = []
+
+        def fail_once(votes):
+            calls.append(list(votes))
+            if len(calls) == 1:
+                raise OSError("disk full")
+            store_votes(votes)
+
+        async def submit_all():
+            for vote in test_votes:
+                writer.submit(vote)
+            await writer.flush()
+
+        with mock.patch.object(self.votes_storage, "store_votes", side_effect=fail_once):
+            with self.assertLogs("VotesStorage", level="ERROR"):
+                asyncio.run(submit_all())
+        self.assertEqual(calls, [test_votes, test_votes])
+        self.assertEqual(writer.pending_count, 0)
+        self.assertEqual(self.votes_storage.get_all_votes(), test_votes)
+
+    def test_close_writes_queued_votes(self):
+        test_votes = list(BULK_VOTES[:3])
+
+        async def submit_all():
+            for vote in test_votes:
+                self.writer.submit(vote)
+
+        # The loop is torn down with votes still queued, as at shutdown
+        asyncio.run(submit_all())
+        self.writer.close()
+        self.assertEqual(self.writer.pending_count, 0)
+        self.assertEqual(self.votes_storage.get_all_votes(), test_votes)
+
+    def test_close_waits_for_write_in_progress(self):
+        test_votes = list(BULK_VOTES[:2])
+        store_votes = self.votes_storage.store_votes
+        write_started = threading.Event()
+        finish_write = threading.Event()
+        calls = []
+
+        def blocking_store(votes):
+            calls.append(list(votes))
+            write_started.set()
+            finish_write.wait(5)
+            store_votes(votes)
+
+        async def submit_all():
+            for vote in test_votes:
+                self.writer.submit(vote)
+            await self.writer.flush()
+
+        with mock.patch.object(self.votes_storage, "store_votes", side_effect=blocking_store):
+            loop_thread = threading.Thread(target=asyncio.run, args=(submit_all(),))
+            loop_thread.start()
+            self.assertTrue(write_started.wait(5))
+            close_thread = threading.Thread(target=self.writer.close)
+            close_thread.start()
+            close_thread.join(0.1)
+            self.assertTrue(close_thread.is_alive(), "close() should wait for the write in progress")
+            finish_write.set()
+            close_thread.join(5)
+            loop_thread.join(5)
+
+        self.assertEqual(calls, [test_votes])
+        self.assertEqual(self.writer.pending_count, 0)
+        self.assertEqual(self.votes_storage.get_all_votes(), test_votes)
 
 
 if __name__ == "__main__":
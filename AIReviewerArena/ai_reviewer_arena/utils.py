@@ -1,18 +1,26 @@
-import base64
 import json
-import uuid
+from secrets import token_urlsafe
 
 import gradio as gr
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, JSONL files are then parsed with the json module
+    orjson = None
+
+# Both parsers accept bytes, so JSONL lines can be decoded straight from a binary file
+_loads_json = orjson.loads if orjson is not None else json.loads
 
-def generate_short_uuid():
-    # Generate a UUID
-    uuid_val = uuid.uuid4()
 
-    # Encode the UUID using base64 and remove padding
-    short_uuid = base64.urlsafe_b64encode(uuid_val.bytes).rstrip(b"=").decode("ascii")
+def _dumps_json_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
 
-    return short_uuid
+
+def generate_short_uuid():
+    # 16 random bytes as 22 unpadded urlsafe base64 characters, the same shape as an encoded UUID4
+    return token_urlsafe(16)
 
 
 def get_session_id(request: gr.Request | None):
@@ -25,6 +33,22 @@ def get_session_id(request: gr.Request | None):
     return request.session_hash
 
 
+def iter_papers_from_jsonl(file_path):
+    """
+    Reads a JSONL file and yields its records one at a time, so only one paper is decoded at once.
+
+    Args:
+    - file_path: The path to the JSONL file to read.
+
+    Yields:
+    - A dictionary representing a paper.
+    """
+    with open(file_path, "rb", buffering=1 << 20) as file:
+        for line in file:
+            if line.strip():
+                yield _loads_json(line)
+
+
 def import_papers_from_jsonl(file_path):
     """
     Reads a JSONL file and converts it back to a list of dictionaries.
@@ -35,12 +59,7 @@ def import_papers_from_jsonl(file_path):
     Returns:
     - A list of dictionaries, each representing a paper.
     """
-    papers = []
-    with open(file_path, "r") as file:
-        for line in file:
-            paper = json.loads(line.strip())
-            papers.append(paper)
-    return papers
+    return list(iter_papers_from_jsonl(file_path))
 
 
 def export_papers_to_jsonl(papers, file_path):
@@ -51,7 +70,6 @@ def export_papers_to_jsonl(papers, file_path):
     - papers: List of dictionaries containing paper information and reviews.
     - file_path: The path where the JSONL file will be saved.
     """
-    with open(file_path, "w") as file:
-        for paper in papers:
-            json_line = json.dumps(paper)
-            file.write(json_line + "\n")
+    # Lines are batched through a large write buffer instead of one write per payload and newline
+    with open(file_path, "wb", buffering=1 << 20) as file:
+        file.writelines(_dumps_json_bytes(paper) + b"\n" for paper in papers)
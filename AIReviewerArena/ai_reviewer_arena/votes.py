@@ -1,18 +1,24 @@
+import asyncio
+import json
 import logging
 import os
+import queue
 import sqlite3
+import threading
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, List
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
-from ai_reviewer_arena.configs.logging_cfg import setup_logging
+try:
+    import orjson
+except ImportError:  # orjson is optional, vote files are then parsed with the json module
+    orjson = None
 
-# Setup logging
-setup_logging()
 logger = logging.getLogger("VotesStorage")
 
 PROJECT_HOME = Path(__file__).parent.parent
@@ -20,8 +26,37 @@ VOTES_DB_FOLDER = PROJECT_HOME / "arena_data/app_databases"
 DEFAULT_VOTES_SQLITE_NAME = "arena_votes.db"
 DEFAULT_VOTES_JSONL_NAME = "arena_votes.jsonl"
 
+# Vote fields stored in the comparisons table, in column order
+VOTE_COLUMNS = (
+    "session_id",
+    "paper_id",
+    "reviewer_a",
+    "reviewer_b",
+    "technical_quality",
+    "constructiveness",
+    "clarity",
+    "overall_quality",
+    "review_a",
+    "review_b",
+    "vote_time",
+)
+INSERT_VOTE_SQL = (
+    f"INSERT INTO comparisons ({', '.join(VOTE_COLUMNS)}) VALUES ({', '.join('?' * len(VOTE_COLUMNS))})"
+)
+SELECT_VOTES_SQL = f"SELECT {', '.join(VOTE_COLUMNS)} FROM comparisons ORDER BY rowid"
+COUNT_VOTES_SQL = "SELECT COUNT(*) FROM comparisons"
+# Packs a Vote into a comparisons row
+_vote_to_row = attrgetter(*VOTE_COLUMNS)
+# Rows fetched per round trip when reading all votes
+_FETCH_BATCH_SIZE = 4096
+# Buffer for vote files, large enough to move many lines per read or write call
+_FILE_BUFFER_SIZE = 1 << 20
+
 
 class Vote(BaseModel):
+    # Votes are records of what a user submitted and are never modified afterwards
+    model_config = ConfigDict(frozen=True)
+
     session_id: str
     paper_id: str  # New field added
     reviewer_a: str
@@ -39,6 +74,50 @@ class Vote(BaseModel):
         return value.isoformat()
 
 
+def _vote_from_record(record: dict) -> Vote:
+    """
+    Builds a Vote from a record this module stored itself, skipping validation.
+    Only vote_time needs converting, since it is stored as an ISO 8601 string.
+    """
+    vote_time = record["vote_time"]
+    if isinstance(vote_time, str):
+        record["vote_time"] = datetime.fromisoformat(vote_time)
+    return Vote.model_construct(**record)
+
+
+def _vote_from_row(row: tuple) -> Vote:
+    # Rows come from SELECT_VOTES_SQL, so their values are in VOTE_COLUMNS order
+    return _vote_from_record(dict(zip(VOTE_COLUMNS, row)))
+
+
+# Both parsers accept bytes, so vote lines can be decoded straight from a binary file
+_loads_json = orjson.loads if orjson is not None else json.loads
+
+
+def _vote_to_jsonl(vote: Vote) -> bytes:
+    # Pydantic's serializer already produces compact JSON, so no intermediate dict is built here
+    return vote.model_dump_json().encode() + b"\n"
+
+
+# Upper bound on the number of buffers passed to a single writev call
+_WRITEV_MAX_BUFFERS = 1024
+
+
+def _append_buffers(fd: int, buffers: List[bytes]):
+    """
+    Writes all `buffers` to `fd`, using one writev syscall per batch where the platform supports it.
+    """
+    written = 0
+    if hasattr(os, "writev") and len(buffers) <= _WRITEV_MAX_BUFFERS:
+        written = os.writev(fd, buffers)
+        if written == sum(len(buffer) for buffer in buffers):
+            return
+    remaining = b"".join(buffers)[written:]
+    # Finish any partial write
+    while remaining:
+        remaining = remaining[os.write(fd, remaining) :]
+
+
 class VotesInterface(ABC):
     @abstractmethod
     def _init_storage(self):
@@ -52,22 +131,118 @@ class VotesInterface(ABC):
     def get_all_votes(self) -> List[Vote]:
         pass
 
+    @abstractmethod
+    def count(self) -> int:
+        pass
 
-class VotesSqlite(VotesInterface):
-    def __init__(self, database_path: str | None = None):
+
+def _connect_votes_db(database_path: str) -> sqlite3.Connection:
+    """
+    Opens a connection to the votes database that can be handed between threads, with WAL journaling.
+    """
+    conn = sqlite3.connect(
+        database_path,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+        # All statements are module-level constants, so each is prepared once per connection
+        cached_statements=512,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only syncs at checkpoints and is still safe against corruption
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")  # About 20 MB of page cache
+    return conn
+
+
+class SqliteConnectionPool:
+    """
+    A queue-backed pool of SQLite connections that can be shared across sessions.
+    Connections are opened lazily, with WAL journaling enabled once at creation.
+    """
+
+    def __init__(self, database_path: str | None = None, max_size: int = 8):
         if not database_path:
             database_path = str((VOTES_DB_FOLDER / DEFAULT_VOTES_SQLITE_NAME).resolve())
         self.database_path = database_path
-        logger.info(f"Initializing VotesSqlite with database: {database_path}")
-        self._init_storage()
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=max_size)
+        logger.info(
+            f"Initializing SqliteConnectionPool with database: {database_path}, max_size: {max_size}"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = _connect_votes_db(self.database_path)
+        logger.debug(f"Opened new pooled SQLite connection to {self.database_path}")
+        return conn
 
     @contextmanager
-    def get_db_connection(self):
-        conn = sqlite3.connect(self.database_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    def connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
         try:
             yield conn
         finally:
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        logger.info(f"Closed all pooled SQLite connections to {self.database_path}")
+
+
+class VotesSqlite(VotesInterface):
+    def __init__(
+        self,
+        database_path: str | None = None,
+        pool: SqliteConnectionPool | None = None,
+    ):
+        if pool is not None:
+            database_path = pool.database_path
+        elif not database_path:
+            database_path = str((VOTES_DB_FOLDER / DEFAULT_VOTES_SQLITE_NAME).resolve())
+        self.database_path = database_path
+        self.pool = pool
+        # Without a pool, one long-lived connection is shared by all threads under the lock
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        if pool is None:
+            self._conn = _connect_votes_db(database_path)
+        logger.info(f"Initializing VotesSqlite with database: {database_path}")
+        self._init_storage()
+
+    @contextmanager
+    def get_db_connection(self):
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+            return
+
+        with self._lock:
+            try:
+                yield self._conn
+            finally:
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+
+    def close(self):
+        """
+        Closes the connection of a VotesSqlite without a pool. Pooled connections are closed with the pool.
+        """
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+            logger.info(f"Closed SQLite connection to {self.database_path}")
 
     def _init_storage(self):
         logger.debug("Initializing SQLite storage")
@@ -91,60 +266,62 @@ class VotesSqlite(VotesInterface):
                 )
             """
             )
+            # Votes are looked up by session and by paper
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_comparisons_session_id ON comparisons(session_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_comparisons_paper_id ON comparisons(paper_id)")
             conn.commit()
         logger.info("SQLite storage initialized successfully")
 
-    def store_vote(self, vote: Vote):
-        logger.debug(f"Storing vote in SQLite: {vote.session_id}")
+    def _insert_rows(self, rows: List[tuple]):
+        # Python's sqlite3 opens a transaction before the first INSERT, so the whole batch commits once
         with self.get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO comparisons (session_id, paper_id, reviewer_a, reviewer_b,
-                                         technical_quality, constructiveness, clarity, overall_quality, review_a, review_b, vote_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    vote.session_id,
-                    vote.paper_id,  # New field added
-                    vote.reviewer_a,
-                    vote.reviewer_b,
-                    vote.technical_quality,
-                    vote.constructiveness,
-                    vote.clarity,
-                    vote.overall_quality,
-                    vote.review_a,  # New field added
-                    vote.review_b,  # New field added
-                    vote.vote_time,
-                ),
-            )
+            conn.executemany(INSERT_VOTE_SQL, rows)
             conn.commit()
+
+    def store_vote(self, vote: Vote):
+        logger.debug(f"Storing vote in SQLite: {vote.session_id}")
+        self._insert_rows([_vote_to_row(vote)])
         logger.info(f"Vote stored in SQLite successfully: {vote.session_id}")
 
+    def store_votes(self, votes: List[Vote]):
+        """
+        Inserts a batch of votes with a single executemany and a single commit.
+        """
+        if not votes:
+            return
+        logger.debug(f"Storing {len(votes)} votes in SQLite")
+        self._insert_rows([_vote_to_row(vote) for vote in votes])
+        logger.info(f"{len(votes)} votes stored successfully in SQLite")
+
     def get_all_votes(self) -> List[Vote]:
         logger.debug("Retrieving all votes from SQLite")
         with self.get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT session_id, paper_id, reviewer_a, reviewer_b, technical_quality, constructiveness, clarity, overall_quality, review_a, review_b, vote_time
-                FROM comparisons
-                ORDER BY id
-            """
-            )
-            votes = [
-                Vote(**dict(zip([column[0] for column in cursor.description], row)))
-                for row in cursor.fetchall()
-            ]
+            cursor = conn.execute(SELECT_VOTES_SQL)
+            cursor.arraysize = _FETCH_BATCH_SIZE
+            votes = []
+            # Rows were written from validated Votes, so they are rebuilt without validation
+            while rows := cursor.fetchmany():
+                votes.extend(map(_vote_from_row, rows))
         logger.info(f"Retrieved {len(votes)} votes from SQLite")
         return votes
 
+    def count(self) -> int:
+        with self.get_db_connection() as conn:
+            num_votes = conn.execute(COUNT_VOTES_SQL).fetchone()[0]
+        logger.debug(f"Counted {num_votes} votes in SQLite")
+        return num_votes
+
 
 class VotesJSONL(VotesInterface):
-    def __init__(self, file_path: str | None = None):
+    def __init__(self, file_path: str | None = None, flush_every: int = 32):
         if not file_path:
             file_path = str((VOTES_DB_FOLDER / DEFAULT_VOTES_JSONL_NAME).resolve())
         self.file_path = file_path
+        # store_vote appends through one buffered handle, flushed every flush_every votes and before any read
+        self.flush_every = flush_every
+        self._file: BinaryIO | None = None
+        self._unflushed = 0
+        self._lock = threading.Lock()
         logger.info(f"Initializing VotesJSONL with file: {file_path}")
         self._init_storage()
 
@@ -156,17 +333,172 @@ class VotesJSONL(VotesInterface):
         else:
             logger.info(f"Using existing JSONL file: {self.file_path}")
 
+    def _flush_locked(self):
+        if self._file is not None and self._unflushed:
+            self._file.flush()
+            self._unflushed = 0
+
+    def flush(self):
+        """
+        Writes out any votes still held in the append buffer.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._unflushed = 0
+        logger.info(f"Closed JSONL file: {self.file_path}")
+
     def store_vote(self, vote: Vote):
         logger.debug(f"Storing vote in JSONL: {vote.session_id}")
-        with open(self.file_path, "a") as f:
-            f.write(vote.model_dump_json() + "\n")
+        line = _vote_to_jsonl(vote)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.file_path, "ab", buffering=_FILE_BUFFER_SIZE)
+            self._file.write(line)
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._flush_locked()
         logger.info(f"Vote stored successfully in JSONL: {vote.session_id}")
 
+    def store_votes(self, votes: List[Vote]):
+        """
+        Appends a batch of votes with a single gathered write and a single fsync.
+        """
+        if not votes:
+            return
+        logger.debug(f"Storing {len(votes)} votes in JSONL")
+        buffers = [_vote_to_jsonl(vote) for vote in votes]
+        # Votes buffered by store_vote go out first so the file keeps submission order
+        self.flush()
+        fd = os.open(self.file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            _append_buffers(fd, buffers)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        logger.info(f"{len(votes)} votes stored successfully in JSONL")
+
     def get_all_votes(self) -> List[Vote]:
         logger.debug(f"Retrieving all votes from JSONL: {self.file_path}")
+        self.flush()
         votes = []
-        with open(self.file_path, "r") as f:
+        with open(self.file_path, "rb", buffering=_FILE_BUFFER_SIZE) as f:
             for line in f:
-                votes.append(Vote.model_validate_json(line.strip()))
+                if line.strip():
+                    votes.append(_vote_from_record(_loads_json(line)))
         logger.info(f"Retrieved {len(votes)} votes from JSONL")
         return votes
+
+    def count(self) -> int:
+        self.flush()
+        with open(self.file_path, "rb", buffering=_FILE_BUFFER_SIZE) as f:
+            num_votes = sum(1 for line in f if line.strip())
+        logger.debug(f"Counted {num_votes} votes in JSONL")
+        return num_votes
+
+
+class VotesJSONLWriter:
+    """
+    Appends votes to a VotesJSONL storage from a single background task, in batches,
+    so the JSONL write stays off the request path.
+    The task is started lazily by the first `submit` and runs on the caller's event loop.
+    A batch that fails to write is kept and retried with backoff, and `close` writes whatever is left at shutdown.
+    """
+
+    def __init__(
+        self,
+        votes_jsonl: VotesJSONL,
+        max_batch_size: int = 64,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+    ):
+        self.votes_jsonl = votes_jsonl
+        self.max_batch_size = max_batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        # Batch taken off the queue and not written yet, e.g. waiting to be retried
+        self._batch: List[Vote] | None = None
+        # Held while a batch is written, so close() waits for a write in progress instead of repeating it
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, vote: Vote):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait(vote)
+
+    @property
+    def pending_count(self) -> int:
+        """
+        Number of votes submitted but not written yet.
+        """
+        queued_count = self._queue.qsize() if self._queue is not None else 0
+        batch = self._batch
+        return queued_count + (len(batch) if batch is not None else 0)
+
+    async def flush(self):
+        """
+        Waits until every submitted vote has been written.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    def close(self):
+        """
+        Writes the votes that are still queued or waiting for a retry, synchronously.
+        Meant to run at shutdown, once the event loop no longer runs the writer task.
+        A batch being written by the worker thread is waited for, not written again.
+        """
+        self._closed = True
+        with self._write_lock:
+            votes = list(self._batch or [])
+            self._batch = None
+            if self._queue is not None:
+                while not self._queue.empty():
+                    votes.append(self._queue.get_nowait())
+            if not votes:
+                return
+            self.votes_jsonl.store_votes(votes)
+        for _ in votes:
+            self._queue.task_done()
+        logger.info(f"Wrote {len(votes)} remaining votes to JSONL on shutdown")
+
+    def _store_batch(self, batch: List[Vote]):
+        with self._write_lock:
+            if self._batch is not batch:
+                # close() has taken the batch and written it
+                return
+            self.votes_jsonl.store_votes(batch)
+            # Cleared by the worker thread, which finishes the write even if the task is cancelled at shutdown
+            self._batch = None
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            # Kept where close() can find it, so a shutdown while the batch is in flight or waiting does not lose it
+            self._batch = batch
+            delay = self.retry_delay
+            while True:
+                try:
+                    await asyncio.to_thread(self._store_batch, batch)
+                    break
+                except Exception:
+                    logger.exception(f"Failed to write {len(batch)} votes to JSONL, retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                if self._closed:
+                    # close() has written the batch
+                    return
+                delay = min(delay * 2, self.max_retry_delay)
+            for _ in batch:
+                self._queue.task_done()
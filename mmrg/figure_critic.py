@@ -1,6 +1,6 @@
 from PIL import Image
 from papermage.recipes import CoreRecipe
-from typing import TypedDict, List
+from typing import Iterator, TypedDict, List, Tuple
 from anthropic import AnthropicBedrock
 import tempfile
 import io
@@ -8,14 +8,22 @@ import base64
 from ratelimit import limits, sleep_and_retry
 from config import MODEL_ID
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+# Concurrent prompts sent while assessing the figures of one paper
+MAX_PROMPT_WORKERS = 8
+# Longest image edge sent to the vision model, which resizes larger images down to about this size
+MAX_IMAGE_EDGE = 1568
+# Image modes that are encoded as JPEG; anything else, e.g. with an alpha channel, stays PNG
+JPEG_MODES = ("RGB", "L")
 
 class PaperArgument(TypedDict):
     title: str
     abstract: str
 
 class ExtractedFigureCaption(TypedDict):
-    figures: List[Image.Image]
+    # Figures are cropped lazily, one at a time, as they are iterated
+    figures: Iterator[Image.Image]
     captions: List[str]
 
 class FigureCritic:
@@ -26,9 +34,14 @@ class FigureCritic:
         recipe = CoreRecipe()
         doc = recipe.run(pdf_file_path)
 
-        image_list = list()
+        # Parse Captions
+        caption_list = list(map(lambda caption: caption.text, doc.captions))
+
+        return ExtractedFigureCaption(figures=self.iter_figures(doc), captions=caption_list)
+
+    def iter_figures(self, doc) -> Iterator[Image.Image]:
         # Parse Images
-        for i, fig in enumerate(doc.figures):
+        for fig in doc.figures:
             figure_box = fig.boxes[0]
 
             # Get page image
@@ -37,21 +50,24 @@ class FigureCritic:
 
             figure_box_xy = figure_box.to_absolute(page_width=page_w, page_height=page_h).xy_coordinates
 
-            extracted_image: Image.Image = page_image._pilimage.crop(figure_box_xy)
-
-            image_list.append(extracted_image)
-
-        # Parse Captions
-        caption_list = list(map(lambda caption: caption.text, doc.captions))
-
-        return ExtractedFigureCaption(figures=image_list, captions=caption_list)
+            yield page_image._pilimage.crop(figure_box_xy)
     
-    def image_to_png_bytes(self, image: Image.Image) -> bytes:
+    def image_to_model_bytes(self, image: Image.Image) -> Tuple[bytes, str]:
+        """Encodes an image for the vision model and returns the bytes with their media type"""
+        # The model downscales anything larger itself, so larger images only cost upload time
+        if max(image.size) > MAX_IMAGE_EDGE:
+            image = image.copy()
+            image.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+
         io_buffer = io.BytesIO()
-        # Save image as png
-        image.save(io_buffer, format="PNG")
+        if image.mode in JPEG_MODES:
+            image.save(io_buffer, format="JPEG", quality=85)
+            return io_buffer.getvalue(), "image/jpeg"
+
+        # Save images with transparency or palettes as png; the lowest compression level is much faster to encode
+        image.save(io_buffer, format="PNG", compress_level=1)
 
-        return io_buffer.getvalue()
+        return io_buffer.getvalue(), "image/png"
 
     def assess_figures_and_captions(self, client: AnthropicBedrock, argument:PaperArgument, figure_caption_dict: ExtractedFigureCaption):
         # Assess Clarity for each image
@@ -60,22 +76,29 @@ class FigureCritic:
         # Get summary for each image
         summary_list:str = list()
 
+        # Clarity and summary prompts of every figure, in figure order
+        prompts = list()
+
         for image in figure_caption_dict["figures"]:
-            image_in_bytes = self.image_to_png_bytes(image)
+            image_in_bytes, media_type = self.image_to_model_bytes(image)
+            # Only the encoded bytes are needed from here on, so the cropped figure is released right away
+            image.close()
             image_data = base64.b64encode(image_in_bytes).decode("utf-8")
+            # Both prompts send the same encoded image, so its content block is built once
+            image_block = {
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": media_type,
+                    "data": image_data
+                }
+            }
             # Assess Clarity
             messages = [
                 {
                     "role": "user",
                     "content": [
-                        {
-                            "type": "image",
-                            "source":  {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": image_data
-                            }
-                        },
+                        image_block,
                         {
                             "type": "text",
                             "text": f'''
@@ -89,28 +112,14 @@ class FigureCritic:
                 }
             ]
 
-            response = self.__send_prompt(
-                client=self.client,
-                model_id=MODEL_ID,
-                messages=messages,
-                max_tokens=512
-            )
-
-            clarity_assesment.append(response.strip())
+            prompts.append((self.client, messages, 512))
 
             # Get summary description of image
             messages = [
                 {
                     "role": "user",
                     "content": [
-                        {
-                            "type": "image",
-                            "source":  {
-                                "type": "base64",
-                                "media_type": "image/png",
-                                "data": image_data
-                            }
-                        },
+                        image_block,
                         {
                             "type": "text",
                             "text": f'''Generate a short description of the provided image. Also describe the implications conveyed within the image'''
@@ -119,16 +128,28 @@ class FigureCritic:
                 }
             ]
 
-            response = self.__send_prompt(
-                client=client,
+            prompts.append((client, messages, 1024))
+
+        def send(prompt) -> str:
+            prompt_client, messages, max_tokens = prompt
+            return self.__send_prompt(
+                client=prompt_client,
                 model_id=MODEL_ID,
                 messages=messages,
-                max_tokens=1024
+                max_tokens=max_tokens
             )
 
-            clarity_assesment.append(response.strip())
+        # The prompts of all figures run concurrently; the rate limit on __send_prompt is shared by all threads
+        with ThreadPoolExecutor(max_workers=MAX_PROMPT_WORKERS) as executor:
+            responses = list(executor.map(send, prompts))
+
+        # Each figure contributed a clarity prompt followed by a summary prompt
+        for clarity, summary in zip(responses[0::2], responses[1::2]):
+            clarity_assesment.append(clarity.strip())
+
+            clarity_assesment.append(summary.strip())
 
-            summary_list.append(response.strip())
+            summary_list.append(summary.strip())
 
         all_clarity = "\n".join(clarity_assesment)
         all_summary = "\n----------------------------------------------".join(summary_list)
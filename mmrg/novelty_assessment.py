@@ -1,9 +1,16 @@
 import os
 import json
 import time
+import hashlib
+import threading
+import functools
+import httpx
 import requests
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from requests import Response
+from requests.adapters import HTTPAdapter
 from typing import Dict, List
 from ratelimit import limits, sleep_and_retry
 from anthropic import AnthropicBedrock
@@ -12,9 +19,42 @@ from mmrg.schemas import PaperArgument, APIConfigs, NoveltyAssessmentResult
 
 logger = logging.getLogger(__name__)
 
+# Concurrent LLM requests per step; the rate limit on _send_prompt_rate_limited is shared by all threads
+MAX_LLM_WORKERS = 8
+# Candidate papers labelled per relevancy request in filter_papers
+FILTER_BATCH_SIZE = 20
+# Responses kept for prompts that are sent again, e.g. when the same paper is assessed twice
+PROMPT_CACHE_SIZE = 4096
+
+_prompt_cache: "OrderedDict[str, str]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+
+def _prompt_key(model_id: str, messages, max_tokens: int) -> str:
+    payload = json.dumps([model_id, max_tokens, messages], sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def send_prompt_via_anthropic_bedrock(client: AnthropicBedrock, model_id: str, messages, max_tokens: int) -> str:
+    # Cached responses are returned without touching the rate limit
+    key = _prompt_key(model_id, messages, max_tokens)
+    with _prompt_cache_lock:
+        if key in _prompt_cache:
+            _prompt_cache.move_to_end(key)
+            return _prompt_cache[key]
+
+    content = _send_prompt_rate_limited(client, model_id, messages, max_tokens)
+
+    with _prompt_cache_lock:
+        _prompt_cache[key] = content
+        if len(_prompt_cache) > PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+    return content
+
+
 @sleep_and_retry
 @limits(calls=50, period=60)
-def send_prompt_via_anthropic_bedrock(client: AnthropicBedrock, model_id: str, messages, max_tokens: int) -> str:
+def _send_prompt_rate_limited(client: AnthropicBedrock, model_id: str, messages, max_tokens: int) -> str:
     response = client.messages.create(
             model=model_id,
             max_tokens=max_tokens,
@@ -32,11 +72,47 @@ def send_prompt_via_anthropic_bedrock(client: AnthropicBedrock, model_id: str, m
     return content
 
 
+SEMANTIC_SCHOLAR_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+# Query parameters shared by every search; only the query phrase differs
+SEMANTIC_SCHOLAR_SEARCH_PARAMS = {
+    "fields": "title,abstract",
+    "limit": 10  # Number of results to retrieve
+}
+
+# Shared by all Semantic Scholar requests so they reuse kept-alive connections
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
 @sleep_and_retry
 @limits(calls=1, period=5)
 def make_semantic_scholar_api_request(search_url: str, headers: Dict, params: Dict) -> Response:
-    response = requests.get(search_url, headers=headers, params=params)
+    response = _http_session.get(search_url, headers=headers, params=params)
     return response
+
+
+def _extract_papers(entries: List[Dict]) -> Dict[str, str]:
+    # Abstracts keyed by title, for the entries that have both
+    return {entry['title']: entry['abstract'] for entry in entries if 'title' in entry and 'abstract' in entry}
+
+
+def _search_one(phrase: str, headers: Dict, query_no: int) -> Dict[str, str]:
+    params = {**SEMANTIC_SCHOLAR_SEARCH_PARAMS, "query": phrase}
+
+    response = make_semantic_scholar_api_request(SEMANTIC_SCHOLAR_SEARCH_URL, headers=headers, params=params)
+    if response.status_code != 200:
+        logging.error(f"Error: {response.status_code} - {response.text}")
+        return {}
+
+    response_json = response.json()
+    if 'data' not in response_json:
+        logging.warning("No 'data' key in the response. Response structure:")
+        logging.warning(json.dumps(response_json, indent=2))
+        return {}
+
+    entries = response_json['data']
+    logging.info(f'Query {query_no} produced {len(entries)} results')
+    return _extract_papers(entries)
     
 # Not used
 # def extract_references(file):
@@ -133,7 +209,6 @@ def search_related_papers(client, argument, search_phrases, api_config: APIConfi
     logging.info("============================")
     logging.info("SEARCHING FOR RELATED PAPERS (Step: 3/7)")
     logging.info("============================")
-    search_url = "https://api.semanticscholar.org/graph/v1/paper/search"
     api_key = api_config["semantic_scholar_api_key"]
     
     related_papers = {}
@@ -144,64 +219,9 @@ def search_related_papers(client, argument, search_phrases, api_config: APIConfi
         "Content-Type": "application/json",
     }
     
-    # Search 1:
-    params = {
-        "query": search_phrases[0],
-        "fields": "title,abstract",
-        "limit": 10  # Number of results to retrieve
-    }
-
-    response = make_semantic_scholar_api_request(search_url, headers=headers, params=params)
-    if response.status_code == 200:
-        response_json = response.json()
-        if 'data' in response_json:
-            entries = response_json['data']
-            logging.info(f'Query 1 produced {len(entries)} results')
-            related_papers.update({entry['title']: entry['abstract'] for entry in entries if 'title' in entry and 'abstract' in entry})
-        else:
-            logging.warning("No 'data' key in the response. Response structure:")
-            logging.warning(json.dumps(response_json, indent=2))
-    else:
-        logging.error(f"Error: {response.status_code} - {response.text}")
-    
-    # Search 2:
-    params = {
-        "query": search_phrases[1],
-        "fields": "title,abstract",
-        "limit": 10  # Number of results to retrieve
-    }
-
-    response = make_semantic_scholar_api_request(search_url, headers=headers, params=params)
-    if response.status_code == 200:
-        response_json = response.json()
-        if 'data' in response_json:
-            entries = response_json['data']
-            logging.info(f'Query 2 produced {len(entries)} results')
-            related_papers.update({entry['title']: entry['abstract'] for entry in entries if 'title' in entry and 'abstract' in entry})
-        else:
-            logging.warning("No 'data' key in the response. Response structure:")
-            logging.warning(json.dumps(response_json, indent=2))
-    else:
-        logging.error(f"Error: {response.status_code} - {response.text}")
-    # Search 3:
-    params = {
-        "query": search_phrases[2],
-        "fields": "title,abstract",
-        "limit": 10  # Number of results to retrieve
-    }
-
-    response = make_semantic_scholar_api_request(search_url, headers=headers, params=params)
-    if response.status_code == 200:
-        response_json = response.json()
-        if 'data' in response_json:
-            entries = response_json['data']
-            logging.info(f'Query 3 produced {len(entries)} results')
-            related_papers.update({entry['title']: entry['abstract'] for entry in entries if 'title' in entry and 'abstract' in entry})
-        else:
-            logging.warning("No 'data' key in the response. Response structure:")
-            logging.warning(json.dumps(response_json, indent=2))
-    else:
-        logging.error(f"Error: {response.status_code} - {response.text}")
+    # The searches run one after another because of the request rate limit, over one shared connection
+    for query_no, phrase in enumerate(search_phrases, start=1):
+        related_papers.update(_search_one(phrase, headers, query_no))
     logging.info("Titles of Related Papers Found:")
     logging.info(list(related_papers.keys()))
     return related_papers
@@ -216,7 +236,7 @@ def remove_cited(cited_papers, related_papers, model_id: str):
     # papers.toUpper()
     # see if any cited paper equals temp(toUpper(related_papers))
     # if so, remove from dict
-    cited_titles = [paper.upper() for paper in cited_papers]
+    cited_titles = frozenset(paper.upper() for paper in cited_papers)
     filtered_papers = {title: abstract for title, abstract in related_papers.items() if title.upper() not in cited_titles}
     
     logging.info(f"Number of cited papers found in recommendation set: {len(related_papers.keys()) - len(filtered_papers.keys())}")
@@ -228,9 +248,8 @@ def filter_papers(client, argument, related_papers, model_id: str):
     logging.info("FILTERING FOR RELEVANT PAPERS (Step: 5/7)")
     logging.info("============================")
     
-    filtered_dict = {}
-    
-    for title, abstract in related_papers.items():
+    def is_relevant(paper) -> bool:
+        title, abstract = paper
         messages = [{
             "role": "user",
             "content":f'''
@@ -256,8 +275,52 @@ def filter_papers(client, argument, related_papers, model_id: str):
             messages,
             2
         )
-        if res.lower() == "relevant":
-            filtered_dict[title] = abstract
+        return res.lower() == "relevant"
+
+    def classify_batch(batch) -> List[bool]:
+        candidates = "\n".join(
+            f"{i}. Title: {title}\n   Abstract: {abstract}" for i, (title, abstract) in enumerate(batch, start=1)
+        )
+        messages = [{
+            "role": "user",
+            "content":f'''
+            Assess the relevancy of each of the following candidate papers to the core paper. Be strict in your assessment
+            and only consider a candidate relevant if it closely relates to the core concept.
+            If the core paper and a candidate are the same thing, your assessment of that candidate is "Irrelevant"
+            Core Paper:
+            Title: {argument['title']}
+            Abstract: {argument['abstract']}
+            
+            Candidates:
+            {candidates}
+            
+            Reply with a JSON list of exactly {len(batch)} strings, "Relevant" or "Irrelevant", one per candidate in order.
+            Only output the JSON list with no other text or explanation
+            '''
+        }]
+
+        res = send_prompt_via_anthropic_bedrock(
+            client, 
+            model_id, 
+            messages,
+            8 * len(batch) + 16
+        )
+        try:
+            labels = json.loads(res)
+        except json.JSONDecodeError:
+            labels = None
+        if not isinstance(labels, list) or len(labels) != len(batch):
+            # Fall back to one request per candidate when the batched reply cannot be matched up
+            logging.warning(f"Unexpected batched relevancy reply, assessing {len(batch)} papers one by one: {res}")
+            return [is_relevant(paper) for paper in batch]
+        return [str(label).lower() == "relevant" for label in labels]
+
+    # Candidates are labelled FILTER_BATCH_SIZE at a time, one request per batch
+    papers = list(related_papers.items())
+    batches = [papers[i:i + FILTER_BATCH_SIZE] for i in range(0, len(papers), FILTER_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=MAX_LLM_WORKERS) as executor:
+        decisions = [relevant for batch_decisions in executor.map(classify_batch, batches) for relevant in batch_decisions]
+    filtered_dict = {title: abstract for (title, abstract), relevant in zip(papers, decisions) if relevant}
         
     logging.info(f"Original length: {len(related_papers.keys())}")
     logging.info(f"Filtered length: {len(filtered_dict.keys())}")
@@ -271,9 +334,9 @@ def assess_novelty(client, argument, filtered_dict, model_id: str):
     logging.info("============================")
     
     
-    # Loop through for novelty assessment.
-    results = []
-    for title, abstract in filtered_dict.items():
+    # One comparison per filtered paper, run concurrently and collected in order
+    def compare(paper) -> Dict[str, str]:
+        title, abstract = paper
         logging.info(f"Comparing with: {title} \n")
         messages = [{
             "role": "user",
@@ -310,12 +373,15 @@ def assess_novelty(client, argument, filtered_dict, model_id: str):
             messages,
             256
         )
-        results.append({
-            'existing_title': title,
-            'assessment': response
-        })
         logging.info(f"{response}\n")
         logging.info('-----------------------------------------')
+        return {
+            'existing_title': title,
+            'assessment': response
+        }
+
+    with ThreadPoolExecutor(max_workers=MAX_LLM_WORKERS) as executor:
+        results = list(executor.map(compare, filtered_dict.items()))
         
     return results
     
@@ -347,12 +413,23 @@ def summarize_results(client, results, model_id: str):
     return response
 
 
+@functools.lru_cache(maxsize=8)
+def get_bedrock_client(aws_access_key: str, aws_secret_key: str, aws_region: str) -> AnthropicBedrock:
+    # One client per credentials and region, kept for the life of the process so its TLS connections are reused
+    return AnthropicBedrock(
+        aws_access_key=aws_access_key,
+        aws_secret_key=aws_secret_key,
+        aws_region=aws_region,
+        http_client=httpx.Client(limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+    )
+
+
 def generate_novelty_assessment(title: str, abstract: str, list_of_reference: List[str], api_config: APIConfigs) -> NoveltyAssessmentResult:
-    # Initialize Client
-    client = AnthropicBedrock(
-        aws_access_key=api_config["aws_access_key_id"],
-        aws_secret_key=api_config["aws_secret_access_key"],
-        aws_region=api_config["aws_default_region"]
+    # Reuse the client, and its open connections, of earlier assessments with the same credentials
+    client = get_bedrock_client(
+        api_config["aws_access_key_id"],
+        api_config["aws_secret_access_key"],
+        api_config["aws_default_region"]
     )
     
     
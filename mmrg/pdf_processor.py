@@ -1,4 +1,9 @@
-from typing import Optional, Dict
+import hashlib
+import json
+import os
+import threading
+from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
 
@@ -7,6 +12,14 @@ from mmrg.utils import load_grobid_config
 from mmrg.schemas import GrobidConfig
 from mmrg.doc2json.grobid2json.tei_to_json import convert_tei_xml_soup_to_s2orc_json
 
+def file_sha256(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
 class PDFProcessor:
     def __init__(self,
                  output_dir: str,
@@ -20,6 +33,10 @@ class PDFProcessor:
 
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
+        # Parsed papers keyed by the SHA-256 of the PDF
+        self.cache_dir = Path(f"{output_dir}/cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
         # Initialize grobid_config
         if(grobid_config != None):
             self.grobid_config: GrobidConfig = grobid_config
@@ -40,6 +57,19 @@ class PDFProcessor:
         :param input_file:
         :return: PDF file content in JSON s2orc format 
         """
+        paper_id = input_file_path.split('/')[-1].split('.')[0]
+
+        # Identical PDFs are only sent to Grobid once; later calls load the stored JSON
+        pdf_hash = file_sha256(input_file_path)
+        cache_file_path = self.cache_dir / f"{pdf_hash}.json"
+        if cache_file_path.exists():
+            with open(cache_file_path, "r", encoding="utf-8") as f:
+                paper = json.load(f)
+            # The same PDF may have been parsed under another file name
+            paper["paper_id"] = paper_id
+            paper["pdf_parse"]["paper_id"] = paper_id
+            return paper
+
         # Process PDF through Grobid -> TEI.XML string
         source_path, status_code, tei_xml = self.grobid_client.process_pdf(
             "processFulltextDocument",
@@ -53,13 +83,32 @@ class PDFProcessor:
             segment_sentences=False
         )
 
-        paper_id = source_path.split('/')[-1].split('.')[0]
+        # Process TEI.XML -> JSON with lxml's XML parser, named explicitly so bs4 never falls back to another builder
+        tei_soup = BeautifulSoup(tei_xml, "lxml-xml")
+        paper = convert_tei_xml_soup_to_s2orc_json(tei_soup, paper_id, pdf_hash)
+        paper_json = paper.release_json()
 
-        pdf_hash = "" # Placeholder
+        # The soup's parent/child links form reference cycles, so without decompose() it would wait for the cyclic collector
+        tei_soup.decompose()
+        del tei_soup, tei_xml, paper
 
-        # Process TEI.XML -> JSON
-        tei_soup = BeautifulSoup(tei_xml, "xml")
-        paper = convert_tei_xml_soup_to_s2orc_json(tei_soup, paper_id, pdf_hash)
+        # Only successful parses are kept. They are written under a temporary name first, so a concurrent reader never sees a partial file
+        if status_code == 200:
+            temp_cache_file_path = cache_file_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_cache_file_path, "w", encoding="utf-8") as f:
+                json.dump(paper_json, f, ensure_ascii=False)
+            os.replace(temp_cache_file_path, cache_file_path)
+
+        return paper_json
 
-        return paper.release_json()
+    def process_pdf_files(self, input_file_paths: List[str]) -> List[Dict[str, str]]:
+        """
+        Process several PDF files concurrently and get their JSON representations
+        :param input_file_paths:
+        :return: PDF file contents in JSON s2orc format, in the order of input_file_paths
+        """
+        # Up to batch_size documents are in flight on the Grobid server at once, as in the client's own batch mode
+        max_workers = max(1, min(self.grobid_config.get("batch_size", 1), len(input_file_paths)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.process_pdf_file, input_file_paths))
 
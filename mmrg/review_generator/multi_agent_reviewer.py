@@ -1,5 +1,7 @@
 import os
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
 from crewai import Agent, Crew, Process
 from crewai_tools import TXTSearchTool
 
@@ -12,6 +14,33 @@ from mmrg.custom_crewai_tools.novelty_tool import NoveltyTool
 from mmrg.utils import load_chatbedrock_llm_model
 
 
+# Search tools kept for the most recently reviewed papers; building one embeds the whole paper
+MAX_CACHED_SEARCH_TOOLS = 16
+
+_paper_search_tools: "OrderedDict[Tuple[str, int], TXTSearchTool]" = OrderedDict()
+_paper_search_tools_lock = threading.Lock()
+
+
+def get_paper_search_tool(paper_txt_path: str) -> TXTSearchTool:
+    '''
+    Returns the TXTSearchTool for a paper text file, reusing the one built for the same file contents
+    so reviewing a paper several ways, e.g. "multiagent" and "mmrg", embeds it only once
+    '''
+    # The modification time tells apart different contents written to the same path
+    key = (paper_txt_path, os.stat(paper_txt_path).st_mtime_ns)
+    # Held while building, so concurrent reviews of the same paper wait for one embedding pass
+    with _paper_search_tools_lock:
+        paper_search_tool = _paper_search_tools.get(key)
+        if paper_search_tool is None:
+            paper_search_tool = TXTSearchTool(txt=paper_txt_path)
+            _paper_search_tools[key] = paper_search_tool
+            if len(_paper_search_tools) > MAX_CACHED_SEARCH_TOOLS:
+                _paper_search_tools.popitem(last=False)
+        else:
+            _paper_search_tools.move_to_end(key)
+    return paper_search_tool
+
+
 class MultiAgentReviewerCrew(object):
     '''
     A Multi Agent Reviewer System build upon crewai
@@ -54,7 +83,7 @@ class MultiAgentReviewerCrew(object):
 
         # Setup OPENAI_API_KEY as environment variable for TXTSearchTool
         os.environ["OPENAI_API_KEY"] = self.api_config["openai_api_key"]
-        paper_search_tool: TXTSearchTool = TXTSearchTool(txt=str(paper_txt_path))
+        paper_search_tool: TXTSearchTool = get_paper_search_tool(str(paper_txt_path))
         novelty_tool: Optional[NoveltyTool] = NoveltyTool(content=novelty_assessment)
         figure_critic_tool: Optional[FigureTool] = FigureTool(content=figure_critic_assessment)
 
@@ -122,15 +151,21 @@ class MultiAgentReviewerCrew(object):
             description=prompts['clarity_agent']['task_prompt'],
             expected_output="A series of messages sent to 'review_leader'.",
             agent=clarity_agent,
-            context=[leader_task]
+            context=[leader_task],
+            async_execution=True
             )
         experiments_agent_tasks: CustomTask = CustomTask(
             description=prompts['experiment_agent']['task_prompt'],
             expected_output="A series of messages sent to 'review_leader'.",
             agent=experiments_agent,
-            context=[leader_task]
+            context=[leader_task],
+            async_execution=True
             )
 
+        # The clarity and experiments tasks only depend on the leader task, so they run concurrently with each other.
+        # The impact task stays synchronous because a crew may end with at most one async task; the crew waits
+        # for the pending async tasks before starting it, so it runs after both of them
+
         impact_agent_tasks: CustomTask = CustomTask(
             description=prompts['impact_agent']['task_prompt'],
             expected_output="A series of messages sent to 'review_leader'.",
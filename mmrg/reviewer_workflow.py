@@ -1,4 +1,5 @@
 from time import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Literal
 
@@ -11,6 +12,24 @@ from mmrg.review_generator.multi_agent_reviewer import MultiAgentReviewerCrew
 from mmrg.figure_critic import FigureCriticClient
 
 
+def empty_review_result() -> ReviewResult:
+    # Placeholder for review types that were not requested
+    return ReviewResult(
+        review_content="",
+        time_elapsed=0,
+        novelty_assessment="",
+        figure_critic_assessment=""
+    )
+
+def abstract_text(abstract) -> Optional[str]:
+    # An abstract is either raw text or a list of paragraphs, of which the first one is used
+    if isinstance(abstract, list) and abstract and 'text' in abstract[0]:
+        return abstract[0]['text']
+    if isinstance(abstract, str):
+        return abstract
+    return None
+
+
 class ReviewerWorkflow:
     def __init__(self, prompt_file_path: str, output_dir: str, api_config: APIConfigs, grobid_config_file_path: str, grobid_server_url: str = None):
         self.workflow_prompts = load_workflow_prompt(prompt_file_path)
@@ -27,7 +46,8 @@ class ReviewerWorkflow:
 
 
     def extract_organized_text(self, json_data: str):
-        organized_text = ""
+        # Pieces of the organized text, joined once at the end
+        parts: List[str] = []
         seen_sections = set()
         list_of_reference = []
 
@@ -38,74 +58,60 @@ class ReviewerWorkflow:
         paper_id = json_data.get('paper_id', 'No paper ID found')
 
 
-        # Extract title by accessing the 'title' key in the JSON data
-        title = None
-        for key in ['title', 'pdf_parse.title']:
-            try:
-                temp = json_data
-                for k in key.split('.'):
-                    temp = temp[k]
-                title = temp
-                break
-            except (KeyError,TypeError):
-                continue
+        # Extract title, from the top level of the S2ORC JSON or else from its pdf_parse
+        title = json_data.get('title') or pdf_parse.get('title')
 
-        organized_text += f"Title: {title or 'No title found'}\n\n"
+        parts.append(f"Title: {title or 'No title found'}\n\n")
                 
 
-        # Extract abstract
-        abstract = None
-        for key in ['abstract', 'pdf_parse.abstract.text']:
-            try:
-                temp = json_data
-                for k in key.split('.'):
-                    temp = temp[k]
-                if isinstance(temp, list) and temp and 'text'in temp[0]:
-                    abstract = temp[0]['text']
-                elif isinstance(temp, str):
-                    abstract = temp
-                break
-            except (KeyError,TypeError):
-                continue
-        organized_text += f"Abstract: {abstract or 'No abstract found'}\n\n"
-
-        # Extract body text
-        if 'body_text' in pdf_parse:
-            for body_item in pdf_parse['body_text']:
-                section = body_item.get('section', 'Unnamed Section')
+        # Extract abstract, the raw text at the top level or else the first paragraph in pdf_parse
+        abstract = abstract_text(json_data.get('abstract')) or abstract_text(pdf_parse.get('abstract'))
+        parts.append(f"Abstract: {abstract or 'No abstract found'}\n\n")
+
+        # Extract body text, with a section header before the first paragraph of each section
+        append = parts.append
+        for body_item in pdf_parse.get('body_text', ()):
+            section = body_item.get('section', 'Unnamed Section')
+            
+            if section not in seen_sections:
+                seen_sections.add(section)
                 sec_num = body_item.get('sec_num')
-                
-                if section not in seen_sections:
-                    seen_sections.add(section)
-                    if sec_num:
-                        organized_text += f"{sec_num}. {section}:\n\n"
-                    else:
-                        organized_text += f"{section}:\n\n"
-                
-                organized_text += body_item['text'] + "\n\n"
+                if sec_num:
+                    append(f"{sec_num}. {section}:\n\n")
+                else:
+                    append(f"{section}:\n\n")
+            
+            append(body_item['text'])
+            append("\n\n")
 
         # Extract a list of references titles in strings
-        if 'bib_entries' in pdf_parse:
-            for bibref in pdf_parse['bib_entries']:
-                try :
-                    list_of_reference.append(pdf_parse['bib_entries'][bibref]['title'])
-                except (KeyError, TypeError):
-                    continue
+        for bib_entry in pdf_parse.get('bib_entries', {}).values():
+            if 'title' in bib_entry:
+                list_of_reference.append(bib_entry['title'])
 
 
 
         # Extract figures and tables
         if 'ref_entries' in pdf_parse:
-            organized_text += "Figures and Tables:\n\n"
+            parts.append("Figures and Tables:\n\n")
             for ref_key, ref_value in pdf_parse['ref_entries'].items():
                 if ref_value['type_str'] in ['figure', 'table']:
-                    organized_text += f"{ref_value['text']}\n\n"
+                    parts.append(f"{ref_value['text']}\n\n")
                     if ref_value['type_str'] == 'table' and 'content' in ref_value:
-                        organized_text += f"Table content: {ref_value['content']}\n\n"
+                        parts.append(f"Table content: {ref_value['content']}\n\n")
 
+        organized_text = "".join(parts)
         return organized_text.strip(), paper_id, title, abstract, list_of_reference
 
 
+    def save_parsed_text(self, temp_dir_path: Path, organized_text: str) -> Path:
+        # The paper tools of MultiAgentReviewerCrew read this file as UTF-8
+        temp_dir_path.mkdir(parents=True, exist_ok=True)
+        parsed_text_file_path = temp_dir_path / "parsed_text_file.txt"
+        parsed_text_file_path.write_text(organized_text, encoding="utf-8")
+        return parsed_text_file_path
+
+
     def generate_barebones_review_result(self, paper: str) -> ReviewResult:
         start_time = time()
         barebones = generate_barebones_review(
@@ -146,19 +152,24 @@ class ReviewerWorkflow:
         novelty_assessment=None
         figure_critic_assessment=None
         if (use_knowledge):
-            # Perform Novelty Assessment
-            novelty_assessment_result = generate_novelty_assessment(
-                title=title,
-                abstract=abstract,
-                list_of_reference=list_of_reference,
-                api_config=self.api_config
-            )
-            novelty_assessment = novelty_assessment_result['summary']
-            figure_critic_assessment = self.figure_critic.critic_pdf_file(
-                pdf_file_path=pdf_file_path,
-                title=title,
-                abstract=abstract
-            )
+            # Novelty assessment and figure critique are independent, so they run side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Perform Novelty Assessment
+                novelty_assessment_future = executor.submit(
+                    generate_novelty_assessment,
+                    title=title,
+                    abstract=abstract,
+                    list_of_reference=list_of_reference,
+                    api_config=self.api_config
+                )
+                figure_critic_future = executor.submit(
+                    self.figure_critic.critic_pdf_file,
+                    pdf_file_path=pdf_file_path,
+                    title=title,
+                    abstract=abstract
+                )
+                novelty_assessment = novelty_assessment_future.result()['summary']
+                figure_critic_assessment = figure_critic_future.result()
             
         start_time = time()
         multi_agent_review = self.multi_agent_reviewer.review_paper(
@@ -186,73 +197,57 @@ class ReviewerWorkflow:
 
         # Extract information from paper
         organized_text, paper_id, title, abstract, list_of_reference = self.extract_organized_text(paper)
+        # Only the extracted text is used from here on, so the parsed paper is not kept alive during the reviews
+        del paper
         
-        # Generate barebones review
-        if("barebones" in review_types):
-            barebones_result = self.generate_barebones_review_result(paper=organized_text)
-        else:
-            barebones_result = ReviewResult(
-                review_content="",
-                time_elapsed=0,
-                novelty_assessment="",
-                figure_critic_assessment=""
-            )
+        # Save organized text as txt file once, shared by both MultiAgentReviewerCrew review types
+        temp_dir_path = Path(f"{self.output_dir}/tmp/{paper_id}")
+        if any(review_type in review_types for review_type in ("multiagent", "mmrg")):
+            parsed_text_file_path = self.save_parsed_text(temp_dir_path, organized_text)
 
-        # Generate liange etal review
-        if("liangetal" in review_types):
-            liang_etal_result = self.generate_liang_etal_review_result(title=title, paper=organized_text)
-        else:
-            liang_etal_result = ReviewResult(
-                review_content="",
-                time_elapsed=0,
-                novelty_assessment="",
-                figure_critic_assessment=""
-            )
+        # The review types only read the parsed paper, so the selected ones are generated concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {}
 
-        # Save organized text as txt file for MultiAgentReviewerCrew
-        temp_dir_path = Path(f"{self.output_dir}/tmp/{paper_id}")
-        temp_dir_path.mkdir(parents=True, exist_ok=True)
-        parsed_text_file_path = temp_dir_path / "parsed_text_file.txt"
-        with open(parsed_text_file_path, "w") as f:
-            f.write(organized_text)
-        
+            # Generate barebones review
+            if("barebones" in review_types):
+                futures["barebones"] = executor.submit(self.generate_barebones_review_result, paper=organized_text)
 
-        # Generate multi agent review without knowledge
-        if("multiagent" in review_types):
-            multi_agent_review_txt_path = temp_dir_path / "multi_agent_review.txt"
-            multi_agent_review_result = self.generate_review_with_multi_agent_result(
-                parsed_text_file_path=parsed_text_file_path,
-                pdf_file_path=pdf_file_path,
-                use_knowledge=False,
-                output_path=str(multi_agent_review_txt_path)
-            )
-        else:
-            multi_agent_review_result = ReviewResult(
-                review_content="",
-                time_elapsed=0,
-                novelty_assessment="",
-                figure_critic_assessment=""
-            )
-        
-        # Generate multi agent review with knowledge
-        if("mmrg" in review_types):
-            multi_agent_with_knowledge_review_txt_path = temp_dir_path / "multi_agent_with_knowledge_review.txt"
-            multi_agent_review_with_knowledge_result = self.generate_review_with_multi_agent_result(
-                parsed_text_file_path=parsed_text_file_path,
-                pdf_file_path=pdf_file_path,
-                use_knowledge=True,
-                output_path=str(multi_agent_with_knowledge_review_txt_path),
-                title=title,
-                abstract=abstract,
-                list_of_reference=list_of_reference
-            )
-        else:
-            multi_agent_review_with_knowledge_result = ReviewResult(
-                review_content="",
-                time_elapsed=0,
-                novelty_assessment="",
-                figure_critic_assessment=""
-            )
+            # Generate liange etal review
+            if("liangetal" in review_types):
+                futures["liangetal"] = executor.submit(self.generate_liang_etal_review_result, title=title, paper=organized_text)
+
+            # Generate multi agent review without knowledge
+            if("multiagent" in review_types):
+                multi_agent_review_txt_path = temp_dir_path / "multi_agent_review.txt"
+                futures["multiagent"] = executor.submit(
+                    self.generate_review_with_multi_agent_result,
+                    parsed_text_file_path=parsed_text_file_path,
+                    pdf_file_path=pdf_file_path,
+                    use_knowledge=False,
+                    output_path=str(multi_agent_review_txt_path)
+                )
+
+            # Generate multi agent review with knowledge
+            if("mmrg" in review_types):
+                multi_agent_with_knowledge_review_txt_path = temp_dir_path / "multi_agent_with_knowledge_review.txt"
+                futures["mmrg"] = executor.submit(
+                    self.generate_review_with_multi_agent_result,
+                    parsed_text_file_path=parsed_text_file_path,
+                    pdf_file_path=pdf_file_path,
+                    use_knowledge=True,
+                    output_path=str(multi_agent_with_knowledge_review_txt_path),
+                    title=title,
+                    abstract=abstract,
+                    list_of_reference=list_of_reference
+                )
+
+            results = {review_type: future.result() for review_type, future in futures.items()}
+
+        barebones_result = results.get("barebones") or empty_review_result()
+        liang_etal_result = results.get("liangetal") or empty_review_result()
+        multi_agent_review_result = results.get("multiagent") or empty_review_result()
+        multi_agent_review_with_knowledge_result = results.get("mmrg") or empty_review_result()
         
         # Create paper object
         paper_review_result = PaperReviewResult(
@@ -278,6 +273,8 @@ class ReviewerWorkflow:
 
         # Extract information from paper
         organized_text, paper_id, title, abstract, list_of_reference = self.extract_organized_text(paper)
+        # Only the extracted text is used from here on, so the parsed paper is not kept alive during the reviews
+        del paper
 
         if review_method == "barebones":
             review_result = self.generate_barebones_review_result(paper=organized_text)
@@ -286,10 +283,7 @@ class ReviewerWorkflow:
         elif review_method == "multiagent" or review_method == "mmrg":
             # Save organized text as txt file for MultiAgentReviewerCrew
             temp_dir_path = Path(f"{self.output_dir}/tmp/{paper_id}")
-            temp_dir_path.mkdir(parents=True, exist_ok=True)
-            parsed_text_file_path = temp_dir_path / "parsed_text_file.txt"
-            with open(parsed_text_file_path, "w") as f:
-                f.write(organized_text)
+            parsed_text_file_path = self.save_parsed_text(temp_dir_path, organized_text)
             if review_method == "multiagent":
                 # Generate multi agent review without knowledge
                 multi_agent_review_txt_path = temp_dir_path / "multi_agent_review.txt"
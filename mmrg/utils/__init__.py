@@ -1,27 +1,18 @@
-import re
 import os
 import json
+import functools
 
-from typing import List
+from typing import List, TextIO
+from botocore.config import Config
 from langchain_aws import ChatBedrock
 from mmrg.schemas import PaperReviewResult, WorkflowPrompt, GrobidConfig, APIConfigs
 
 
-def text_converter(text:str)->str:
-    # A function that takes a text and converts it to a JSONL compatible format
-    text = text.replace('\n', '\\n')
-    text = text.replace("\'","\\'" )
-    text = re.sub(r'([{}\[\]])', r'\\\1', text)
-    text = re.sub(r'(?<!\\)\\(?!["\\/bfnrt])', r'\\\\', text)
-
-    return text 
-
-
 def read_and_process(file_path: str) -> str:
         try:
+            # The raw text is returned; json.dumps escapes it when the JSONL line is written
             with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            return text_converter(content)
+                return file.read()
         except FileNotFoundError:
             print(f"Warning: File not found - {file_path}")
             return ""
@@ -51,6 +42,24 @@ def generate_jsonl_line(paper_id: str, title: str, pdf_path: str,
     return jsonl_line
 
 
+def write_jsonl_line(out_fp: TextIO, paper_id: str, title: str, pdf_path: str, 
+                     human_reviewer_path: str, barebones_path: str, 
+                     liang_etal_path: str, multi_agent_without_knowledge_path: str, 
+                     multi_agent_with_knowledge_path: str) -> None:
+    # Writes the line straight to an open JSONL file, so a batch export holds only one paper at a time
+    out_fp.write(generate_jsonl_line(
+        paper_id=paper_id,
+        title=title,
+        pdf_path=pdf_path,
+        human_reviewer_path=human_reviewer_path,
+        barebones_path=barebones_path,
+        liang_etal_path=liang_etal_path,
+        multi_agent_without_knowledge_path=multi_agent_without_knowledge_path,
+        multi_agent_with_knowledge_path=multi_agent_with_knowledge_path
+    ))
+    out_fp.write("\n")
+
+
 def load_json_file_as_dict(file_path: str):
     prompts = None
     with open(file_path, "r", encoding="utf8") as f:
@@ -67,13 +76,26 @@ def load_grobid_config(file_path: str) -> GrobidConfig:
 
 
 def load_chatbedrock_llm_model(api_config: APIConfigs) -> ChatBedrock:
-    # Setup environment variables for AWS
-    os.environ["AWS_ACCESS_KEY_ID"] = api_config['aws_access_key_id']
-    os.environ["AWS_SECRET_ACCESS_KEY"] = api_config['aws_secret_access_key']
-    os.environ["AWS_DEFAULT_REGION"] = api_config["aws_default_region"]
+    # One model object, and its Bedrock client, is shared by every call with the same model and credentials
+    return _load_cached_chatbedrock_llm_model(
+        api_config['anthropic_model_id'],
+        api_config['aws_access_key_id'],
+        api_config['aws_secret_access_key'],
+        api_config["aws_default_region"]
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached_chatbedrock_llm_model(model_id: str, aws_access_key_id: str, aws_secret_access_key: str, aws_default_region: str) -> ChatBedrock:
+    # Setup environment variables for AWS, once per model object rather than on every call
+    os.environ["AWS_ACCESS_KEY_ID"] = aws_access_key_id
+    os.environ["AWS_SECRET_ACCESS_KEY"] = aws_secret_access_key
+    os.environ["AWS_DEFAULT_REGION"] = aws_default_region
 
     llm = ChatBedrock(
-        model_id=api_config['anthropic_model_id'],
+        model_id=model_id,
+        # The cached model is shared by concurrent reviews, so its client keeps enough pooled keep-alive connections
+        config=Config(max_pool_connections=32, retries={"max_attempts": 3, "mode": "adaptive"}),
         # aws_access_key_id=api_config['aws_access_key_id'],
         # aws_secret_access_key=api_config['aws_secret_access_key'],
         # region_name=api_config["aws_default_region"]